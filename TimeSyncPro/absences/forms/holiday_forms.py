@@ -38,12 +38,8 @@ class RequestHolidayForm(LabelMixin, forms.ModelForm):
         requester = self.request.user.profile
         remaining_days = requester.remaining_leave_days
         next_year_remaining_days = requester.next_year_leave_days
-        requested_days = requester.get_count_of_working_days_by_period(
-            start_date, end_date
-        )
         today = timezone.now().date()
         company = requester.company
-        working_days = requester.get_working_days(start_date, end_date)
         minimum_notice_date = date.today() + timedelta(
             days=company.minimum_leave_notice
         )
@@ -51,6 +47,9 @@ class RequestHolidayForm(LabelMixin, forms.ModelForm):
         if not start_date or not end_date:
             return cleaned_data
 
+        working_days = set(requester.get_working_days(start_date, end_date))
+        requested_days = len(working_days)
+
         if start_date < today:
             self.add_error("start_date", "The start date must be in the future.")
         if end_date < today:
@@ -115,6 +114,16 @@ class RequestHolidayForm(LabelMixin, forms.ModelForm):
                 "start_date", "You already have a holiday request for this date range."
             )
 
+        team = requester.team
+        if team and start_date <= end_date:
+            usage = team.get_capacity_usage(start_date, end_date)
+            if usage.exceeds_limit():
+                self.add_error(
+                    "start_date",
+                    f"{team.name} already has {usage.peak_count} members on holiday "
+                    f"on {usage.peak_day:%d %b %Y}, the maximum is {usage.limit}.",
+                )
+
         return cleaned_data
 
     def save(self, commit=True):
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("absences", "0003_alter_holiday_options"),
+        ("accounts", "0004_alter_profile_date_of_hire"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="absence",
+            index=models.Index(
+                fields=["start_date", "id"], name="absence_start_date_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="holiday",
+            index=models.Index(
+                fields=["start_date", "id"], name="holiday_start_date_id_idx"
+            ),
+        ),
+    ]
@@ -96,6 +96,9 @@ class Holiday(AbsenceBase):
 
     class Meta:
         ordering = ["start_date"]
+        indexes = [
+            models.Index(fields=["start_date", "id"], name="holiday_start_date_id_idx"),
+        ]
         permissions = [
             ("view_all_holidays_requests", "Can view all holiday requests"),
             (
@@ -139,6 +142,17 @@ class Holiday(AbsenceBase):
             self.start_date, self.end_date
         )
 
+    def get_period(self):
+        return self.requester_id, self.start_date, self.end_date
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The saved period, so signals can see where an edited holiday was
+        if {"requester_id", "start_date", "end_date"} <= set(field_names):
+            instance._loaded_period = instance.get_period()
+        return instance
+
     def save(self, *args, **kwargs):
         self.full_clean()
         if not self.reviewer:
@@ -146,14 +160,18 @@ class Holiday(AbsenceBase):
         if not self.days_requested:
             self.days_requested = self.get_requested_days()
         super().save(*args, **kwargs)
+        self._loaded_period = self.get_period()
 
 
 class Absence(HistoryMixin, AbsenceBase):
 
-    tracked_fields = ["start_date", "end_date", "reason"]
+    tracked_fields = ["absentee", "start_date", "end_date", "reason"]
 
     class Meta:
         ordering = ["start_date"]
+        indexes = [
+            models.Index(fields=["start_date", "id"], name="absence_start_date_id_idx"),
+        ]
         permissions = [
             ("view_all_absences", "Can view all absences"),
             ("view_department_absences", "Can view department absences"),
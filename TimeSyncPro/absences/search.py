@@ -0,0 +1,84 @@
+from django.db.models import Q
+
+from TimeSyncPro.absences.models import Absence, Holiday
+from TimeSyncPro.accounts.directory import matching_profile_ids
+from TimeSyncPro.common.search import parse_search_date
+
+
+def search_records(queryset, company, query, profile_fields):
+    """
+    Filter holidays or absences by a search query: a date matches the records
+    covering that day, anything else the people in ``profile_fields``.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    day = parse_search_date(query)
+    if day:
+        return queryset.filter(start_date__lte=day, end_date__gte=day)
+
+    profile_ids = matching_profile_ids(company, query)
+    condition = Q(pk__in=[])
+    for field in profile_fields:
+        condition |= Q(**{f"{field}_id__in": profile_ids})
+    return queryset.filter(condition)
+
+
+def get_holidays(company, query="", status=None):
+    queryset = Holiday.objects.select_related(
+        "requester",
+        "reviewer",
+        "reviewed_by",
+        "requester__team",
+    ).filter(requester__company=company)
+
+    if status:
+        queryset = queryset.filter(status=status)
+
+    return search_records(queryset, company, query, ("requester", "reviewer"))
+
+
+def get_absences(company, query="", absence_type=None):
+    queryset = Absence.objects.select_related(
+        "absentee",
+        "absentee__user",
+        "added_by",
+        "added_by__user",
+    ).filter(added_by__company=company)
+
+    if absence_type:
+        queryset = queryset.filter(absence_type=absence_type)
+
+    return search_records(queryset, company, query, ("absentee", "added_by"))
+
+
+def scope_holidays(queryset, user):
+    """Restrict company holidays to the ones the user may see."""
+    if user.has_perm("absences.view_all_holidays_requests"):
+        return queryset
+
+    if (
+        user.has_perm("absences.view_department_holidays_requests")
+        and user.profile.department
+    ):
+        return queryset.filter(requester__team__department=user.profile.department)
+
+    if user.has_perm("absences.view_team_holidays_requests") and user.profile.team:
+        return queryset.filter(requester__team=user.profile.team)
+
+    return queryset.none()
+
+
+def scope_absences(queryset, user):
+    """Restrict company absences to the ones the user may see."""
+    if user.has_perm("absences.view_all_absences"):
+        return queryset
+
+    if user.has_perm("absences.view_department_absences") and user.profile.department:
+        return queryset.filter(absentee__department=user.profile.department)
+
+    if user.has_perm("absences.view_team_absences") and user.profile.team:
+        return queryset.filter(absentee__team=user.profile.team)
+
+    return queryset.none()
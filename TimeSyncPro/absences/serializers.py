@@ -2,7 +2,7 @@ from django.db.models import F
 from django.utils import timezone
 from rest_framework import serializers
 
-from TimeSyncPro.absences.models import Holiday
+from TimeSyncPro.absences.models import Absence, Holiday
 
 
 class HolidayStatusUpdateSerializer(serializers.ModelSerializer):
@@ -47,6 +47,17 @@ class HolidayStatusUpdateSerializer(serializers.ModelSerializer):
                 "A review reason is required to deny the holiday request."
             )
 
+        if new_status == Holiday.StatusChoices.APPROVED and holiday.requester.team:
+            team = holiday.requester.team
+            usage = team.get_capacity_usage(
+                holiday.start_date, holiday.end_date, exclude_holiday=holiday.pk
+            )
+            if usage.exceeds_limit():
+                raise serializers.ValidationError(
+                    f"{team.name} already has {usage.peak_count} members on holiday "
+                    f"on {usage.peak_day:%d %b %Y}, the maximum is {usage.limit}."
+                )
+
         if new_status in [Holiday.StatusChoices.APPROVED, Holiday.StatusChoices.DENIED]:
             data["reviewed_by"] = request.user.profile
 
@@ -56,3 +67,39 @@ class HolidayStatusUpdateSerializer(serializers.ModelSerializer):
             )
 
         return data
+
+
+class HolidayListSerializer(serializers.ModelSerializer):
+    requester = serializers.CharField(source="requester.full_name")
+    reviewer = serializers.CharField(source="reviewer.full_name", default=None)
+
+    class Meta:
+        model = Holiday
+        fields = (
+            "id",
+            "requester",
+            "reviewer",
+            "start_date",
+            "end_date",
+            "days_requested",
+            "status",
+            "reason",
+        )
+
+
+class AbsenceListSerializer(serializers.ModelSerializer):
+    absentee = serializers.CharField(source="absentee.full_name")
+    added_by = serializers.CharField(source="added_by.full_name", default=None)
+
+    class Meta:
+        model = Absence
+        fields = (
+            "id",
+            "absentee",
+            "added_by",
+            "absence_type",
+            "start_date",
+            "end_date",
+            "days_of_absence",
+            "reason",
+        )
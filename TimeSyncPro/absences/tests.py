@@ -1,3 +1,158 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from TimeSyncPro.absences.models import Absence, Holiday
+from TimeSyncPro.absences.search import get_absences, get_holidays, scope_absences
+from TimeSyncPro.common.models import Address
+from TimeSyncPro.common.test_utils import create_profile
+from TimeSyncPro.companies.models import Company
+
+UserModel = get_user_model()
+
+
+class HolidaySearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(
+            name="Search Company",
+            annual_leave=20,
+            address=Address.objects.create(country="BG"),
+        )
+        cls.manager = create_profile(
+            cls.company, "manager@example.com", first_name="Mira", last_name="Ivanova"
+        )
+        cls.manager.user.is_superuser = True
+        cls.manager.user.save()
+
+        cls.agent = create_profile(
+            cls.company, "j.doe@example.com", first_name="John", last_name="Smith"
+        )
+        cls.engineer = create_profile(
+            cls.company, "eng@example.com", first_name="Maria", last_name="Petrova"
+        )
+
+        for day in range(1, 26):
+            Holiday.objects.create(
+                requester=cls.agent if day % 2 else cls.engineer,
+                reviewer=cls.manager,
+                start_date=date(2024, 3, day),
+                end_date=date(2024, 3, day),
+                days_requested=1,
+            )
+        Absence.objects.create(
+            absentee=cls.engineer,
+            added_by=cls.manager,
+            start_date=date(2024, 4, 1),
+            end_date=date(2024, 4, 5),
+            absence_type=Absence.AbsenceTypes.SICK,
+            days_of_absence=5,
+        )
+
+    def test_search_matches_name_prefixes(self):
+        holidays = get_holidays(self.company, "jo smi")
+
+        self.assertEqual(holidays.count(), 13)
+        self.assertTrue(all(h.requester_id == self.agent.pk for h in holidays))
+
+    def test_search_matches_email_words(self):
+        self.assertEqual(get_holidays(self.company, "doe").count(), 13)
+        self.assertEqual(get_holidays(self.company, "nobody").count(), 0)
+
+    def test_search_by_date_matches_records_covering_it(self):
+        self.assertEqual(get_absences(self.company, "03.04.2024").count(), 1)
+        self.assertEqual(get_absences(self.company, "2024-04-06").count(), 0)
+        self.assertEqual(get_holidays(self.company, "10/03/2024").count(), 1)
+
+    def test_list_pages_follow_cursor(self):
+        self.client.force_login(self.manager.user)
+        url = reverse("company_holidays", kwargs={"company_slug": self.company.slug})
+
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [holiday.pk for holiday in response.context["objects"]]
+            url = response.context["page_obj"].next_url
+
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+
+    def test_invalid_cursor_returns_not_found(self):
+        self.client.force_login(self.manager.user)
+        url = reverse("company_holidays", kwargs={"company_slug": self.company.slug})
+
+        response = self.client.get(url, {"cursor": "bogus"})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_api_lists_holidays(self):
+        self.client.force_login(self.manager.user)
+        url = reverse(
+            "api_company_holidays", kwargs={"company_slug": self.company.slug}
+        )
+
+        response = self.client.get(url, {"search": "maria", "page_size": 5})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["page_size"], 5)
+        self.assertEqual(len(data["results"]), 5)
+        self.assertEqual(data["results"][0]["requester"], "Maria Petrova")
+        self.assertIsNotNone(data["next"])
+
+    def test_api_pages_through_records_sharing_a_start_date(self):
+        same_day = [
+            Holiday.objects.create(
+                requester=self.agent,
+                reviewer=self.manager,
+                start_date=date(2024, 5, 1),
+                end_date=date(2024, 5, 1),
+                days_requested=1,
+            ).pk
+            for _ in range(12)
+        ]
+        self.client.force_login(self.manager.user)
+        url = reverse(
+            "api_company_holidays", kwargs={"company_slug": self.company.slug}
+        )
+
+        pages = []
+        next_url = f"{url}?search=01.05.2024&page_size=5"
+        with CaptureQueriesContext(connection) as queries:
+            while next_url:
+                data = self.client.get(next_url).json()
+                pages.append([holiday["id"] for holiday in data["results"]])
+                previous_url, next_url = data["previous"], data["next"]
+
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+        self.assertEqual(sum(pages, []), same_day)
+        self.assertFalse(any("OFFSET" in query["sql"] for query in queries))
+
+        data = self.client.get(previous_url).json()
+        self.assertEqual([holiday["id"] for holiday in data["results"]], pages[1])
+
+    def test_api_requires_permission(self):
+        self.client.force_login(self.agent.user)
+        url = reverse(
+            "api_company_absences", kwargs={"company_slug": self.company.slug}
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_scoped_absences_skip_missing_department_and_team(self):
+        self.agent.user.user_permissions.add(
+            *Permission.objects.filter(
+                codename__in=["view_department_absences", "view_team_absences"]
+            )
+        )
+        user = UserModel.objects.get(pk=self.agent.user.pk)
 
-# Create your tests here.
+        self.assertFalse(scope_absences(Absence.objects.all(), user).exists())
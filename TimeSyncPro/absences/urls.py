@@ -13,6 +13,16 @@ urlpatterns = [
         views.DeleteAbsenceAPIView.as_view(),
         name="delete_absence",
     ),
+    path(
+        "api/<slug:company_slug>/holiday-requests/",
+        views.HolidayRequestsAPIView.as_view(),
+        name="api_company_holidays",
+    ),
+    path(
+        "api/<slug:company_slug>/absences/",
+        views.AbsencesAPIView.as_view(),
+        name="api_company_absences",
+    ),
     path(
         "users/<slug:slug>/",
         include(
@@ -1,22 +1,29 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.views import generic as views
 from rest_framework import status
 from rest_framework.exceptions import PermissionDenied, ValidationError
-from rest_framework.generics import DestroyAPIView
+from rest_framework.generics import DestroyAPIView, ListAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from TimeSyncPro.absences.forms import CreateAbsenceForm
 from TimeSyncPro.absences.models import Absence
+from TimeSyncPro.absences.search import get_absences, scope_absences
+from TimeSyncPro.absences.serializers import AbsenceListSerializer
 from .views_mixins import (
     AbsencePermissionMixin,
     HasAnyOfPermissionMixin,
     GetEmployeeMixin,
 )
-from TimeSyncPro.common.views_mixins import ReturnToPageMixin, OwnerRequiredMixin
+from TimeSyncPro.common.views_mixins import (
+    CursorPaginationMixin,
+    OwnerRequiredMixin,
+    RecentStartDateCursorPagination,
+    ReturnToPageMixin,
+    StartDateCursorPagination,
+)
 
 UserModel = get_user_model()
 
@@ -47,38 +54,19 @@ class CreateAbsenceView(
         return context
 
 
-class AbsencesBaseView(LoginRequiredMixin, views.ListView):
+class AbsencesBaseView(CursorPaginationMixin, LoginRequiredMixin, views.ListView):
     model = Absence
     template_name = "absences/absence/absences.html"
     context_object_name = "objects"
     paginate_by = 10
+    pagination_class = RecentStartDateCursorPagination
 
     def get_queryset(self):
-        query = self.request.GET.get("search", "")
-        type_filter = self.request.GET.get("type", None)
-
-        queryset = (
-            Absence.objects.select_related(
-                "absentee",
-                "absentee__user",
-                "added_by",
-                "added_by__user",
-            ).filter(added_by__company=self.request.user.profile.company)
-        ).order_by("-start_date")
-
-        if type_filter:
-            queryset = queryset.filter(absence_type=type_filter)
-
-        if query:
-            queryset = queryset.filter(
-                Q(absentee__first_name__icontains=query)
-                | Q(absentee__last_name__icontains=query)
-                | Q(absentee__user__email__icontains=query)
-                | Q(added_by__first_name__icontains=query)
-                | Q(added_by__last_name__icontains=query)
-                | Q(added_by__user__email__icontains=query)
-            )
-        return queryset
+        return get_absences(
+            self.request.user.profile.company,
+            self.request.GET.get("search", ""),
+            self.request.GET.get("type", None),
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -97,16 +85,7 @@ class AbsencesView(HasAnyOfPermissionMixin, AbsencesBaseView):
     ]
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        user = self.request.user
-        if not user.has_perm("absences.view_all_absences"):
-            if user.has_perm("view_department_absences"):
-                queryset = queryset.filter(absentee__department=user.profile.department)
-            elif user.has_perm("view_team_absences"):
-                queryset = queryset.filter(absentee__team=user.profile.team)
-            else:
-                queryset = queryset.none()
-        return queryset
+        return scope_absences(super().get_queryset(), self.request.user)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -114,6 +93,30 @@ class AbsencesView(HasAnyOfPermissionMixin, AbsencesBaseView):
         return context
 
 
+class AbsencesAPIView(ListAPIView):
+    serializer_class = AbsenceListSerializer
+    pagination_class = RecentStartDateCursorPagination
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.profile.company is None or (
+            user.profile.company.slug != self.kwargs.get("company_slug")
+        ):
+            raise PermissionDenied("You can only access your own company's data")
+        if not any(user.has_perm(perm) for perm in AbsencesView.required_permissions):
+            raise PermissionDenied("You do not have permission to view this page.")
+
+        return scope_absences(
+            get_absences(
+                user.profile.company,
+                self.request.query_params.get("search", ""),
+                self.request.query_params.get("type", None),
+            ),
+            user,
+        )
+
+
 class MyAbsencesView(OwnerRequiredMixin, AbsencesBaseView):
 
     template_name = "absences/absence/my_absences.html"
@@ -136,9 +139,11 @@ class EmployeeAbsencesView(GetEmployeeMixin, AbsencePermissionMixin, AbsencesBas
         self.object = self.get_object()
         return super().dispatch(request, *args, **kwargs)
 
+    pagination_class = StartDateCursorPagination
+
     def get_queryset(self):
         queryset = super().get_queryset()
-        return queryset.filter(absentee=self.object.profile).order_by("start_date")
+        return queryset.filter(absentee=self.object.profile)
 
     def get_context_data(self, **kwargs):
         employee = self.object
@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Q, F
+from django.db.models import F
 from django.utils import timezone
 from django.views import generic as views
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -7,7 +7,7 @@ from django.urls import reverse
 from django.contrib import messages
 from rest_framework import status
 from rest_framework.exceptions import PermissionDenied
-from rest_framework.generics import UpdateAPIView
+from rest_framework.generics import ListAPIView, UpdateAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
@@ -19,46 +19,30 @@ from .views_mixins import (
 )
 from ..forms import RequestHolidayForm, ReviewHolidayForm
 from ..models import Holiday
-from ..serializers import HolidayStatusUpdateSerializer
-from ...common.views_mixins import CompanyAccessMixin, OwnerRequiredMixin
+from ..search import get_holidays, scope_holidays
+from ..serializers import HolidayListSerializer, HolidayStatusUpdateSerializer
+from ...common.views_mixins import (
+    CompanyAccessMixin,
+    CursorPaginationMixin,
+    OwnerRequiredMixin,
+    StartDateCursorPagination,
+)
 
 UserModel = get_user_model()
 
 
-class HolidaysBaseView(LoginRequiredMixin, views.ListView):
+class HolidaysBaseView(CursorPaginationMixin, LoginRequiredMixin, views.ListView):
     model = Holiday
     template_name = "absences/holiday/holiday_requests.html"
     paginate_by = 10
     context_object_name = "objects"
-    ordering = ["-start_date"]
 
     def get_queryset(self):
-        query = self.request.GET.get("search", "")
-        status_filter = self.request.GET.get("status", None)
-
-        queryset = (
-            Holiday.objects.select_related(
-                "requester",
-                "reviewer",
-                "reviewed_by",
-                "requester__team",
-            ).filter(requester__company=self.request.user.profile.company)
-        ).order_by("start_date")
-
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-
-        if query:
-            queryset = queryset.filter(
-                Q(requester__first_name__icontains=query)
-                | Q(requester__last_name__icontains=query)
-                | Q(requester__user__email__icontains=query)
-                | Q(reviewer__first_name__icontains=query)
-                | Q(reviewer__last_name__icontains=query)
-                | Q(reviewer__user__email__icontains=query)
-                | Q(start_date__icontains=query)
-            )
-        return queryset
+        return get_holidays(
+            self.request.user.profile.company,
+            self.request.GET.get("search", ""),
+            self.request.GET.get("status", None),
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -77,26 +61,7 @@ class RequestsView(HasAnyOfPermissionMixin, CompanyAccessMixin, HolidaysBaseView
     ]
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        user = self.request.user
-
-        if not user.has_perm("absences.view_all_holidays_requests"):
-            if (
-                user.has_perm("absences.view_department_holidays_requests")
-                and user.profile.department
-            ):
-                queryset = queryset.filter(
-                    requester__team__department=user.profile.department
-                )
-            elif (
-                user.has_perm("absences.view_team_holidays_requests")
-                and user.profile.team
-            ):
-                queryset = queryset.filter(requester__team=user.profile.team)
-            else:
-                queryset = queryset.none()
-
-        return queryset
+        return scope_holidays(super().get_queryset(), self.request.user)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -104,6 +69,30 @@ class RequestsView(HasAnyOfPermissionMixin, CompanyAccessMixin, HolidaysBaseView
         return context
 
 
+class HolidayRequestsAPIView(ListAPIView):
+    serializer_class = HolidayListSerializer
+    pagination_class = StartDateCursorPagination
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.profile.company is None or (
+            user.profile.company.slug != self.kwargs.get("company_slug")
+        ):
+            raise PermissionDenied("You can only access your own company's data")
+        if not any(user.has_perm(perm) for perm in RequestsView.required_permissions):
+            raise PermissionDenied("You do not have permission to view this page.")
+
+        return scope_holidays(
+            get_holidays(
+                user.profile.company,
+                self.request.query_params.get("search", ""),
+                self.request.query_params.get("status", None),
+            ),
+            user,
+        )
+
+
 class EmployeeRequestsView(GetEmployeeMixin, HolidayPermissionMixin, HolidaysBaseView):
     template_name = "absences/holiday/employee_requests.html"
 
@@ -174,17 +163,16 @@ class ReviewHolidayView(HolidayReviewAccessMixin, LoginRequiredMixin, views.Deta
         holiday = self.object
         requester_team = holiday.requester.get_team()
         if requester_team:
-            team_members_in_holiday = requester_team.get_team_members_at_holiday(
-                holiday.start_date, holiday.end_date
+            usage = requester_team.get_capacity_usage(
+                holiday.start_date, holiday.end_date, exclude_holiday=holiday.pk
             )
 
             context.update(
                 {
                     "requester_team": requester_team,
-                    "team_members_in_holiday": team_members_in_holiday,
-                    "team_members_in_holiday_count": requester_team.get_numbers_of_team_members_holiday_days_by_queryset(
-                        team_members_in_holiday
-                    ),
+                    "team_members_in_holiday": usage.holidays,
+                    "team_members_in_holiday_count": usage.peak_count,
+                    "team_capacity": usage,
                 }
             )
 
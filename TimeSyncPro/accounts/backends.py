@@ -1,10 +1,57 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
 
+from TimeSyncPro.accounts.group_permissions import (
+    ALL_PERMISSIONS,
+    get_group_permissions_table,
+)
+from TimeSyncPro.middleware.principal import PRINCIPAL_RELATED_FIELDS
+
 UserModel = get_user_model()
 
 
-class CaseInsensitiveEmailBackend(ModelBackend):
+class GroupPermissionBackend(ModelBackend):
+    """
+    Answer permission checks from the cached group permission table.
+
+    Group permissions come from the table for the names of the groups the user
+    is a member of, and are merged with the user's own ``user_permissions``,
+    so a check costs two small queries per user instead of the permission
+    joins of ``ModelBackend``.
+    """
+
+    def get_user_group_names(self, user_obj):
+        return list(user_obj.groups.values_list("name", flat=True))
+
+    def get_group_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+
+        if not hasattr(user_obj, "_group_perm_cache"):
+            table = get_group_permissions_table()
+            if user_obj.is_superuser:
+                group_names = [ALL_PERMISSIONS]
+            else:
+                group_names = self.get_user_group_names(user_obj)
+
+            user_obj._group_perm_cache = set().union(
+                *(table.get(name, frozenset()) for name in group_names)
+            )
+        return user_obj._group_perm_cache
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+
+        if not hasattr(user_obj, "_perm_cache"):
+            permissions = set(self.get_group_permissions(user_obj))
+            if not user_obj.is_superuser:
+                permissions |= self.get_user_permissions(user_obj)
+            user_obj._perm_cache = permissions
+        return user_obj._perm_cache
+
+
+class CaseInsensitiveEmailBackend(GroupPermissionBackend):
     def authenticate(self, request, username=None, password=None, **kwargs):
         try:
             user = UserModel.objects.get(email__iexact=username)
@@ -14,3 +61,12 @@ class CaseInsensitiveEmailBackend(ModelBackend):
 
             UserModel().set_password(password)
             return None
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related(
+                *PRINCIPAL_RELATED_FIELDS
+            ).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,68 @@
+from urllib.parse import urlencode
+
+from django.db.models import Q
+from django.urls import reverse
+
+from TimeSyncPro.accounts.models import Profile
+from TimeSyncPro.common.search import prefix_search_query
+
+UNASSIGNED = "none"
+
+
+def matching_profile_ids(company, query):
+    """
+    Return a subquery of the ids of the company's profiles whose names,
+    employee id or email start with the words of ``query``.
+
+    Profile and user fields are matched through the GIN indexed
+    ``search_vector`` of their own table, in one UNION query.
+    """
+    search_query = prefix_search_query(query)
+    if search_query is None:
+        return Profile.objects.none().values("id")
+
+    profiles = Profile.objects.filter(company=company).order_by()
+    by_profile = profiles.filter(search_vector=search_query).values("id")
+    by_email = profiles.filter(user__search_vector=search_query).values("id")
+    return by_profile.union(by_email)
+
+
+def filter_assignment(profiles, field_name, values):
+    """
+    Keep the profiles assigned to any of the ids in ``values`` through
+    ``field_name``; ``"none"`` keeps the unassigned ones.
+    """
+    condition = Q(**{f"{field_name}_id__in": [v for v in values if v.isdigit()]})
+    if UNASSIGNED in values:
+        condition |= Q(**{f"{field_name}__isnull": True})
+    return profiles.filter(condition)
+
+
+def search_directory(company, query="", team=(), shift=(), holiday_approvers=False):
+    """
+    Return the company members matching ``query``, for the autocomplete of
+    employee pickers. The ``profile_directory_idx`` index serves them in
+    ``directory_name`` order.
+    """
+    profiles = Profile.objects.filter(company=company).select_related("user")
+
+    if query.strip():
+        profiles = profiles.filter(pk__in=matching_profile_ids(company, query))
+    if team:
+        profiles = filter_assignment(profiles, "team", team)
+    if shift:
+        profiles = filter_assignment(profiles, "shift", shift)
+    if holiday_approvers:
+        profiles = profiles.filter(
+            pk__in=company.get_company_holiday_approvers().values("pk")
+        )
+
+    return profiles
+
+
+def get_autocomplete_url(company, **filters):
+    """Return the autocomplete endpoint of the company limited by ``filters``."""
+    url = reverse("company_members_autocomplete", kwargs={"company_slug": company.slug})
+    if filters:
+        url += "?" + urlencode(filters, doseq=True)
+    return url
@@ -0,0 +1,59 @@
+from collections import defaultdict
+
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+
+from TimeSyncPro.common.cache import bump_version
+
+GROUP_PERMISSIONS_CACHE_KEY = "group_permissions"
+ALL_PERMISSIONS = "*"
+
+_local_table = {}
+
+
+def _get_version():
+    return cache.get(f"{GROUP_PERMISSIONS_CACHE_KEY}:version", 1)
+
+
+def build_group_permissions_table():
+    table = defaultdict(set)
+
+    for group_name, app_label, codename in Permission.objects.filter(
+        group__isnull=False
+    ).values_list("group__name", "content_type__app_label", "codename"):
+        table[group_name].add(f"{app_label}.{codename}")
+
+    for app_label, codename in Permission.objects.values_list(
+        "content_type__app_label", "codename"
+    ):
+        table[ALL_PERMISSIONS].add(f"{app_label}.{codename}")
+
+    return {name: frozenset(perms) for name, perms in table.items()}
+
+
+def get_group_permissions_table():
+    """
+    Return ``{group name: frozenset of "app_label.codename"}``.
+
+    The table is built once, shared through the cache and memoized per process
+    until the version is bumped by ``invalidate_group_permissions_table``.
+    ``ALL_PERMISSIONS`` maps to every permission, for superusers.
+    """
+    key = f"{GROUP_PERMISSIONS_CACHE_KEY}:v{_get_version()}"
+
+    if key in _local_table:
+        return _local_table[key]
+
+    table = cache.get(key)
+    if table is None:
+        table = build_group_permissions_table()
+        cache.set(key, table, timeout=None)
+
+    _local_table.clear()
+    _local_table[key] = table
+    return table
+
+
+def invalidate_group_permissions_table():
+    bump_version(f"{GROUP_PERMISSIONS_CACHE_KEY}:version", cache)
+    _local_table.clear()
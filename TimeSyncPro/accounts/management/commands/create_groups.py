@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import Group, Permission
 
+from TimeSyncPro.accounts.group_permissions import invalidate_group_permissions_table
 from TimeSyncPro.accounts.management.commands.permissions_utils import (
     get_admin_permissions,
 )
@@ -207,6 +208,8 @@ class Command(BaseCommand):
             elif employee.role == Profile.EmployeeRoles.STAFF:
                 employee.user.groups.add(staff_group)
 
+        invalidate_group_permissions_table()
+
         self.stdout.write(
             self.style.SUCCESS("Successfully created groups and assigned permissions")
         )
@@ -1,8 +1,14 @@
 import random
+from collections import defaultdict
+from datetime import timedelta
 
+from django.apps import apps
 from django.contrib import auth
 from django.contrib.auth import models as auth_models
 from django.contrib.auth.hashers import make_password
+from django.db import models
+
+from TimeSyncPro.shifts.patterns import ShiftSchedule
 
 
 class TSPUserManager(auth_models.BaseUserManager):
@@ -71,22 +77,74 @@ class TSPUserManager(auth_models.BaseUserManager):
         return "".join(random.choice(allowed_chars) for _ in range(length))
 
 
-# class ProfileManager(models.Manager):
-#     pass
-# def get_queryset(self):
-#     return super().get_queryset()
-
-# def administrators(self):
-#     return self.filter(role='Administrator')
-
-# def managers(self):
-#     return self.filter(role='Manager')
-#
-# def hr(self):
-#     return self.filter(role='HR')
-#
-# def team_leaders(self):
-#     return self.filter(role='Team Leader')
-#
-# def staff(self):
-#     return self.filter(role='Staff')
+class ProfileQuerySet(models.QuerySet):
+    def get_working_calendars(self, start_date, end_date):
+        """
+        Return working days, days off, approved holidays and absences per profile.
+
+        Profiles sharing a shift reuse one evaluated pattern, and the whole
+        batch is answered from a constant number of queries.
+        """
+        Holiday = apps.get_model("absences", "Holiday")
+        Absence = apps.get_model("absences", "Absence")
+        ShiftBlock = apps.get_model("shifts", "ShiftBlock")
+
+        profiles = list(self.select_related("company__address", "shift", "team__shift"))
+        shifts = {profile.pk: profile.get_shift() for profile in profiles}
+
+        blocks_by_shift = defaultdict(list)
+        for block in ShiftBlock.all_objects.filter(
+            pattern_id__in={shift.pk for shift in shifts.values() if shift}
+        ).order_by("order"):
+            blocks_by_shift[block.pattern_id].append(block)
+
+        holidays_by_profile = defaultdict(list)
+        for holiday in Holiday.objects.filter(
+            requester_id__in=shifts,
+            status=Holiday.StatusChoices.APPROVED,
+            start_date__lte=end_date,
+            end_date__gte=start_date,
+        ):
+            holidays_by_profile[holiday.requester_id].append(holiday)
+
+        absences_by_profile = defaultdict(list)
+        for absence in Absence.objects.filter(
+            absentee_id__in=shifts,
+            start_date__lte=end_date,
+            end_date__gte=start_date,
+        ):
+            absences_by_profile[absence.absentee_id].append(absence)
+
+        all_days = [
+            start_date + timedelta(days=i)
+            for i in range((end_date - start_date).days + 1)
+        ]
+        working_days_by_shift = {}
+        calendars = {}
+
+        for profile in profiles:
+            shift = shifts[profile.pk]
+
+            if shift:
+                if shift.pk not in working_days_by_shift:
+                    pattern = ShiftSchedule.from_blocks(
+                        shift.start_date, blocks_by_shift[shift.pk], profile.company
+                    )
+                    working_days_by_shift[shift.pk] = pattern.get_working_dates(
+                        start_date, end_date
+                    )
+                working_days = working_days_by_shift[shift.pk]
+            else:
+                working_days = profile.get_working_days(start_date, end_date)
+
+            working_days_set = set(working_days)
+            calendars[profile.pk] = {
+                "profile": profile,
+                "shift": shift,
+                "working_days": working_days,
+                "days_off": [day for day in all_days if day not in working_days_set],
+                "holidays": holidays_by_profile[profile.pk],
+                "absences": absences_by_profile[profile.pk],
+            }
+
+        return calendars
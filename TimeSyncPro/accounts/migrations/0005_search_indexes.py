@@ -0,0 +1,62 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:19
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_alter_profile_date_of_hire"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("common", "0002_alter_address_country"),
+        ("companies", "0002_initial"),
+        ("shifts", "0002_shift_year_calendar"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector(
+                    "first_name", "last_name", config="simple"
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="tspuser",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector(
+                    "email",
+                    models.Func(
+                        models.F("email"),
+                        models.Value("[^\\w]+"),
+                        models.Value(" "),
+                        models.Value("g"),
+                        function="regexp_replace",
+                        output_field=models.TextField(),
+                    ),
+                    config="simple",
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="profile",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="profile_search_vector_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tspuser",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="user_search_vector_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:23
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_search_indexes"),
+        ("common", "0002_alter_address_country"),
+        ("companies", "0002_initial"),
+        ("shifts", "0002_shift_year_calendar"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="directory_name",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.text.Lower(
+                    django.db.models.functions.text.Concat(
+                        django.db.models.functions.comparison.Coalesce(
+                            "first_name", models.Value("")
+                        ),
+                        models.Value(" "),
+                        django.db.models.functions.comparison.Coalesce(
+                            "last_name", models.Value("")
+                        ),
+                    )
+                ),
+                output_field=models.CharField(max_length=61),
+            ),
+        ),
+        # Generated columns cannot be altered, the vector is rebuilt instead
+        migrations.RemoveIndex(
+            model_name="profile",
+            name="profile_search_vector_idx",
+        ),
+        migrations.RemoveField(
+            model_name="profile",
+            name="search_vector",
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector(
+                    "first_name", "last_name", "employee_id", config="simple"
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="profile",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="profile_search_vector_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="profile",
+            index=models.Index(
+                fields=["company", "directory_name", "id"], name="profile_directory_idx"
+            ),
+        ),
+    ]
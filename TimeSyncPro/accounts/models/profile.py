@@ -4,15 +4,19 @@ from datetime import timedelta, date
 from django.apps import apps
 from django.core.validators import MinLengthValidator
 from django.db import models
-from django.db.models import F
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Concat, Lower
 
 from . import TSPUser
 
 # from .proxy_models import ManagerProxy, HRProxy, TeamLeaderProxy, StaffProxy
 
+from ..managers import ProfileQuerySet
 from ..validators import IsDigitsValidator, DateRangeValidator, DateOfBirthValidator
 
 from TimeSyncPro.common.model_mixins import CreatedModifiedMixin
+from TimeSyncPro.common.search import search_vector_field, search_vector_index
+from TimeSyncPro.shifts.working_calendar import working_calendar
 from ...history.model_mixins import HistoryMixin
 
 
@@ -55,6 +59,13 @@ class Profile(HistoryMixin, CreatedModifiedMixin):
                 fields=["employee_id", "company"], name="unique_employee_id_per_company"
             )
         ]
+        indexes = [
+            search_vector_index("profile_search_vector_idx"),
+            models.Index(
+                fields=["company", "directory_name", "id"],
+                name="profile_directory_idx",
+            ),
+        ]
 
         permissions = [
             ("add_company_admin", "Can add Company Administrator"),
@@ -206,6 +217,25 @@ class Profile(HistoryMixin, CreatedModifiedMixin):
         related_name="employees",
     )
 
+    search_vector = search_vector_field("first_name", "last_name", "employee_id")
+
+    # Normalized sort key of the company directory, see accounts.directory
+    directory_name = models.GeneratedField(
+        expression=Lower(
+            Concat(
+                Coalesce("first_name", Value("")),
+                Value(" "),
+                Coalesce("last_name", Value("")),
+            )
+        ),
+        output_field=models.CharField(
+            max_length=MAX_FIRST_NAME_LENGTH + MAX_LAST_NAME_LENGTH + 1
+        ),
+        db_persist=True,
+    )
+
+    objects = ProfileQuerySet.as_manager()
+
     @classmethod
     def get_all_employee_roles(cls):
         employee_role = [role.value for role in cls.EmployeeRoles]
@@ -282,9 +312,12 @@ class Profile(HistoryMixin, CreatedModifiedMixin):
         return None
 
     def get_working_days(self, start_date, end_date):
+        return working_calendar.get_working_days(self, start_date, end_date)
+
+    def compute_working_days(self, start_date, end_date):
         shift = self.get_shift()
         if shift:
-            return shift.get_shift_working_dates_by_period(start_date, end_date)
+            return shift.get_pattern().get_working_dates(start_date, end_date)
 
         working_days = []
         current_date = start_date
@@ -321,6 +354,7 @@ class Profile(HistoryMixin, CreatedModifiedMixin):
             start_date + timedelta(days=i)
             for i in range((end_date - start_date).days + 1)
         ]
+        working_days = set(working_days)
         return [day for day in all_days if day not in working_days]
 
     def get_team_employees_holidays_at_a_time(self):
@@ -329,16 +363,4 @@ class Profile(HistoryMixin, CreatedModifiedMixin):
         return None
 
     def get_count_of_working_days_by_period(self, start_date, end_date):
-        working_days = 0
-        shift = self.get_shift()
-        if shift:
-            return shift.get_count_of_shift_working_days_by_period(start_date, end_date)
-
-        current_date = start_date
-        while current_date <= end_date:
-
-            if current_date.weekday() < 5:
-                working_days += 1
-            current_date += timedelta(days=1)
-
-        return working_days
+        return working_calendar.count_working_days(self, start_date, end_date)
@@ -9,6 +9,11 @@ from django.contrib.auth import models as auth_models
 
 from django.utils import timezone
 
+from TimeSyncPro.common.search import (
+    search_vector_field,
+    search_vector_index,
+    split_words,
+)
 from ..managers import TSPUserManager
 from ...history.model_mixins import HistoryMixin
 
@@ -69,12 +74,15 @@ class TSPUser(HistoryMixin, auth_models.AbstractBaseUser, auth_models.Permission
 
     activation_token = models.CharField(max_length=64, blank=True, null=True)
 
+    search_vector = search_vector_field("email", split_words("email"))
+
     class Meta:
         verbose_name = _("user")
         verbose_name_plural = _("users")
         indexes = [
             models.Index(fields=["email"]),
             models.Index(fields=["slug"]),
+            search_vector_index("user_search_vector_idx"),
         ]
 
         permissions = [
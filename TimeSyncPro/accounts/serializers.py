@@ -70,3 +70,17 @@ class EmployeeSerializer(serializers.ModelSerializer):
             "employee_id",
             "user_slug",
         ]
+
+
+class DirectoryMemberSerializer(serializers.ModelSerializer):
+    text = serializers.CharField(source="__str__", read_only=True)
+    email = serializers.EmailField(source="user.email", read_only=True)
+
+    class Meta:
+        model = Profile
+        fields = [
+            "id",
+            "text",
+            "employee_id",
+            "email",
+        ]
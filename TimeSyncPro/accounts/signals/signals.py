@@ -3,11 +3,16 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
+from TimeSyncPro.accounts.group_permissions import invalidate_group_permissions_table
 from TimeSyncPro.accounts.models import Profile
 from TimeSyncPro.common.models import Address
+from TimeSyncPro.middleware.principal import (
+    invalidate_all_permissions,
+    invalidate_user_permissions,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -53,3 +58,38 @@ def create_profile(sender, instance: UserModel, created: bool, **kwargs):
                 user=instance,
                 address=address,
             )
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_saved_user_permissions(sender, instance, **kwargs):
+    invalidate_user_permissions(instance.pk)
+
+
+@receiver(m2m_changed, sender=UserModel.groups.through)
+@receiver(m2m_changed, sender=UserModel.user_permissions.through)
+def invalidate_changed_user_permissions(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        invalidate_user_permissions(instance.pk)
+    elif pk_set:
+        for user_id in pk_set:
+            invalidate_user_permissions(user_id)
+    else:
+        invalidate_all_permissions()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_group_permissions_table()
+        invalidate_all_permissions()
+
+
+@receiver([post_save, post_delete], sender=Group)
+def invalidate_saved_group_permissions(sender, **kwargs):
+    invalidate_group_permissions_table()
+    invalidate_all_permissions()
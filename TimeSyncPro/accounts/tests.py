@@ -0,0 +1,366 @@
+from datetime import date, time
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from TimeSyncPro.absences.models import Absence, Holiday
+from TimeSyncPro.accounts.group_permissions import get_group_permissions_table
+from TimeSyncPro.accounts.models import Profile
+from TimeSyncPro.common.models import Address
+from TimeSyncPro.common.test_utils import create_profile
+from TimeSyncPro.companies.models import Company, Team
+from TimeSyncPro.shifts.models import Shift, ShiftBlock
+
+UserModel = get_user_model()
+
+
+class WorkingCalendarsTests(TestCase):
+    start_date = date(2024, 3, 1)
+    end_date = date(2024, 3, 31)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(
+            name="Calendar Company",
+            annual_leave=20,
+            address=Address.objects.create(country="BG"),
+            working_on_local_holidays=False,
+        )
+        cls.shift = Shift.objects.create(
+            company=cls.company,
+            name="Four On Four Off",
+            start_date=date(2024, 1, 1),
+        )
+        ShiftBlock.objects.create(
+            pattern=cls.shift,
+            on_off_days=[1, 1, 1, 1, 0, 0, 0, 0],
+            start_time=time(8, 0),
+            end_time=time(16, 0),
+            order=1,
+        )
+        cls.team = Team.objects.create(
+            company=cls.company, name="Night Team", shift=cls.shift
+        )
+
+        cls.profiles = [
+            create_profile(cls.company, f"employee{i}@example.com", team=cls.team)
+            for i in range(3)
+        ]
+        cls.office_profile = create_profile(cls.company, "office@example.com")
+
+        Holiday.objects.create(
+            requester=cls.profiles[0],
+            start_date=date(2024, 3, 4),
+            end_date=date(2024, 3, 6),
+            status=Holiday.StatusChoices.APPROVED,
+        )
+        Absence.objects.create(
+            absentee=cls.profiles[1],
+            start_date=date(2024, 3, 10),
+            end_date=date(2024, 3, 11),
+            absence_type=Absence.AbsenceTypes.SICK,
+        )
+
+    def test_matches_per_profile_calculation(self):
+        calendars = Profile.objects.filter(company=self.company).get_working_calendars(
+            self.start_date, self.end_date
+        )
+
+        for profile in self.profiles + [self.office_profile]:
+            self.assertEqual(
+                calendars[profile.pk]["working_days"],
+                profile.get_working_days(self.start_date, self.end_date),
+            )
+            self.assertEqual(
+                calendars[profile.pk]["days_off"],
+                profile.get_days_off(self.start_date, self.end_date),
+            )
+
+        self.assertEqual(len(calendars[self.profiles[0].pk]["holidays"]), 1)
+        self.assertEqual(len(calendars[self.profiles[1].pk]["absences"]), 1)
+
+    def test_uses_constant_number_of_queries(self):
+        for i in range(3, 10):
+            create_profile(self.company, f"employee{i}@example.com", team=self.team)
+
+        with self.assertNumQueries(4):
+            Profile.objects.filter(company=self.company).get_working_calendars(
+                self.start_date, self.end_date
+            )
+
+    def test_batch_endpoint_returns_team_calendars(self):
+        self.client.force_login(self.office_profile.user)
+
+        response = self.client.get(
+            reverse("get_working_days_batch"),
+            {
+                "team_id": self.team.pk,
+                "start_date": self.start_date.isoformat(),
+                "end_date": self.end_date.isoformat(),
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["profiles"]
+        self.assertEqual(
+            {item["profile_id"] for item in data},
+            {profile.pk for profile in self.profiles},
+        )
+        self.assertTrue(all(item["shift_id"] == self.shift.pk for item in data))
+
+    def test_batch_endpoint_hides_colleagues_private_details(self):
+        Absence.objects.filter(absentee=self.profiles[1]).update(reason="Flu")
+        params = {
+            "team_id": self.team.pk,
+            "start_date": self.start_date.isoformat(),
+            "end_date": self.end_date.isoformat(),
+        }
+
+        self.client.force_login(self.profiles[0].user)
+        data = {
+            item["profile_id"]: item
+            for item in self.client.get(
+                reverse("get_working_days_batch"), params
+            ).json()["profiles"]
+        }
+
+        colleague = data[self.profiles[1].pk]
+        self.assertNotIn("remaining_days", colleague)
+        self.assertEqual(
+            colleague["absences"],
+            [{"start_date": "2024-03-10", "end_date": "2024-03-11"}],
+        )
+        self.assertIn("remaining_days", data[self.profiles[0].pk])
+        self.assertIn("reason", data[self.profiles[0].pk]["holidays"][0])
+
+        UserModel.objects.filter(pk=self.profiles[0].user_id).update(is_superuser=True)
+        response = self.client.get(reverse("get_working_days_batch"), params)
+        colleague = {item["profile_id"]: item for item in response.json()["profiles"]}[
+            self.profiles[1].pk
+        ]
+        self.assertEqual(colleague["absences"][0]["reason"], "Flu")
+        self.assertEqual(colleague["absences"][0]["absence_type"], "sick")
+
+    def test_batch_endpoint_is_scoped_to_own_company(self):
+        other_company = Company.objects.create(
+            name="Other Company",
+            annual_leave=20,
+            address=Address.objects.create(country="BG"),
+        )
+        outsider = create_profile(other_company, "outsider@example.com")
+        self.client.force_login(outsider.user)
+
+        response = self.client.get(
+            reverse("get_working_days_batch"),
+            {
+                "profile_ids": ",".join(str(p.pk) for p in self.profiles),
+                "start_date": self.start_date.isoformat(),
+                "end_date": self.end_date.isoformat(),
+            },
+        )
+
+        self.assertEqual(response.json()["profiles"], [])
+
+    def test_batch_endpoint_rejects_invalid_input(self):
+        self.client.force_login(self.office_profile.user)
+
+        response = self.client.get(
+            reverse("get_working_days_batch"),
+            {"team_id": self.team.pk, "start_date": "2024-03-31", "end_date": "x"},
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+class RequestPrincipalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(
+            name="Principal Company",
+            annual_leave=20,
+            address=Address.objects.create(country="BG"),
+        )
+        cls.user = create_profile(
+            cls.company, "principal@example.com", role=Profile.EmployeeRoles.STAFF
+        ).user
+        cls.user.groups.add(Group.objects.create(name=Profile.EmployeeRoles.STAFF))
+
+    def request_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("get_working_days"),
+                {
+                    "profile_id": self.user.profile.pk,
+                    "start_date": "2024-03-01",
+                    "end_date": "2024-03-31",
+                },
+            )
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_principal_is_loaded_once_per_request(self):
+        self.client.force_login(self.user)
+        self.request_queries()
+
+        # Session, user with profile and company, and the view's profile lookup.
+        # The middleware stack used to add 4 more queries on every request.
+        self.assertEqual(self.request_queries(), 3)
+
+    def test_group_change_invalidates_cached_permissions(self):
+        self.client.force_login(self.user)
+        self.request_queries()
+
+        group, _ = Group.objects.get_or_create(name=Profile.EmployeeRoles.STAFF)
+        group.permissions.add(Permission.objects.get(codename="view_history"))
+
+        response = self.client.get(reverse("get_working_days"))
+        self.assertIn("history.view_history", response.wsgi_request.user._perm_cache)
+
+
+class GroupPermissionBackendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(name=Profile.EmployeeRoles.MANAGER)
+        cls.group.permissions.add(Permission.objects.get(codename="view_absences"))
+        cls.user = UserModel.objects.create_user(
+            email="manager@example.com", password="password"
+        )
+        Profile.objects.filter(user=cls.user).update(role=Profile.EmployeeRoles.MANAGER)
+        cls.user.groups.add(cls.group)
+
+    def get_user(self):
+        return UserModel.objects.select_related("profile").get(pk=self.user.pk)
+
+    def test_answers_from_group_table_with_constant_queries(self):
+        get_group_permissions_table()
+        user = self.get_user()
+
+        with self.assertNumQueries(2):
+            self.assertTrue(user.has_perm("absences.view_absences"))
+            self.assertFalse(user.has_perm("absences.delete_absence"))
+            self.assertEqual(user.get_all_permissions(), {"absences.view_absences"})
+
+    def test_includes_user_permissions(self):
+        self.user.user_permissions.add(
+            Permission.objects.get(codename="delete_absence")
+        )
+
+        self.assertTrue(self.get_user().has_perm("absences.delete_absence"))
+        self.assertTrue(self.get_user().has_perm("absences.view_absences"))
+
+    def test_uses_group_membership_instead_of_role(self):
+        self.user.groups.clear()
+
+        self.assertFalse(self.get_user().has_perm("absences.view_absences"))
+
+    def test_group_permission_change_invalidates_table(self):
+        self.assertFalse(self.get_user().has_perm("absences.delete_absence"))
+
+        self.group.permissions.add(Permission.objects.get(codename="delete_absence"))
+
+        self.assertTrue(self.get_user().has_perm("absences.delete_absence"))
+
+    def test_create_groups_invalidates_table(self):
+        self.assertFalse(
+            self.get_user().has_perm("reports.generate_department_reports")
+        )
+
+        call_command("create_groups", stdout=StringIO())
+
+        self.assertTrue(self.get_user().has_perm("reports.generate_department_reports"))
+
+
+class CompanyDirectoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(
+            name="Directory Company",
+            annual_leave=20,
+            address=Address.objects.create(country="BG"),
+        )
+        cls.team = Team.objects.create(company=cls.company, name="Directory Team")
+
+        cls.members = [
+            create_profile(
+                cls.company,
+                f"member{i:02d}@example.com",
+                employee_id=f"EMP{i:05d}",
+                team=cls.team if i < 5 else None,
+            )
+            for i in range(25)
+        ]
+
+        cls.jane = create_profile(
+            cls.company, "jane.roe@example.com", first_name="Jane", last_name="Roe"
+        )
+        cls.jane.user.user_permissions.add(
+            Permission.objects.get(codename="view_employee")
+        )
+
+        cls.url = reverse(
+            "company_members_autocomplete", kwargs={"company_slug": cls.company.slug}
+        )
+
+    def test_search_matches_name_employee_id_and_email_prefixes(self):
+        self.client.force_login(self.jane.user)
+
+        for query in ("ja ro", "roe", "jane.roe@exa", "emp00003"):
+            with self.subTest(query=query):
+                response = self.client.get(self.url, {"search": query})
+                ids = [member["id"] for member in response.json()["results"]]
+                expected = self.members[3] if query == "emp00003" else self.jane
+                self.assertEqual(ids, [expected.pk])
+
+    def test_pages_follow_cursor_in_name_order(self):
+        self.client.force_login(self.jane.user)
+
+        names = []
+        url = f"{self.url}?search=member&limit=10"
+        while url:
+            data = self.client.get(url).json()
+            self.assertLessEqual(len(data["results"]), 10)
+            names += [member["text"] for member in data["results"]]
+            url = data["next"]
+
+        self.assertEqual(len(names), 25)
+        self.assertEqual(names, sorted(names))
+
+    def test_assignment_filters(self):
+        self.client.force_login(self.jane.user)
+
+        response = self.client.get(
+            self.url, {"team": "none", "search": "member", "limit": 100}
+        )
+        self.assertEqual(len(response.json()["results"]), 20)
+
+        response = self.client.get(
+            self.url, {"team": ["none", self.team.pk], "search": "member", "limit": 100}
+        )
+        self.assertEqual(len(response.json()["results"]), 25)
+
+    def test_requires_view_employee_permission(self):
+        self.client.force_login(self.members[0].user)
+
+        response = self.client.get(self.url, {"search": "jane"})
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_other_company_is_forbidden(self):
+        other = Company.objects.create(
+            name="Other Company",
+            annual_leave=20,
+            address=Address.objects.create(country="BG"),
+        )
+        self.client.force_login(self.jane.user)
+
+        response = self.client.get(
+            reverse("company_members_autocomplete", kwargs={"company_slug": other.slug})
+        )
+
+        self.assertEqual(response.status_code, 403)
@@ -5,6 +5,11 @@ from TimeSyncPro.accounts import views as views
 urlpatterns = [
     path("api/events/", views.CalendarEventsView.as_view(), name="api_events"),
     path("api/get-working-days/", views.get_working_days, name="get_working_days"),
+    path(
+        "api/get-working-days/batch/",
+        views.get_working_days_batch,
+        name="get_working_days_batch",
+    ),
     path("login/", views.SignInUserView.as_view(), name="sign_in"),
     path("sign-out/", views.LogoutAPIView.as_view(), name="sign_out"),
     path(
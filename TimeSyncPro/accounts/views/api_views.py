@@ -3,11 +3,16 @@ from rest_framework.authentication import SessionAuthentication
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import logout, get_user_model
 from rest_framework import generics, status
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from TimeSyncPro.accounts.directory import search_directory
 from TimeSyncPro.accounts.models import Profile
-from TimeSyncPro.accounts.serializers import EmployeeSerializer
-from TimeSyncPro.common.views_mixins import SmallPagination
+from TimeSyncPro.accounts.serializers import (
+    DirectoryMemberSerializer,
+    EmployeeSerializer,
+)
+from TimeSyncPro.common.views_mixins import DirectoryCursorPagination, SmallPagination
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +70,36 @@ class DepartmentEmployeesAPIView(generics.ListAPIView):
         )
 
 
+class CompanyMembersAutocompleteAPIView(generics.ListAPIView):
+    """
+    Company members matching ``?search=`` for the employee pickers, a
+    ``?limit=`` at a time. ``?team=`` and ``?shift=`` take ids or ``none``,
+    ``?holiday_approvers=1`` keeps the members who may approve holidays.
+    Requires ``accounts.view_employee``, like the member list.
+    """
+
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [SessionAuthentication]
+    serializer_class = DirectoryMemberSerializer
+    pagination_class = DirectoryCursorPagination
+
+    def get_queryset(self):
+        company = self.request.user.profile.company
+        if company is None or company.slug != self.kwargs["company_slug"]:
+            raise PermissionDenied("You can only access your own company's data")
+        if not self.request.user.has_perm("accounts.view_employee"):
+            raise PermissionDenied("You do not have permission to view this page.")
+
+        params = self.request.query_params
+        return search_directory(
+            company,
+            params.get("search", ""),
+            team=params.getlist("team"),
+            shift=params.getlist("shift"),
+            holiday_approvers=bool(params.get("holiday_approvers")),
+        )
+
+
 class LogoutAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
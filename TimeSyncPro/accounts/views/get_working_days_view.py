@@ -1,9 +1,14 @@
 import logging
 from datetime import datetime
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
-from rest_framework.status import HTTP_400_BAD_REQUEST
+from rest_framework.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_403_FORBIDDEN,
+)
 from TimeSyncPro.accounts.models import Profile
 
 logger = logging.getLogger(__name__)
@@ -29,3 +34,112 @@ def get_working_days(request):
         )
 
     return JsonResponse({"error": "Invalid input"}, status=HTTP_400_BAD_REQUEST)
+
+
+MAX_BATCH_PERIOD_DAYS = 366
+
+
+PRIVATE_DETAILS_PERMISSION = "absences.view_all_absences"
+
+
+def _serialize_absence_period(absence, with_details):
+    period = {
+        "start_date": absence.start_date.isoformat(),
+        "end_date": absence.end_date.isoformat(),
+    }
+    if with_details:
+        period["reason"] = absence.reason
+    return period
+
+
+def _serialize_calendar(profile_id, calendar, with_details):
+    data = {
+        "profile_id": profile_id,
+        "full_name": calendar["profile"].full_name,
+        "shift_id": calendar["shift"].pk if calendar["shift"] else None,
+        "working_days": [d.isoformat() for d in calendar["working_days"]],
+        "days_off": [d.isoformat() for d in calendar["days_off"]],
+        "holidays": [
+            _serialize_absence_period(holiday, with_details)
+            for holiday in calendar["holidays"]
+        ],
+        "absences": [
+            _serialize_absence_period(absence, with_details)
+            for absence in calendar["absences"]
+        ],
+    }
+
+    if with_details:
+        for period, absence in zip(data["absences"], calendar["absences"]):
+            period["absence_type"] = absence.absence_type
+        data["remaining_days"] = calendar["profile"].remaining_leave_days
+
+    return data
+
+
+def get_working_days_batch(request):
+    if not request.user.is_authenticated:
+        return JsonResponse(
+            {"error": "Authentication required"}, status=HTTP_401_UNAUTHORIZED
+        )
+
+    company = getattr(getattr(request.user, "profile", None), "company", None)
+    if not company:
+        return JsonResponse({"error": "Company not found"}, status=HTTP_403_FORBIDDEN)
+
+    try:
+        start_date = datetime.strptime(request.GET.get("start_date"), "%Y-%m-%d").date()
+        end_date = datetime.strptime(request.GET.get("end_date"), "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return JsonResponse({"error": "Invalid input"}, status=HTTP_400_BAD_REQUEST)
+
+    if not 0 <= (end_date - start_date).days < MAX_BATCH_PERIOD_DAYS:
+        return JsonResponse({"error": "Invalid period"}, status=HTTP_400_BAD_REQUEST)
+
+    profiles = Profile.objects.filter(company=company)
+    profile_ids = request.GET.get("profile_ids")
+    team_id = request.GET.get("team_id")
+    department_id = request.GET.get("department_id")
+    shift_id = request.GET.get("shift_id")
+
+    try:
+        if profile_ids:
+            profiles = profiles.filter(
+                id__in=[int(profile_id) for profile_id in profile_ids.split(",")]
+            )
+        elif team_id:
+            profiles = profiles.filter(team_id=int(team_id))
+        elif department_id:
+            profiles = profiles.filter(department_id=int(department_id))
+        elif shift_id:
+            profiles = profiles.filter(
+                Q(shift_id=int(shift_id))
+                | Q(shift__isnull=True, team__shift_id=int(shift_id))
+            )
+        else:
+            raise ValueError("No profiles selected")
+    except ValueError as e:
+        logger.warning(f"Invalid batch working days request: {e}")
+        return JsonResponse({"error": "Invalid input"}, status=HTTP_400_BAD_REQUEST)
+
+    calendars = profiles.order_by("first_name", "id").get_working_calendars(
+        start_date, end_date
+    )
+
+    # Reasons, absence types and leave balances are only shown for the caller's
+    # own profile, unless they may see every absence of the company.
+    can_view_details = request.user.has_perm(PRIVATE_DETAILS_PERMISSION)
+    own_profile_id = request.user.profile.pk
+
+    return JsonResponse(
+        {
+            "profiles": [
+                _serialize_calendar(
+                    profile_id,
+                    calendar,
+                    can_view_details or profile_id == own_profile_id,
+                )
+                for profile_id, calendar in calendars.items()
+            ]
+        }
+    )
@@ -0,0 +1,159 @@
+import logging
+import pickle
+import threading
+
+from django.conf import settings
+from django.core.cache import cache as default_cache, caches
+
+logger = logging.getLogger(__name__)
+
+
+def bump_version(key, cache=None):
+    """
+    Increment the version stored at ``key``, starting from 2 since readers
+    default a missing version to 1. Every key built from the old version is
+    orphaned at once.
+    """
+    cache = cache or default_cache
+    if cache.add(key, 2, timeout=None):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The key expired or was evicted between ``add`` and ``incr``.
+        cache.set(key, 2, timeout=None)
+
+
+class TenantCache:
+    """
+    Read-through cache helper namespaced by company slug.
+
+    Keys look like ``tenant:<slug>:v<version>:<key>``. Bumping a tenant's version
+    with ``invalidate`` orphans every key of that tenant at once; the old entries
+    simply expire. Pass ``None`` as the slug for data shared by all tenants,
+    which lives under the separate ``shared`` prefix so no company slug can
+    collide with it.
+
+    Payload sizes are measured on one write in ``TENANT_CACHE_SIZE_SAMPLE_RATE``,
+    pickled the way the backends store them.
+    """
+
+    KEY_PREFIX = "tenant"
+    SHARED_NAMESPACE = "shared"
+    DEFAULT_SIZE_SAMPLE_RATE = 10
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def size_sample_rate(self):
+        return max(
+            getattr(
+                settings, "TENANT_CACHE_SIZE_SAMPLE_RATE", self.DEFAULT_SIZE_SAMPLE_RATE
+            ),
+            1,
+        )
+
+    def _namespace(self, company_slug):
+        if company_slug:
+            return f"{self.KEY_PREFIX}:{company_slug}"
+        return self.SHARED_NAMESPACE
+
+    def _version_key(self, company_slug):
+        return f"{self._namespace(company_slug)}:version"
+
+    def get_version(self, company_slug):
+        key = self._version_key(company_slug)
+        version = self.cache.get(key)
+        if version is None:
+            self.cache.add(key, 1, timeout=None)
+            version = self.cache.get(key, 1)
+        return version
+
+    def make_key(self, company_slug, key):
+        version = self.get_version(company_slug)
+        return f"{self._namespace(company_slug)}:v{version}:{key}"
+
+    def _record(self, hit=None, value=None, write=False):
+        with self._lock:
+            if hit is True:
+                self.hits += 1
+            elif hit is False:
+                self.misses += 1
+
+            if not write:
+                return
+            self.writes += 1
+            sampled = (self.writes - 1) % self.size_sample_rate == 0
+
+        if sampled:
+            size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+            with self._lock:
+                self.sampled_writes += 1
+                self.sampled_bytes += size
+                self.max_payload = max(self.max_payload, size)
+
+    def get(self, company_slug, key, default=None):
+        sentinel = object()
+        value = self.cache.get(self.make_key(company_slug, key), sentinel)
+        self._record(hit=value is not sentinel)
+        return default if value is sentinel else value
+
+    def set(self, company_slug, key, value, timeout=None):
+        self.cache.set(self.make_key(company_slug, key), value, timeout=timeout)
+        self._record(value=value, write=True)
+
+    def delete(self, company_slug, key):
+        self.cache.delete(self.make_key(company_slug, key))
+
+    def get_or_set(self, company_slug, key, default, timeout=None):
+        """Return the cached value, computing and storing ``default()`` on a miss."""
+        cache_key = self.make_key(company_slug, key)
+        sentinel = object()
+        value = self.cache.get(cache_key, sentinel)
+
+        if value is not sentinel:
+            self._record(hit=True)
+            return value
+
+        value = default() if callable(default) else default
+        self.cache.set(cache_key, value, timeout=timeout)
+        self._record(hit=False, value=value, write=True)
+        return value
+
+    def invalidate(self, company_slug):
+        bump_version(self._version_key(company_slug), self.cache)
+        logger.info(f"Invalidated cache namespace {self._namespace(company_slug)}")
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.sampled_writes = 0
+        self.sampled_bytes = 0
+        self.max_payload = 0
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "writes": self.writes,
+                "avg_payload_bytes": (
+                    round(self.sampled_bytes / self.sampled_writes)
+                    if self.sampled_writes
+                    else 0
+                ),
+                "max_payload_bytes": self.max_payload,
+            }
+
+
+tenant_cache = TenantCache()
@@ -0,0 +1,89 @@
+import logging
+import threading
+from collections import OrderedDict
+
+import holidays
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HolidayCalendar:
+    """Process-wide LRU cache of public holiday dates keyed by (country_code, year)."""
+
+    DEFAULT_MAX_SIZE = 128
+
+    def __init__(self, max_size=None):
+        self._max_size = max_size
+        self._calendars = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self):
+        if self._max_size:
+            return self._max_size
+        return getattr(settings, "HOLIDAY_CALENDAR_MAX_SIZE", self.DEFAULT_MAX_SIZE)
+
+    @staticmethod
+    def _load_holidays(country_code, year):
+        try:
+            return frozenset(holidays.country_holidays(country_code, years=year))
+        except (KeyError, ValueError, NotImplementedError) as e:
+            logger.warning(f"No holiday calendar for {country_code} {year}: {e}")
+            return frozenset()
+
+    def get_holidays(self, country_code, year):
+        key = (country_code, year)
+
+        with self._lock:
+            if key in self._calendars:
+                self._calendars.move_to_end(key)
+                self.hits += 1
+                return self._calendars[key]
+            self.misses += 1
+
+        holiday_dates = self._load_holidays(country_code, year)
+
+        with self._lock:
+            self._calendars[key] = holiday_dates
+            self._calendars.move_to_end(key)
+            while len(self._calendars) > self.max_size:
+                self._calendars.popitem(last=False)
+
+        return holiday_dates
+
+    def get_holidays_in_range(self, country_code, start_date, end_date):
+        holiday_dates = set()
+        for year in range(start_date.year, end_date.year + 1):
+            holiday_dates.update(
+                day
+                for day in self.get_holidays(country_code, year)
+                if start_date <= day <= end_date
+            )
+        return frozenset(holiday_dates)
+
+    def is_holiday(self, country_code, day):
+        return day in self.get_holidays(country_code, day.year)
+
+    def invalidate(self, country_code=None, year=None):
+        with self._lock:
+            for key in list(self._calendars):
+                if country_code is not None and key[0] != country_code:
+                    continue
+                if year is not None and key[1] != year:
+                    continue
+                del self._calendars[key]
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._calendars),
+                "max_size": self.max_size,
+            }
+
+
+holiday_calendar = HolidayCalendar()
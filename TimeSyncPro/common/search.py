@@ -0,0 +1,76 @@
+import re
+from datetime import datetime
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchVector, SearchVectorField
+from django.db import models
+from django.db.models import F, Func, Value
+
+SEARCH_CONFIG = "simple"
+
+SEARCH_DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%d.%m.%Y",
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%d %b %Y",
+    "%d %B %Y",
+    "%b %d, %Y",
+    "%B %d, %Y",
+)
+
+SEARCH_WORD_RE = re.compile(r"\w+")
+
+
+def split_words(field_name):
+    """Expression splitting a text field into words, e.g. the parts of an email."""
+    return Func(
+        F(field_name),
+        Value(r"[^\w]+"),
+        Value(" "),
+        Value("g"),
+        function="regexp_replace",
+        output_field=models.TextField(),
+    )
+
+
+def search_vector_field(*expressions):
+    """
+    Generated ``tsvector`` column over ``expressions``, kept up to date by the
+    database itself whenever the row changes.
+    """
+    return models.GeneratedField(
+        expression=SearchVector(*expressions, config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+
+def search_vector_index(name):
+    return GinIndex(fields=["search_vector"], name=name)
+
+
+def prefix_search_query(query):
+    """
+    Return a ``SearchQuery`` matching every word of ``query`` as a prefix,
+    or ``None`` when the query has no words.
+    """
+    words = SEARCH_WORD_RE.findall(query.lower())
+    if not words:
+        return None
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+
+
+def parse_search_date(query):
+    """Return the date a search query spells out, or ``None``."""
+    query = " ".join(query.split())
+    for date_format in SEARCH_DATE_FORMATS:
+        try:
+            return datetime.strptime(query, date_format).date()
+        except ValueError:
+            continue
+    return None
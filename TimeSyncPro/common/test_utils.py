@@ -0,0 +1,15 @@
+from django.contrib.auth import get_user_model
+
+from TimeSyncPro.accounts.models import Profile
+
+
+def create_profile(company, email, **fields):
+    """
+    Register a user and return their profile in ``company``, named after the
+    email unless ``fields`` says otherwise.
+    """
+    user = get_user_model().objects.create_user(email=email, password="password")
+    fields.setdefault("first_name", email.split("@")[0].title())
+    fields.setdefault("last_name", "Tester")
+    Profile.objects.filter(user=user).update(company=company, **fields)
+    return Profile.objects.select_related("user").get(user=user)
@@ -1,12 +1,25 @@
+import logging
+import os
+import timeit
+from datetime import date
+from unittest import mock, skipUnless
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase, Client
+from django.test import TestCase, Client, SimpleTestCase, override_settings
 from django.urls import reverse
 
 from TimeSyncPro.absences.models import Absence
 from TimeSyncPro.accounts.models import Profile
+from TimeSyncPro.common.cache import TenantCache
+from TimeSyncPro.common.holiday_calendar import HolidayCalendar
 from TimeSyncPro.companies.models import Company
+from TimeSyncPro.middleware.check_company_middleware import (
+    AllowedRoutes,
+    CompanyCheckMiddleware,
+)
 
 UserModel = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 class IntegrationTests(TestCase):
@@ -176,3 +189,161 @@ class IntegrationTests(TestCase):
             },
         )
         self.assertEqual(response.status_code, 302)
+
+
+class HolidayCalendarTests(SimpleTestCase):
+    def test_caches_holidays_per_country_and_year(self):
+        calendar = HolidayCalendar(max_size=4)
+
+        self.assertTrue(calendar.is_holiday("BG", date(2024, 3, 3)))
+        self.assertFalse(calendar.is_holiday("BG", date(2024, 3, 5)))
+
+        self.assertEqual(calendar.get_stats()["misses"], 1)
+        self.assertEqual(calendar.get_stats()["hits"], 1)
+
+    def test_evicts_least_recently_used_year(self):
+        calendar = HolidayCalendar(max_size=2)
+
+        calendar.get_holidays("BG", 2023)
+        calendar.get_holidays("BG", 2024)
+        calendar.get_holidays("BG", 2023)
+        calendar.get_holidays("BG", 2025)
+
+        self.assertEqual(calendar.get_stats()["size"], 2)
+        calendar.get_holidays("BG", 2023)
+        self.assertEqual(calendar.get_stats()["misses"], 3)
+
+    def test_invalidate_drops_matching_calendars(self):
+        calendar = HolidayCalendar()
+        calendar.get_holidays("BG", 2024)
+        calendar.get_holidays("GB", 2024)
+
+        calendar.invalidate(country_code="BG")
+
+        self.assertEqual(calendar.get_stats()["size"], 1)
+
+    def test_unknown_country_has_no_holidays(self):
+        calendar = HolidayCalendar()
+        self.assertEqual(calendar.get_holidays("XX", 2024), frozenset())
+
+
+class TenantCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.tenant_cache = TenantCache()
+        self.tenant_cache.cache.clear()
+
+    def test_keys_are_namespaced_per_company(self):
+        self.tenant_cache.set("acme", "report", "acme data")
+        self.tenant_cache.set("globex", "report", "globex data")
+
+        self.assertEqual(self.tenant_cache.get("acme", "report"), "acme data")
+        self.assertEqual(self.tenant_cache.get("globex", "report"), "globex data")
+
+    def test_invalidate_only_drops_one_tenant(self):
+        self.tenant_cache.set("acme", "report", "acme data")
+        self.tenant_cache.set("globex", "report", "globex data")
+
+        self.tenant_cache.invalidate("acme")
+
+        self.assertIsNone(self.tenant_cache.get("acme", "report"))
+        self.assertEqual(self.tenant_cache.get("globex", "report"), "globex data")
+
+    def test_get_or_set_reads_through_once(self):
+        calls = []
+
+        def load():
+            calls.append(1)
+            return {"employees": 42}
+
+        first = self.tenant_cache.get_or_set("acme", "stats", load)
+        second = self.tenant_cache.get_or_set("acme", "stats", load)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 1)
+
+        stats = self.tenant_cache.get_stats()
+        self.assertEqual(stats["hit_ratio"], 0.5)
+        self.assertEqual(stats["writes"], 1)
+
+    @override_settings(TENANT_CACHE_SIZE_SAMPLE_RATE=2)
+    def test_payload_size_is_sampled_on_writes(self):
+        self.tenant_cache.set("acme", "small", "a" * 1000)
+        self.tenant_cache.set("acme", "skipped", "b" * 5000)
+        self.tenant_cache.get_or_set("acme", "tiny", lambda: "c")
+
+        stats = self.tenant_cache.get_stats()
+
+        self.assertEqual(stats["writes"], 3)
+        self.assertGreater(stats["max_payload_bytes"], 1000)
+        self.assertLess(stats["max_payload_bytes"], 5000)
+        self.assertLess(stats["avg_payload_bytes"], stats["max_payload_bytes"])
+
+    def test_shared_namespace_does_not_collide_with_company_slugs(self):
+        self.tenant_cache.set(None, "report", "shared data")
+        self.tenant_cache.set("global", "report", "global data")
+        self.tenant_cache.set("shared", "report", "company data")
+
+        self.tenant_cache.invalidate("global")
+        self.tenant_cache.invalidate("shared")
+
+        self.assertEqual(self.tenant_cache.get(None, "report"), "shared data")
+
+
+class AllowedRoutesTests(SimpleTestCase):
+    def setUp(self):
+        self.routes = AllowedRoutes(
+            CompanyCheckMiddleware.STATIC_ROUTE_NAMES,
+            CompanyCheckMiddleware.SLUG_ROUTE_NAMES,
+        )
+
+    def test_classifies_paths(self):
+        own_profile = reverse("profile", kwargs={"slug": "john-doe"})
+
+        self.assertTrue(self.routes.is_allowed(reverse("index"), "john-doe"))
+        self.assertTrue(self.routes.is_allowed(own_profile, "john-doe"))
+        self.assertFalse(self.routes.is_allowed(own_profile, "jane-doe"))
+        self.assertTrue(self.routes.is_allowed("/static/css/site.css", "john-doe"))
+        self.assertFalse(
+            self.routes.is_allowed(
+                reverse("dashboard", kwargs={"slug": "john-doe"}), "john-doe"
+            )
+        )
+
+    def test_classification_never_reverses(self):
+        paths = [
+            reverse("index"),
+            reverse("update_profile", kwargs={"slug": "john-doe"}),
+            reverse("dashboard", kwargs={"slug": "john-doe"}),
+            "/media/profile_pictures/john.png",
+        ]
+
+        with mock.patch(
+            "TimeSyncPro.middleware.check_company_middleware.reverse",
+            side_effect=AssertionError("reverse() on the hot path"),
+        ):
+            allowed = [self.routes.is_allowed(path, "john-doe") for path in paths]
+
+        self.assertEqual(allowed, [True, True, False, True])
+
+    @skipUnless(os.getenv("RUN_BENCHMARKS") == "True", "set RUN_BENCHMARKS=True")
+    def test_classification_benchmark(self):
+        paths = [
+            reverse("index"),
+            reverse("update_profile", kwargs={"slug": "john-doe"}),
+            reverse("dashboard", kwargs={"slug": "john-doe"}),
+            "/media/profile_pictures/john.png",
+        ]
+        iterations = 10_000
+
+        elapsed = min(
+            timeit.repeat(
+                lambda: [self.routes.is_allowed(path, "john-doe") for path in paths],
+                number=iterations,
+                repeat=5,
+            )
+        )
+
+        logger.warning(
+            f"AllowedRoutes.is_allowed: "
+            f"{elapsed / (iterations * len(paths)) * 1_000_000:.2f}us per path"
+        )
@@ -1,7 +1,10 @@
+import json
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import AccessMixin
 
 from django.core.exceptions import PermissionDenied
+from django.db.models import Q
 from django.http import Http404
 from django.utils.http import url_has_allowed_host_and_scheme
 
@@ -9,7 +12,9 @@ from django.shortcuts import get_object_or_404
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.shortcuts import redirect
 from django.urls import reverse
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.request import Request
 from rest_framework.response import Response
 
 from TimeSyncPro.companies.models import Company
@@ -237,7 +242,7 @@ class SmallPagination(PageNumberPagination):
         return Response(
             {
                 "count": self.page.paginator.count,
-                "page_size": self.page_size,
+                "page_size": self.page.paginator.per_page,
                 "current_page": self.page.number,
                 "total_pages": self.page.paginator.num_pages,
                 "next": self.get_next_link(),
@@ -247,6 +252,177 @@ class SmallPagination(PageNumberPagination):
         )
 
 
+class BaseCursorPagination(CursorPagination):
+    """
+    Cursor pagination keyed on every ``ordering`` field, not only the first.
+
+    DRF filters on ``ordering[0]`` and pages through its ties with an OFFSET,
+    capped by ``offset_cutoff``. Here the cursor position holds the values of
+    all the ordering fields, which end with the unique ``id``, so every page
+    is one index range scan of ``(a, id) > (x, y)`` and no offset is needed.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            field_name = order.lstrip("-")
+            if isinstance(instance, dict):
+                value = instance[field_name]
+            else:
+                value = getattr(instance, field_name)
+            values.append(str(value))
+        return json.dumps(values)
+
+    def _filter_by_position(self, queryset, position, reverse):
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        condition = Q(pk__in=[])
+        equal = {}
+        for order, value in zip(self.ordering, values):
+            field_name = order.lstrip("-")
+            # Test for: (cursor reversed) XOR (field reversed), as DRF does
+            lookup = "lt" if reverse != order.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{field_name}__{lookup}": value})
+            equal[field_name] = value
+        return queryset.filter(condition)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(
+                *(o[1:] if o.startswith("-") else f"-{o}" for o in self.ordering)
+            )
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = self._filter_by_position(queryset, current_position, reverse)
+
+        # Positions are unique, so the offset is only set by cursors of pages
+        # without a position, e.g. the first page seen from the second one.
+        results = list(queryset[offset : offset + self.page_size + 1])
+        self.page = results[: self.page_size]
+
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "page_size": self.get_page_size(self.request),
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+
+class TimelineCursorPagination(BaseCursorPagination):
+    """Keyset pagination over (timestamp, id), newest first."""
+
+    page_size = 4
+    ordering = ("-timestamp", "-id")
+
+
+class StartDateCursorPagination(BaseCursorPagination):
+    """Keyset pagination over (start_date, id), earliest first."""
+
+    page_size = 10
+    ordering = ("start_date", "id")
+
+
+class RecentStartDateCursorPagination(StartDateCursorPagination):
+    """Keyset pagination over (start_date, id), latest first."""
+
+    ordering = ("-start_date", "-id")
+
+
+class DirectoryCursorPagination(BaseCursorPagination):
+    """Keyset pagination over the company directory, by name."""
+
+    page_size = 20
+    page_size_query_param = "limit"
+    ordering = ("directory_name", "id")
+
+
+class CursorPage:
+    def __init__(self, next_url, previous_url):
+        self.next_url = next_url
+        self.previous_url = previous_url
+
+    def has_next(self):
+        return bool(self.next_url)
+
+    def has_previous(self):
+        return bool(self.previous_url)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginationMixin:
+    """
+    Keyset pagination for template list views, through the same cursor
+    paginators as the API: ``page_obj`` links to the next and previous pages
+    instead of numbering them, so deep pages cost the same as the first one.
+    """
+
+    pagination_class = StartDateCursorPagination
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.pagination_class()
+        paginator.page_size = page_size
+
+        try:
+            objects = paginator.paginate_queryset(queryset, Request(self.request))
+        except NotFound:
+            raise Http404("Invalid page cursor")
+
+        page = CursorPage(paginator.get_next_link(), paginator.get_previous_link())
+        return paginator, page, objects, page.has_other_pages()
+
+
 class ReturnToPageMixin:
     default_return_url = None
     fallback_url = "dashboard"
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CompaniesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "TimeSyncPro.companies"
+
+    def ready(self):
+        import TimeSyncPro.companies.signals
@@ -0,0 +1,181 @@
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+
+from TimeSyncPro.absences.models import Holiday
+from TimeSyncPro.common.cache import bump_version
+
+logger = logging.getLogger(__name__)
+
+HOLIDAY_FIELDS = (
+    "id",
+    "requester_id",
+    "requester__first_name",
+    "requester__last_name",
+    "start_date",
+    "end_date",
+    "reason",
+    "status",
+)
+
+
+@dataclass
+class CapacityUsage:
+    """Concurrent holidays of a team per day of a period."""
+
+    limit: int
+    holidays: list
+    daily_counts: dict = field(default_factory=dict)
+    peak_day: date = None
+    peak_count: int = 0
+
+    @property
+    def available(self):
+        return max(self.limit - self.peak_count, 0)
+
+    def get_full_days(self):
+        return [day for day, count in self.daily_counts.items() if count >= self.limit]
+
+    def exceeds_limit(self, extra=1):
+        return self.peak_count + extra > self.limit
+
+
+def sweep(intervals, start_date, end_date):
+    """
+    Return ``{day: concurrent intervals}`` for every day of the period, from
+    the ``(start, end)`` intervals that overlap it.
+
+    Each interval adds a +1 event on its first day and a -1 event on the day
+    after its last, both clipped to the period; walking the sorted events gives
+    the running count without looking at any interval twice.
+    """
+    events = {}
+    for first, last in intervals:
+        first, last = max(first, start_date), min(last, end_date)
+        if first > last:
+            continue
+        events[first] = events.get(first, 0) + 1
+        events[last + timedelta(days=1)] = events.get(last + timedelta(days=1), 0) - 1
+
+    counts = {}
+    concurrent = 0
+    day = start_date
+    for event_day in sorted(events):
+        for offset in range((min(event_day, end_date + timedelta(days=1)) - day).days):
+            counts[day + timedelta(days=offset)] = concurrent
+        day = max(day, event_day)
+        concurrent += events[event_day]
+
+    for offset in range((end_date - day).days + 1):
+        counts[day + timedelta(days=offset)] = concurrent
+    return counts
+
+
+class TeamCapacity:
+    """
+    Holidays of a team overlapping a period, cached per (team version, period).
+
+    The version of a team is bumped whenever one of its holidays or members
+    changes, which invalidates every cached period of the team at once.
+    """
+
+    KEY_PREFIX = "team_capacity"
+    DEFAULT_TIMEOUT = 60 * 60
+    COUNTED_STATUSES = (Holiday.StatusChoices.APPROVED,)
+    LISTED_STATUSES = (Holiday.StatusChoices.APPROVED, Holiday.StatusChoices.PENDING)
+
+    def __init__(self, timeout=None):
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def timeout(self):
+        if self._timeout:
+            return self._timeout
+        return getattr(settings, "TEAM_CAPACITY_CACHE_TIMEOUT", self.DEFAULT_TIMEOUT)
+
+    def _version_key(self, team_id):
+        return f"{self.KEY_PREFIX}:version:{team_id}"
+
+    def _count(self, hits=0, misses=0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def get_holidays(self, team_id, start_date, end_date):
+        """
+        Return the approved and pending holidays of the team that overlap the
+        period, in one query, as dicts of ``HOLIDAY_FIELDS``.
+        """
+        version = cache.get(self._version_key(team_id), 1)
+        key = f"{self.KEY_PREFIX}:{team_id}:v{version}:{start_date}:{end_date}"
+
+        holidays = cache.get(key)
+        if holidays is not None:
+            self._count(hits=1)
+            return holidays
+
+        holidays = list(
+            Holiday.objects.filter(
+                requester__team_id=team_id,
+                status__in=self.LISTED_STATUSES,
+                start_date__lte=end_date,
+                end_date__gte=start_date,
+            )
+            .order_by("start_date", "requester__first_name")
+            .values(*HOLIDAY_FIELDS)
+        )
+        cache.set(key, holidays, timeout=self.timeout)
+        self._count(misses=1)
+        return holidays
+
+    def get_usage(self, team, start_date, end_date, exclude_holiday=None):
+        """Return the ``CapacityUsage`` of ``team`` between the dates."""
+        holidays = [
+            holiday
+            for holiday in self.get_holidays(team.pk, start_date, end_date)
+            if holiday["id"] != exclude_holiday
+        ]
+        daily_counts = sweep(
+            (
+                (holiday["start_date"], holiday["end_date"])
+                for holiday in holidays
+                if holiday["status"] in self.COUNTED_STATUSES
+            ),
+            start_date,
+            end_date,
+        )
+
+        usage = CapacityUsage(
+            limit=team.employees_holidays_at_a_time,
+            holidays=holidays,
+            daily_counts=daily_counts,
+        )
+        if daily_counts:
+            usage.peak_day = max(daily_counts, key=daily_counts.get)
+            usage.peak_count = daily_counts[usage.peak_day]
+        return usage
+
+    def invalidate_team(self, team_id):
+        if team_id is None:
+            return
+
+        bump_version(self._version_key(team_id), cache)
+
+    def get_stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+team_capacity = TeamCapacity()
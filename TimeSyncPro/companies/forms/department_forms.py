@@ -7,6 +7,7 @@ from ..models import Department, Team
 
 from TimeSyncPro.common.form_mixins import CheckExistingNamePerCompanyMixin
 from ...accounts.models import Profile
+from ...reports.rollups import refresh_company_rollups_on_commit
 
 UserModel = get_user_model()
 
@@ -57,6 +58,8 @@ class DepartmentBaseForm(CheckExistingNamePerCompanyMixin, forms.ModelForm):
                         id__in=[m.id for m in self.cleaned_data["department_members"]]
                     ).update(department=department)
                 )
+                if self.cleaned_data["department_members"]:
+                    refresh_company_rollups_on_commit(department.company_id)
         return department
 
 
@@ -114,6 +117,9 @@ class EditDepartmentForm(DepartmentBaseForm):
             Profile.objects.filter(id__in=[m.id for m in members_to_add]).update(
                 department=department
             )
+            # The bulk updates send no Profile signal to regroup the rollups.
+            if members_to_remove or members_to_add:
+                refresh_company_rollups_on_commit(department.company_id)
 
 
 class DeleteDepartmentForm(forms.ModelForm):
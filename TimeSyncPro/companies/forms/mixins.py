@@ -1,4 +1,5 @@
-from django.forms import SelectMultiple
+from django.forms import Select, SelectMultiple
+from django.forms.models import ModelChoiceIterator
 
 
 class Select2SlideCheckboxWidget(SelectMultiple):
@@ -12,3 +13,43 @@ class Select2SlideCheckboxWidget(SelectMultiple):
             "https://code.jquery.com/jquery-3.7.1.min.js",
             "https://cdn.jsdelivr.net/npm/select2@4.1.0-rc.0/dist/js/select2.min.js",
         )
+
+
+class LazyChoicesMixin:
+    """
+    Render only the selected options of a model choice field. The rest are
+    looked up through the ``data-autocomplete-url`` of the widget, and the
+    field resolves the submitted ids against its queryset on validation.
+    """
+
+    def get_selected_choices(self, value):
+        choices = self.choices
+        if not isinstance(choices, ModelChoiceIterator):
+            return list(choices)
+
+        selected = []
+        if choices.field.empty_label is not None:
+            selected.append(("", choices.field.empty_label))
+
+        ids = [v for v in value if str(v).isdigit()]
+        if ids:
+            selected += [
+                choices.choice(obj) for obj in choices.queryset.filter(pk__in=ids)
+            ]
+        return selected
+
+    def optgroups(self, name, value, attrs=None):
+        choices = self.choices
+        self.choices = self.get_selected_choices(value)
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = choices
+
+
+class LazySelect2SlideCheckboxWidget(LazyChoicesMixin, Select2SlideCheckboxWidget):
+    pass
+
+
+class LazySelectWidget(LazyChoicesMixin, Select):
+    pass
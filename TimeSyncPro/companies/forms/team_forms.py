@@ -1,11 +1,14 @@
 from django import forms
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from .mixins import Select2SlideCheckboxWidget
+from .mixins import LazySelect2SlideCheckboxWidget, LazySelectWidget
 from ..models import Team
 from TimeSyncPro.common.form_mixins import CheckExistingNamePerCompanyMixin
+from ...accounts.directory import UNASSIGNED, get_autocomplete_url
 from ...accounts.models import Profile
+from ...reports.rollups import refresh_company_rollups_on_commit
 from ...shifts.models import Shift
+from ...shifts.utils import invalidate_profiles_on_commit
 
 UserModel = get_user_model()
 
@@ -15,7 +18,7 @@ class TeamBaseForm(CheckExistingNamePerCompanyMixin, forms.ModelForm):
     team_members = forms.ModelMultipleChoiceField(
         queryset=UserModel.objects.none(),
         required=False,
-        widget=Select2SlideCheckboxWidget(
+        widget=LazySelect2SlideCheckboxWidget(
             attrs={"class": "select2-checkbox", "data-placeholder": "Select members..."}
         ),
     )
@@ -29,6 +32,9 @@ class TeamBaseForm(CheckExistingNamePerCompanyMixin, forms.ModelForm):
             "employees_holidays_at_a_time",
             "team_members",
         ]
+        widgets = {
+            "holiday_approver": LazySelectWidget(),
+        }
 
     def __init__(self, *args, **kwargs):
         user = kwargs.pop("user", None)
@@ -45,6 +51,7 @@ class TeamBaseForm(CheckExistingNamePerCompanyMixin, forms.ModelForm):
                 self.company.get_company_holiday_approvers()
             )
             self.fields["shift"].queryset = self.company.shifts.all()
+            self.set_autocomplete_urls(team=[UNASSIGNED])
         else:
             self.fields["team_members"].queryset = UserModel.objects.none()
             self.fields["holiday_approver"].queryset = UserModel.objects.none()
@@ -52,6 +59,14 @@ class TeamBaseForm(CheckExistingNamePerCompanyMixin, forms.ModelForm):
 
         self.fields["team_members"].label = "Team Members"
 
+    def set_autocomplete_urls(self, team):
+        self.fields["team_members"].widget.attrs["data-autocomplete-url"] = (
+            get_autocomplete_url(self.company, team=team)
+        )
+        self.fields["holiday_approver"].widget.attrs["data-autocomplete-url"] = (
+            get_autocomplete_url(self.company, holiday_approvers=1)
+        )
+
     def save(self, commit=True):
         team = super().save(commit=False)
         team.company = self.company
@@ -59,9 +74,12 @@ class TeamBaseForm(CheckExistingNamePerCompanyMixin, forms.ModelForm):
         if commit:
             team.save()
             if "team_members" in self.cleaned_data:
-                Profile.objects.filter(
-                    id__in=[m.id for m in self.cleaned_data["team_members"]]
-                ).update(team=team)
+                member_ids = [m.id for m in self.cleaned_data["team_members"]]
+                Profile.objects.filter(id__in=member_ids).update(team=team)
+                # The bulk update sends no Profile signal to drop cached shifts.
+                invalidate_profiles_on_commit(member_ids)
+                if member_ids:
+                    refresh_company_rollups_on_commit(team.company_id)
 
         return team
 
@@ -94,9 +112,10 @@ class EditTeamForm(TeamBaseForm):
             self.fields["team_members"].queryset = combined_queryset
             self.fields["team_members"].initial = self.initial_team_members
             self.fields["holiday_approver"].queryset = (
-                self.team.company.employees.filter(role__in=["HR", "MANAGER"])
+                self.team.company.get_company_holiday_approvers()
             )
             self.fields["shift"].queryset = self.team.company.shifts.all()
+            self.set_autocomplete_urls(team=[UNASSIGNED, self.team.pk])
 
             self.fields["team_members"].label = "Team Members"
             # self.fields['team_members'].help_text = "Select team members from the list"
@@ -118,6 +137,13 @@ class EditTeamForm(TeamBaseForm):
             Profile.objects.filter(id__in=[m.id for m in members_to_add]).update(
                 team=team
             )
+            invalidate_profiles_on_commit(
+                [m.id for m in members_to_remove | members_to_add]
+            )
+            # The moved members and a changed team shift change the absence
+            # rollups, which no Profile signal refreshes here.
+            if members_to_remove or members_to_add or "shift" in self.changed_data:
+                refresh_company_rollups_on_commit(team.company_id)
 
         return team
 
@@ -8,6 +8,8 @@ import pytz
 
 from TimeSyncPro.accounts.models import Profile
 
+from TimeSyncPro.common.cache import tenant_cache
+from TimeSyncPro.common.holiday_calendar import holiday_calendar
 from TimeSyncPro.common.model_mixins import CreatedModifiedMixin, EmailFormatingMixin
 from TimeSyncPro.history.model_mixins import HistoryMixin
 
@@ -148,20 +150,52 @@ class Company(HistoryMixin, EmailFormatingMixin, CreatedModifiedMixin):
             return self.address.country.code
         return getattr(settings, "DEFAULT_COUNTRY_CODE", "GB")
 
-    def get_company_holiday_approvers(self):
-        return (
-            Profile.objects.filter(company=self)
-            .select_related("user")
-            .prefetch_related(
-                "user__user_permissions", "user__groups", "user__groups__permissions"
-            )
-            .filter(
-                Q(user__user_permissions__codename="update_holiday_requests_status")
-                | Q(
-                    user__groups__permissions__codename="update_holiday_requests_status"
+    def get_holiday_dates(self, start_date, end_date):
+        try:
+            country_code = self.country_code
+        except AttributeError:
+            return frozenset()
+
+        return holiday_calendar.get_holidays_in_range(
+            country_code, start_date, end_date
+        )
+
+    def is_holiday(self, day):
+        try:
+            return holiday_calendar.is_holiday(self.country_code, day)
+        except AttributeError:
+            return False
+
+    def get_company_holiday_approver_ids(self):
+        """
+        Ids of the members who may approve holidays, read through the tenant
+        cache. ``companies.signals`` invalidates the company when permissions,
+        groups or members change.
+        """
+
+        def load():
+            return list(
+                Profile.objects.filter(company=self)
+                .filter(
+                    Q(user__user_permissions__codename="update_holiday_requests_status")
+                    | Q(
+                        user__groups__permissions__codename="update_holiday_requests_status"
+                    )
+                    | Q(user__user_permissions__codename="approve_holiday_requests")
+                    | Q(user__groups__permissions__codename="approve_holiday_requests")
                 )
-                | Q(user__user_permissions__codename="approve_holiday_requests")
-                | Q(user__groups__permissions__codename="approve_holiday_requests")
+                .values_list("pk", flat=True)
+                .distinct()
             )
-            .distinct()
+
+        return tenant_cache.get_or_set(
+            self.slug,
+            f"holiday_approver_ids:{self.pk}",
+            load,
+            timeout=settings.HOLIDAY_APPROVERS_CACHE_TIMEOUT,
         )
+
+    def get_company_holiday_approvers(self):
+        return Profile.objects.filter(
+            company=self, pk__in=self.get_company_holiday_approver_ids()
+        ).select_related("user")
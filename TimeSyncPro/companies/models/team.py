@@ -7,6 +7,7 @@ from django.core.validators import (
 from django.db.models import Count
 from TimeSyncPro.absences.models import Holiday
 from TimeSyncPro.accounts.models import Profile
+from TimeSyncPro.companies.capacity import team_capacity
 
 from TimeSyncPro.history.model_mixins import HistoryMixin
 
@@ -90,7 +91,7 @@ class Team(HistoryMixin, models.Model):
 
         if start_date and end_date:
             team_holidays = team_holidays.filter(
-                start_date__gte=start_date, end_date__lte=end_date
+                start_date__lte=end_date, end_date__gte=start_date
             )
 
         return team_holidays
@@ -109,6 +110,9 @@ class Team(HistoryMixin, models.Model):
             .count()
         )
 
+    def get_capacity_usage(self, start_date, end_date, exclude_holiday=None):
+        return team_capacity.get_usage(self, start_date, end_date, exclude_holiday)
+
     @staticmethod
     def get_numbers_of_team_members_holiday_days_by_queryset(queryset):
         return (
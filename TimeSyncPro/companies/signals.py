@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from TimeSyncPro.absences.models import Holiday
+from TimeSyncPro.accounts.models import Profile
+from TimeSyncPro.common.cache import tenant_cache
+from TimeSyncPro.companies.capacity import team_capacity
+from TimeSyncPro.companies.models import Company, Team
+
+UserModel = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=Holiday)
+def invalidate_holiday_team_capacity(sender, instance, **kwargs):
+    try:
+        team_id = instance.requester.team_id
+    except Profile.DoesNotExist:
+        return
+
+    transaction.on_commit(lambda: team_capacity.invalidate_team(team_id))
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def invalidate_member_team_capacity(sender, instance, **kwargs):
+    snapshot = getattr(instance, "_history_snapshot", None) or {}
+    team_ids = {instance.team_id, snapshot.get("team")}
+
+    def invalidate():
+        for team_id in team_ids:
+            team_capacity.invalidate_team(team_id)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Team)
+def invalidate_team_capacity(sender, instance, **kwargs):
+    transaction.on_commit(lambda: team_capacity.invalidate_team(instance.pk))
+
+
+def invalidate_companies_on_commit(companies):
+    """Drop the tenant cache of ``companies``, a Company queryset, on commit."""
+    slugs = set(companies.values_list("slug", flat=True))
+
+    def invalidate():
+        for slug in slugs:
+            tenant_cache.invalidate(slug)
+
+    transaction.on_commit(invalidate)
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def invalidate_member_company_cache(sender, instance, **kwargs):
+    snapshot = getattr(instance, "_history_snapshot", None) or {}
+    company_ids = {instance.company_id, snapshot.get("company")} - {None}
+    if company_ids:
+        invalidate_companies_on_commit(Company.objects.filter(pk__in=company_ids))
+
+
+@receiver(m2m_changed, sender=UserModel.groups.through)
+@receiver(m2m_changed, sender=UserModel.user_permissions.through)
+def invalidate_user_permissions_company_cache(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if reverse:
+        # A group or permission changed its users; a cleared one no longer
+        # knows them, so every company is dropped.
+        users = {"employees__user__pk__in": pk_set} if pk_set else {}
+    else:
+        users = {"employees__user": instance}
+    invalidate_companies_on_commit(Company.objects.filter(**users).distinct())
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions_company_cache(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if reverse:
+        groups = {"employees__user__groups__pk__in": pk_set} if pk_set else {}
+    else:
+        groups = {"employees__user__groups": instance}
+    invalidate_companies_on_commit(Company.objects.filter(**groups).distinct())
@@ -19,9 +19,26 @@ from django.test import TestCase
 #     server.quit()
 
 
+from datetime import date, timedelta
+from types import SimpleNamespace
+
 from django.test import TestCase
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
 from django.core.mail import EmailMessage
 from django.core.mail.backends.smtp import EmailBackend
+from django.utils import timezone
+
+from TimeSyncPro.absences.forms import RequestHolidayForm
+from TimeSyncPro.absences.models import Holiday
+from TimeSyncPro.accounts.models import Profile
+from TimeSyncPro.common.models import Address
+from TimeSyncPro.common.test_utils import create_profile
+from TimeSyncPro.companies.capacity import sweep, team_capacity
+from TimeSyncPro.companies.forms.team_forms import EditTeamForm
+from TimeSyncPro.companies.models import Company, Team
+from TimeSyncPro.shifts.models import Shift
+from TimeSyncPro.shifts.working_calendar import working_calendar
 
 
 class EmailTests(TestCase):
@@ -45,3 +62,194 @@ class EmailTests(TestCase):
         )
 
         email.send()
+
+
+class TeamCapacityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(
+            name="Capacity Company",
+            annual_leave=20,
+            address=Address.objects.create(country="BG"),
+            working_on_local_holidays=True,
+        )
+        cls.team = Team.objects.create(
+            company=cls.company, name="Night Team", employees_holidays_at_a_time=2
+        )
+        cls.members = [
+            create_profile(
+                cls.company,
+                f"member{number}@example.com",
+                team=cls.team,
+                remaining_leave_days=20,
+                next_year_leave_days=20,
+            )
+            for number in range(4)
+        ]
+
+        today = timezone.now().date()
+        cls.monday = today + timedelta(days=35 - today.weekday())
+
+    def setUp(self):
+        cache.clear()
+        team_capacity.hits = team_capacity.misses = 0
+
+    def day(self, offset):
+        return self.monday + timedelta(days=offset)
+
+    def add_holiday(self, member, start, end, status=Holiday.StatusChoices.APPROVED):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Holiday.objects.create(
+                requester=member,
+                start_date=self.day(start),
+                end_date=self.day(end),
+                status=status,
+            )
+
+    def test_sweep_counts_concurrent_intervals_per_day(self):
+        first = date(2024, 6, 10)
+        counts = sweep(
+            [
+                (first - timedelta(days=3), first + timedelta(days=1)),
+                (first + timedelta(days=1), first + timedelta(days=2)),
+                (first + timedelta(days=2), first + timedelta(days=10)),
+            ],
+            first,
+            first + timedelta(days=4),
+        )
+
+        self.assertEqual(list(counts.values()), [1, 2, 2, 1, 1])
+        self.assertEqual(list(counts), [first + timedelta(days=i) for i in range(5)])
+
+    def test_usage_includes_partially_overlapping_holidays(self):
+        self.add_holiday(self.members[0], -3, 1)
+        self.add_holiday(self.members[1], 1, 2)
+        self.add_holiday(self.members[2], 2, 8, Holiday.StatusChoices.PENDING)
+
+        with self.assertNumQueries(1):
+            usage = self.team.get_capacity_usage(self.day(0), self.day(4))
+
+        self.assertEqual(len(usage.holidays), 3)
+        self.assertEqual((usage.peak_day, usage.peak_count), (self.day(1), 2))
+        self.assertEqual(usage.get_full_days(), [self.day(1)])
+        self.assertTrue(usage.exceeds_limit())
+
+    def test_usage_is_cached_until_a_team_holiday_changes(self):
+        self.add_holiday(self.members[0], 0, 1)
+        self.team.get_capacity_usage(self.day(0), self.day(4))
+
+        with self.assertNumQueries(0):
+            usage = self.team.get_capacity_usage(self.day(0), self.day(4))
+        self.assertEqual(usage.peak_count, 1)
+
+        self.add_holiday(self.members[1], 1, 1)
+        usage = self.team.get_capacity_usage(self.day(0), self.day(4))
+
+        self.assertEqual(usage.peak_count, 2)
+        self.assertEqual(team_capacity.get_stats()["hits"], 1)
+
+    def test_request_form_rejects_holidays_over_team_capacity(self):
+        self.add_holiday(self.members[0], 0, 4)
+        self.add_holiday(self.members[1], 3, 4)
+        requester = self.members[2]
+
+        form = RequestHolidayForm(
+            data={"start_date": self.day(2), "end_date": self.day(3)},
+            request=SimpleNamespace(user=requester.user),
+        )
+
+        self.assertFalse(form.is_valid())
+        self.assertIn(
+            f"Night Team already has 2 members on holiday on {self.day(3):%d %b %Y}, "
+            "the maximum is 2.",
+            form.errors["start_date"],
+        )
+
+        form = RequestHolidayForm(
+            data={"start_date": self.day(0), "end_date": self.day(2)},
+            request=SimpleNamespace(user=requester.user),
+        )
+
+        self.assertTrue(form.is_valid(), form.errors)
+
+
+class LazyMemberPickerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(
+            name="Picker Company",
+            annual_leave=20,
+            address=Address.objects.create(country="BG"),
+        )
+        cls.team = Team.objects.create(company=cls.company, name="Day Team")
+        cls.members = [
+            create_profile(
+                cls.company,
+                f"picker{number}@example.com",
+                team=cls.team if number < 2 else None,
+            )
+            for number in range(6)
+        ]
+
+    def get_form(self, data=None):
+        return EditTeamForm(
+            data=data, instance=self.team, company=self.company, team=self.team
+        )
+
+    def test_renders_only_selected_members(self):
+        html = str(self.get_form()["team_members"])
+
+        self.assertIn(f'value="{self.members[0].pk}" selected', html)
+        self.assertIn(f'value="{self.members[1].pk}" selected', html)
+        self.assertNotIn(f'value="{self.members[2].pk}"', html)
+        self.assertIn("data-autocomplete-url", html)
+
+    def test_submitted_ids_are_resolved_on_validation(self):
+        form = self.get_form(
+            {
+                "name": "Day Team",
+                "employees_holidays_at_a_time": 1,
+                "team_members": [self.members[0].pk, self.members[4].pk],
+            }
+        )
+
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(
+            set(form.cleaned_data["team_members"]), {self.members[0], self.members[4]}
+        )
+
+    def test_saving_members_drops_their_cached_shift(self):
+        shift = Shift.objects.create(company=self.company, name="Day Shift")
+        added = self.members[4]
+        self.assertIsNone(working_calendar.get_effective_shift_id(added))
+
+        form = self.get_form(
+            {
+                "name": "Day Team",
+                "shift": shift.pk,
+                "employees_holidays_at_a_time": 1,
+                "team_members": [self.members[0].pk, added.pk],
+            }
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        with self.captureOnCommitCallbacks(execute=True):
+            form.save()
+
+        self.assertEqual(
+            working_calendar.get_effective_shift_id(Profile.objects.get(pk=added.pk)),
+            shift.pk,
+        )
+
+    def test_holiday_approvers_are_cached_until_permissions_change(self):
+        approver = self.members[3]
+        self.assertEqual(self.company.get_company_holiday_approver_ids(), [])
+
+        with self.assertNumQueries(0):
+            self.company.get_company_holiday_approver_ids()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            approver.user.user_permissions.add(
+                Permission.objects.get(codename="approve_holiday_requests")
+            )
+
+        self.assertEqual(list(self.company.get_company_holiday_approvers()), [approver])
@@ -8,6 +8,7 @@ from ..accounts.views import (
     DeleteEmployeeView,
     TeamEmployeesAPIView,
     DepartmentEmployeesAPIView,
+    CompanyMembersAutocompleteAPIView,
 )
 from ..history.views import (
     TeamHistoryAPIView,
@@ -46,6 +47,11 @@ urlpatterns = [
                                 views.CompanyMembersView.as_view(),
                                 name="company_members",
                             ),
+                            path(
+                                "autocomplete/",
+                                CompanyMembersAutocompleteAPIView.as_view(),
+                                name="company_members_autocomplete",
+                            ),
                             path(
                                 "<slug:slug>/",
                                 DetailsEmployeesProfileView.as_view(),
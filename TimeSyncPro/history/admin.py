@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import History
+from .models import ArchivedHistory, History
 
 
 @admin.register(History)
@@ -17,3 +17,11 @@ class HistoryAdmin(admin.ModelAdmin):
 
     def has_module_permission(self, request):
         return request.user.is_superuser
+
+
+@admin.register(ArchivedHistory)
+class ArchivedHistoryAdmin(HistoryAdmin):
+    list_display = ["content_type", "action", "changed_by", "timestamp", "archived_at"]
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from TimeSyncPro.history import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming monthly history partitions and archive the records "
+        "older than the retention period"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=settings.HISTORY_PARTITION_MONTHS_AHEAD,
+            help="Number of future monthly partitions to keep ready",
+        )
+        parser.add_argument(
+            "--retention-months",
+            type=int,
+            default=settings.HISTORY_RETENTION_MONTHS,
+            help="Whole months of history to keep in the live table",
+        )
+        parser.add_argument(
+            "--export-dir",
+            default=settings.HISTORY_ARCHIVE_EXPORT_DIR,
+            help="Export expired records to NDJSON/gzip files here "
+            "instead of the archive table",
+        )
+        parser.add_argument(
+            "--allow-lossy-export",
+            action="store_true",
+            default=settings.HISTORY_ARCHIVE_EXPORT_LOSSY,
+            help="Allow exporting, which removes the exported records "
+            "from the history timeline",
+        )
+        parser.add_argument(
+            "--skip-retention",
+            action="store_true",
+            help="Only create partitions",
+        )
+
+    def handle(self, *args, **options):
+        if partitions.is_partitioned():
+            for name in partitions.ensure_partitions(options["months_ahead"]):
+                self.stdout.write(f"Created partition {name}")
+        else:
+            self.stdout.write("History table is not partitioned, skipping partitions")
+
+        if options["skip_retention"]:
+            return
+
+        try:
+            summary = partitions.apply_retention(
+                options["retention_months"],
+                export_dir=options["export_dir"],
+                allow_lossy_export=options["allow_lossy_export"],
+            )
+        except ImproperlyConfigured as error:
+            raise CommandError(error)
+        for label, archived in summary.items():
+            self.stdout.write(f"{label}: archived {archived} records")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {sum(summary.values())} history records "
+                f"older than {options['retention_months']} months"
+            )
+        )
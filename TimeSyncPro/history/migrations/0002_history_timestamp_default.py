@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("history", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="history",
+            name="timestamp",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
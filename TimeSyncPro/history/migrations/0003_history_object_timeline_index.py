@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("history", "0002_history_timestamp_default"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="history",
+            name="history_his_content_774c23_idx",
+        ),
+        migrations.AddIndex(
+            model_name="history",
+            index=models.Index(
+                fields=["content_type", "object_id", "-timestamp", "-id"],
+                name="history_object_timeline_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,275 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:59
+
+from datetime import date
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+HISTORY_TABLE = "history_history"
+UNPARTITIONED_TABLE = "history_history_unpartitioned"
+HISTORY_SEQUENCE = "history_history_id_seq"
+ARCHIVE_TABLE = "history_archivedhistory"
+PARTITION_MONTHS_AHEAD = 3
+
+TIMELINE_COLUMNS = (
+    "id, object_id, timestamp, action, changes, changed_by_id, content_type_id"
+)
+
+
+def add_months(day, months):
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_history_table(apps, schema_editor):
+    """
+    Rebuild the history table as monthly range partitions on ``timestamp``.
+
+    Existing rows are copied into one partition per month, with a default
+    partition for anything outside them. Indexes and foreign keys are recreated
+    under their original names, and the primary key becomes (id, timestamp) as
+    Postgres requires the partition key in every unique constraint.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass",
+            [HISTORY_TABLE],
+        )
+        if cursor.fetchone():
+            return
+
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s",
+            [HISTORY_TABLE, f"{HISTORY_TABLE}_pkey"],
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [HISTORY_TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            f"SELECT min(timestamp), max(timestamp), max(id) FROM {HISTORY_TABLE}"
+        )
+        first, last, max_id = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE {HISTORY_TABLE} RENAME TO {UNPARTITIONED_TABLE}")
+        cursor.execute(
+            f"CREATE TABLE {HISTORY_TABLE} ("
+            f"LIKE {UNPARTITIONED_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS, "
+            f"CONSTRAINT {HISTORY_TABLE}_partitioned_pkey PRIMARY KEY (id, timestamp)"
+            f") PARTITION BY RANGE (timestamp)"
+        )
+        cursor.execute(
+            f"CREATE TABLE {HISTORY_TABLE}_default PARTITION OF {HISTORY_TABLE} DEFAULT"
+        )
+
+        current_month = add_months(date.today(), 0)
+        month = add_months(first.date(), 0) if first else current_month
+        last_month = add_months(current_month, PARTITION_MONTHS_AHEAD)
+        if last:
+            last_month = max(last_month, add_months(last.date(), 0))
+
+        while month <= last_month:
+            end = add_months(month, 1)
+            cursor.execute(
+                f"CREATE TABLE {HISTORY_TABLE}_p{month:%Y_%m} "
+                f"PARTITION OF {HISTORY_TABLE} "
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+                f"TO ('{end.isoformat()} 00:00:00+00')"
+            )
+            month = end
+
+        cursor.execute(
+            f"INSERT INTO {HISTORY_TABLE} SELECT * FROM {UNPARTITIONED_TABLE}"
+        )
+        cursor.execute(f"DROP TABLE {UNPARTITIONED_TABLE}")
+        cursor.execute(
+            f"ALTER TABLE {HISTORY_TABLE} RENAME CONSTRAINT "
+            f"{HISTORY_TABLE}_partitioned_pkey TO {HISTORY_TABLE}_pkey"
+        )
+
+        cursor.execute(
+            f"CREATE SEQUENCE {HISTORY_SEQUENCE} OWNED BY {HISTORY_TABLE}.id"
+        )
+        cursor.execute(
+            f"ALTER TABLE {HISTORY_TABLE} "
+            f"ALTER COLUMN id SET DEFAULT nextval('{HISTORY_SEQUENCE}')"
+        )
+        if max_id:
+            cursor.execute("SELECT setval(%s, %s)", [HISTORY_SEQUENCE, max_id])
+
+        for definition in index_definitions:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(
+                f"ALTER TABLE {HISTORY_TABLE} ADD CONSTRAINT {name} {definition}"
+            )
+
+        # Compress archived rows out of line as soon as they exceed 128 bytes.
+        cursor.execute(f"ALTER TABLE {ARCHIVE_TABLE} SET (toast_tuple_target = 128)")
+
+
+def create_timeline_view(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        f"CREATE VIEW history_timeline AS "
+        f"SELECT {TIMELINE_COLUMNS}, false AS is_archived FROM {HISTORY_TABLE} "
+        f"UNION ALL "
+        f"SELECT {TIMELINE_COLUMNS}, true AS is_archived FROM {ARCHIVE_TABLE}"
+    )
+
+
+def drop_timeline_view(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("DROP VIEW history_timeline")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("history", "0003_history_object_timeline_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedHistory",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                (
+                    "timestamp",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("create", "Created"),
+                            ("update", "Updated"),
+                            ("delete", "Deleted"),
+                            ("register", "Registered"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "changes",
+                    models.JSONField(
+                        help_text="{'field': {'old': old_value, 'new': new_value}}",
+                        null=True,
+                    ),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                (
+                    "changed_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_history_changes",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived History Record",
+                "verbose_name_plural": "Archived History Records",
+                "ordering": ["-timestamp"],
+                "abstract": False,
+                "indexes": [
+                    models.Index(
+                        fields=["content_type", "object_id", "-timestamp", "-id"],
+                        name="archived_history_timeline_idx",
+                    ),
+                    models.Index(
+                        fields=["timestamp"], name="history_arc_timesta_7ed541_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(partition_history_table, migrations.RunPython.noop),
+        migrations.RunPython(create_timeline_view, drop_timeline_view),
+        migrations.CreateModel(
+            name="HistoryTimeline",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                (
+                    "timestamp",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("create", "Created"),
+                            ("update", "Updated"),
+                            ("delete", "Deleted"),
+                            ("register", "Registered"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "changes",
+                    models.JSONField(
+                        help_text="{'field': {'old': old_value, 'new': new_value}}",
+                        null=True,
+                    ),
+                ),
+                ("is_archived", models.BooleanField()),
+            ],
+            options={
+                "db_table": "history_timeline",
+                "ordering": ["-timestamp"],
+                "abstract": False,
+                "managed": False,
+            },
+        ),
+    ]
@@ -1,9 +1,8 @@
 import logging
 from django.conf import settings
-from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from typing import Dict, Any, List, Optional
-from TimeSyncPro.history.models import History
+from TimeSyncPro.history.writer import history_writer
 from TimeSyncPro.middleware.utils import get_current_user
 
 
@@ -50,17 +49,50 @@ class HistoryMixin(models.Model):
             logger.warning(f"Error formatting value for field {field.name}: {str(e)}")
             return str(value) if value is not None else None
 
-    def _get_state(self) -> Dict[str, Any]:
-        state = {}
+    def _get_saved_tracked_fields(self, update_fields=None) -> List[str]:
+        """Return the tracked fields written by a save with ``update_fields``."""
         tracked_fields = self._get_tracked_fields()
+        if update_fields is None:
+            return list(tracked_fields)
 
+        update_fields = set(update_fields)
+        saved_fields = []
         for field_name in tracked_fields:
             try:
-                if not hasattr(self, field_name):
-                    continue
+                attname = self._meta.get_field(field_name).attname
+            except Exception:
+                continue
+            if field_name in update_fields or attname in update_fields:
+                saved_fields.append(field_name)
+        return saved_fields
+
+    def _get_state(self, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Snapshot the tracked fields from the instance itself. Foreign keys are
+        read through their ``attname``; deferred fields and pending ``F()``
+        expressions are skipped, so taking a snapshot never hits the database.
+        """
+        state = {}
+        tracked_fields = self._get_tracked_fields() if fields is None else fields
 
+        for field_name in tracked_fields:
+            try:
                 field = self._meta.get_field(field_name)
+            except Exception:
+                continue
+
+            try:
+                if field.concrete and field.attname not in self.__dict__:
+                    continue
+
+                if isinstance(field, models.ForeignKey):
+                    state[field_name] = getattr(self, field.attname)
+                    continue
+
                 value = getattr(self, field_name)
+                if hasattr(value, "resolve_expression"):
+                    continue
+
                 state[field_name] = self._format_field_value(field, value)
 
             except Exception as e:
@@ -71,33 +103,45 @@ class HistoryMixin(models.Model):
 
         return state
 
-    def _get_original_state(self) -> Dict[str, Any]:
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._history_snapshot = instance._get_state()
+        return instance
+
+    def _get_original_state(self, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Return the saved state of the tracked fields: the snapshot taken when
+        the instance was loaded, or a query for instances built in memory.
+        """
         if not self.pk:
             return {}
 
+        snapshot = getattr(self, "_history_snapshot", None)
+        if snapshot is not None:
+            return snapshot
+
+        fields = self._get_tracked_fields() if fields is None else fields
         try:
-            # Build optimized query
-            query = self.__class__.objects
-            select_related_fields = []
+            concrete_fields = []
             prefetch_related_fields = []
 
-            for field_name in self._get_tracked_fields():
+            for field_name in fields:
                 try:
                     field = self._meta.get_field(field_name)
-                    if isinstance(field, models.ForeignKey):
-                        select_related_fields.append(field_name)
-                    elif isinstance(field, models.ManyToManyField):
-                        prefetch_related_fields.append(field_name)
                 except Exception:
                     continue
+                if isinstance(field, models.ManyToManyField):
+                    prefetch_related_fields.append(field_name)
+                elif field.concrete:
+                    concrete_fields.append(field_name)
 
-            if select_related_fields:
-                query = query.select_related(*select_related_fields)
+            query = self.__class__.objects.only(*concrete_fields)
             if prefetch_related_fields:
                 query = query.prefetch_related(*prefetch_related_fields)
 
             original = query.filter(pk=self.pk).first()
-            return original._get_state() if original else {}
+            return original._get_state(fields) if original else {}
 
         except Exception as e:
             logger.error(f"Error getting original state: {str(e)}")
@@ -114,17 +158,7 @@ class HistoryMixin(models.Model):
                     self if isinstance(self, settings.AUTH_USER_MODEL) else None
                 )
 
-            if not self.pk:
-                logger.warning("Cannot create history for unsaved instance")
-                return
-
-            History.objects.create(
-                content_type=ContentType.objects.get_for_model(self),
-                object_id=self.pk,
-                action=action,
-                changed_by=history_user,
-                changes=changes,
-            )
+            history_writer.record(self, action, changes, changed_by=history_user)
 
         except Exception as e:
             logger.error(
@@ -134,15 +168,25 @@ class HistoryMixin(models.Model):
     def save(self, *args, **kwargs) -> None:
         is_new = not self.pk
         skip_history = kwargs.pop("skip_history", False)
-        original_state = {} if is_new else self._get_original_state()
+        fields = self._get_saved_tracked_fields(
+            None if is_new else kwargs.get("update_fields")
+        )
+        has_snapshot = getattr(self, "_history_snapshot", None) is not None
+        original_state = {}
+        if not is_new and fields and not skip_history:
+            original_state = self._get_original_state(fields)
 
         try:
             super().save(*args, **kwargs)
 
             if skip_history:
+                self._history_snapshot = None
+                return
+
+            if not fields:
                 return
 
-            current_state = self._get_state()
+            current_state = self._get_state(fields)
 
             if is_new:
                 changes = {
@@ -159,6 +203,15 @@ class HistoryMixin(models.Model):
                 if changes:
                     self._create_history("update", changes)
 
+            if is_new or has_snapshot:
+                snapshot = {
+                    field: value
+                    for field, value in original_state.items()
+                    if field not in fields
+                }
+                snapshot.update(current_state)
+                self._history_snapshot = snapshot
+
         except Exception as e:
             logger.error(f"Error in save history tracking: {str(e)}", exc_info=True)
             if not is_new:  # Only retry save if it's an update
@@ -1,11 +1,19 @@
+from collections import defaultdict
+
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.db import models
+from django.db.models import Q
 from django.contrib.contenttypes.models import ContentType
-from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+
+from TimeSyncPro.common.cache import tenant_cache
+
 
+class HistoryRecord(models.Model):
+    """Fields and rendering shared by live, archived and merged history rows."""
 
-class History(models.Model):
     ACTIONS = [
         ("create", "Created"),
         ("update", "Updated"),
@@ -13,16 +21,11 @@ class History(models.Model):
         ("register", "Registered"),
     ]
 
-    content_type = models.ForeignKey(
-        ContentType,
-        on_delete=models.CASCADE,
-    )
-
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey("content_type", "object_id")
 
     timestamp = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
         editable=False,
     )
 
@@ -31,27 +34,13 @@ class History(models.Model):
         choices=ACTIONS,
     )
 
-    changed_by = models.ForeignKey(
-        settings.AUTH_USER_MODEL,
-        null=True,
-        blank=True,
-        on_delete=models.SET_NULL,
-        related_name="history_changes",
-    )
-
     changes = models.JSONField(
         null=True, help_text="{'field': {'old': old_value, 'new': new_value}}"
     )
 
     class Meta:
+        abstract = True
         ordering = ["-timestamp"]
-        indexes = [
-            models.Index(fields=["content_type", "object_id"]),  # Combined index
-            models.Index(fields=["timestamp"]),
-            models.Index(fields=["action"]),
-        ]
-        verbose_name = "History Record"
-        verbose_name_plural = "History Records"
 
     def __str__(self):
         model_name = self.content_type.model
@@ -60,57 +49,74 @@ class History(models.Model):
 
     @classmethod
     def get_content_type(cls, model_class):
-        cache_key = f"content_type_{model_class._meta.model_name}"
-        content_type = cache.get(cache_key)
+        return tenant_cache.get_or_set(
+            None,
+            f"content_type:{model_class._meta.label_lower}",
+            lambda: ContentType.objects.get_for_model(model_class),
+            timeout=3600,
+        )
 
-        if content_type is None:
-            content_type = ContentType.objects.get_for_model(model_class)
-            cache.set(cache_key, content_type, 3600)  # Cache for 1 hour
+    def _get_changed_field(self, field_name):
+        model_class = ContentType.objects.get_for_id(self.content_type_id).model_class()
+        try:
+            return model_class._meta.get_field(field_name)
+        except (AttributeError, FieldDoesNotExist):
+            return None
 
-        return content_type
+    @staticmethod
+    def _format_value(value, field, related_objects):
+        if value == "None" or value is None:
+            return ""
 
-    @property
-    def change_summary(self):
-        if not self.changes:
-            return "No changes recorded"
+        # Handle foreign keys
+        if isinstance(field, models.ForeignKey):
+            obj = related_objects.get(field.related_model, {}).get(value)
+            return str(obj) if obj is not None else value
 
-        def format_value(value, field_name):
-            if value == "None" or value is None:
-                return ""
+        # Handle boolean fields
+        elif isinstance(field, models.BooleanField):
+            return "Yes" if value else "No"
 
-            # Get the field from model
-            try:
-                current_filed = self.content_type.model_class()._meta.get_field(
-                    field_name
-                )
+        # Handle choice fields
+        elif field is not None and field.choices:
+            return dict(field.choices).get(value, value)
 
-                # Handle foreign keys
-                if isinstance(current_filed, models.ForeignKey):
-                    related_model = current_filed.related_model
-                    try:
-                        obj = related_model.objects.get(pk=value)
-                        return str(obj)
-                    except:
-                        return value
+        return str(value)
 
-                # Handle boolean fields
-                elif isinstance(current_filed, models.BooleanField):
-                    return "Yes" if value else "No"
+    @classmethod
+    def summarize_changes(cls, records):
+        """
+        Render ``change_summary`` for a batch of records.
+
+        Foreign key ids referenced across all records are resolved with one
+        ``in_bulk`` per related model, instead of one query per value.
+        """
+        related_ids = defaultdict(set)
+        for record in records:
+            for field_name, change in (record.changes or {}).items():
+                field = record._get_changed_field(field_name)
+                if not isinstance(field, models.ForeignKey):
+                    continue
+                for value in (change.get("old"), change.get("new")):
+                    if isinstance(value, int):
+                        related_ids[field.related_model].add(value)
 
-                # Handle choice fields
-                elif hasattr(current_filed, "choices") and current_filed.choices:
-                    choices_dict = dict(current_filed.choices)
-                    return choices_dict.get(value, value)
+        related_objects = {
+            model: model.objects.in_bulk(ids) for model, ids in related_ids.items()
+        }
 
-            except:
-                pass
+        for record in records:
+            record._change_summary = record._render_summary(related_objects)
 
-            return str(value)
+    def _render_summary(self, related_objects):
+        if not self.changes:
+            return "No changes recorded"
 
         summaries = []
         for field, change in self.changes.items():
-            old = format_value(change.get("old"), field)
-            new = format_value(change.get("new"), field)
+            changed_field = self._get_changed_field(field)
+            old = self._format_value(change.get("old"), changed_field, related_objects)
+            new = self._format_value(change.get("new"), changed_field, related_objects)
             field = field.replace("_", " ").title()
             separator = " → "
 
@@ -121,16 +127,30 @@ class History(models.Model):
 
         return ", ".join(summaries)
 
+    @property
+    def change_summary(self):
+        if not hasattr(self, "_change_summary"):
+            self.summarize_changes([self])
+        return self._change_summary
+
     @classmethod
     def get_for_object(cls, obj):
         """Get all history for a specific object"""
-        content_type = cls.get_content_type(obj.__class__)  # Use cached content_type
-        return (
-            cls.objects.filter(
-                content_type=content_type, object_id=obj.id  # Use cached version
+        return cls.get_for_objects(obj)
+
+    @classmethod
+    def get_for_objects(cls, *objects):
+        """Get the merged history of several objects as a single query"""
+        condition = Q()
+        for obj in objects:
+            condition |= Q(
+                content_type=cls.get_content_type(obj.__class__),  # Use cached version
+                object_id=obj.pk,
             )
+        return (
+            cls.objects.filter(condition)
             .select_related("changed_by", "content_type")
-            .order_by("-timestamp")
+            .order_by("-timestamp", "-id")
         )
 
     @classmethod
@@ -146,3 +166,92 @@ class History(models.Model):
         return cls.objects.filter(changed_by=user).select_related(
             "content_type", "changed_by"
         )
+
+
+class History(HistoryRecord):
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+    )
+
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="history_changes",
+    )
+
+    class Meta(HistoryRecord.Meta):
+        indexes = [
+            models.Index(
+                fields=["content_type", "object_id", "-timestamp", "-id"],
+                name="history_object_timeline_idx",
+            ),
+            models.Index(fields=["timestamp"]),
+            models.Index(fields=["action"]),
+        ]
+        verbose_name = "History Record"
+        verbose_name_plural = "History Records"
+
+
+class ArchivedHistory(HistoryRecord):
+    """History rows moved out of the live table by the retention job."""
+
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="archived_history_changes",
+    )
+
+    archived_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+    )
+
+    class Meta(HistoryRecord.Meta):
+        indexes = [
+            models.Index(
+                fields=["content_type", "object_id", "-timestamp", "-id"],
+                name="archived_history_timeline_idx",
+            ),
+            models.Index(fields=["timestamp"]),
+        ]
+        verbose_name = "Archived History Record"
+        verbose_name_plural = "Archived History Records"
+
+
+class HistoryTimeline(HistoryRecord):
+    """
+    Read-only view over live and archived history, so the history APIs keep
+    serving records after the retention job has moved them out.
+    """
+
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+
+    is_archived = models.BooleanField()
+
+    class Meta(HistoryRecord.Meta):
+        managed = False
+        db_table = "history_timeline"
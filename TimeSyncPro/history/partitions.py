@@ -0,0 +1,316 @@
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+
+from TimeSyncPro.history.models import ArchivedHistory, History
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = History._meta.db_table
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_NAME_RE = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})_(\d{{2}})$")
+ARCHIVE_BATCH_SIZE = 5000
+
+HISTORY_COLUMNS = (
+    "id",
+    "object_id",
+    "timestamp",
+    "action",
+    "changes",
+    "changed_by_id",
+    "content_type_id",
+)
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(day, months):
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{PARENT_TABLE}_p{month:%Y_%m}"
+
+
+def as_datetime(day):
+    return datetime(day.year, day.month, day.day, tzinfo=dt_timezone.utc)
+
+
+def _bound(day):
+    return f"'{as_datetime(day).isoformat()}'"
+
+
+def is_partitioned():
+    if connection.vendor != "postgresql":
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT 1 FROM pg_partitioned_table pt
+            JOIN pg_class c ON c.oid = pt.partrelid
+            WHERE c.relname = %s
+            """,
+            [PARENT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def get_partitions():
+    """Return ``{month: table name}`` for the monthly partitions of the history table."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [PARENT_TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME_RE.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return dict(sorted(partitions.items()))
+
+
+def create_partition(month):
+    """
+    Create the partition of ``month``, moving any of its rows out of the
+    default partition first so the partition can be attached.
+    """
+    name = partition_name(month)
+    start, end = _bound(month), _bound(add_months(month, 1))
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {name} "
+            f"(LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE timestamp >= {start} AND timestamp < {end}
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+            """
+        )
+        cursor.execute(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ({start}) TO ({end})"
+        )
+
+    logger.info(f"Created history partition {name}")
+    return name
+
+
+def ensure_partitions(months_ahead, today=None):
+    """Create the partitions of the current month and ``months_ahead`` after it."""
+    current_month = month_start(today or date.today())
+    existing = get_partitions()
+
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current_month, offset)
+        if month not in existing:
+            created.append(create_partition(month))
+    return created
+
+
+def get_retention_cutoff(retention_months, today=None):
+    return add_months(month_start(today or date.today()), -retention_months)
+
+
+def _serialize(record):
+    return json.dumps(
+        {
+            column: (
+                record[column].isoformat()
+                if isinstance(record[column], datetime)
+                else record[column]
+            )
+            for column in HISTORY_COLUMNS
+        }
+    )
+
+
+def stream_history(queryset, batch_size=ARCHIVE_BATCH_SIZE):
+    """Yield batches of history rows as dicts, paging by id (keyset)."""
+    last_id = 0
+    while True:
+        batch = list(
+            queryset.filter(id__gt=last_id)
+            .order_by("id")
+            .values(*HISTORY_COLUMNS)[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]["id"]
+
+
+def export_batches(batches, export_path, mode="wt"):
+    """Write the batches to an NDJSON/gzip file, yielding each one once written."""
+    with gzip.open(export_path, mode) as export_file:
+        for batch in batches:
+            export_file.writelines(_serialize(record) + "\n" for record in batch)
+            export_file.flush()
+            yield batch
+
+
+def export_queryset(queryset, export_path, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Write the rows of ``queryset`` to an NDJSON/gzip file, then delete them.
+
+    The rows go to a temporary file together with the rows of an earlier export
+    at ``export_path``; the deletes run in one transaction that replaces the
+    file just before committing. A run that dies part way leaves the live rows
+    and the previous file in place, so re-running neither loses nor duplicates
+    records.
+    """
+    partial_path = f"{export_path}.partial"
+    exported_ids = set()
+    with gzip.open(partial_path, "wt") as export_file:
+        for batch in stream_history(queryset, batch_size):
+            export_file.writelines(_serialize(record) + "\n" for record in batch)
+            exported_ids.update(record["id"] for record in batch)
+
+        if os.path.exists(export_path):
+            with gzip.open(export_path, "rt") as previous_file:
+                export_file.writelines(
+                    line
+                    for line in previous_file
+                    if json.loads(line)["id"] not in exported_ids
+                )
+
+    ids = sorted(exported_ids)
+    with transaction.atomic():
+        for start in range(0, len(ids), batch_size):
+            History.objects.filter(id__in=ids[start : start + batch_size]).delete()
+        os.replace(partial_path, export_path)
+
+    return len(ids)
+
+
+def archive_queryset(queryset, export_path=None, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move the rows of ``queryset`` out of the live table, batch by batch, into
+    ``ArchivedHistory`` or an NDJSON/gzip file when ``export_path`` is given.
+    """
+    if not queryset.exists():
+        return 0
+
+    if export_path:
+        return export_queryset(queryset, export_path, batch_size)
+
+    archived = 0
+    for batch in stream_history(queryset, batch_size):
+        with transaction.atomic():
+            ArchivedHistory.objects.bulk_create(
+                ArchivedHistory(**record) for record in batch
+            )
+            History.objects.filter(id__in=[record["id"] for record in batch]).delete()
+        archived += len(batch)
+
+    return archived
+
+
+def archive_partition(month, name, export_path=None):
+    """
+    Copy a whole partition to the archive, then detach and drop it.
+
+    In export mode the partition is written to a temporary file that replaces
+    ``export_path`` before the partition is dropped, so a run that dies in
+    between rewrites the same file instead of appending duplicates to it.
+    """
+    columns = ", ".join(HISTORY_COLUMNS)
+
+    if export_path:
+        queryset = History.objects.filter(
+            timestamp__gte=as_datetime(month),
+            timestamp__lt=as_datetime(add_months(month, 1)),
+        )
+        partial_path = f"{export_path}.partial"
+        exported = sum(
+            len(batch)
+            for batch in export_batches(stream_history(queryset), partial_path)
+        )
+        os.replace(partial_path, export_path)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if export_path:
+            archived = exported
+        else:
+            cursor.execute(
+                f"INSERT INTO {ArchivedHistory._meta.db_table} ({columns}, archived_at) "
+                f"SELECT {columns}, now() FROM {name}"
+            )
+            archived = cursor.rowcount
+        cursor.execute(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}")
+        cursor.execute(f"DROP TABLE {name}")
+
+    logger.info(f"Archived {archived} history records from {name}")
+    return archived
+
+
+def get_export_path(export_dir, label):
+    os.makedirs(export_dir, exist_ok=True)
+    return os.path.join(export_dir, f"history-{label}.ndjson.gz")
+
+
+def apply_retention(
+    retention_months, export_dir=None, today=None, allow_lossy_export=False
+):
+    """
+    Archive every history record older than ``retention_months`` whole months.
+
+    Expired monthly partitions are archived and dropped in one go; rows left in
+    the default partition, or in an unpartitioned table, are moved in batches.
+    Returns ``{label: archived record count}``.
+
+    With ``export_dir`` the rows are written to NDJSON/gzip files instead of
+    ``ArchivedHistory``. This is destructive: exported rows are deleted from
+    the database and no longer appear in ``HistoryTimeline``, so it has to be
+    enabled with ``allow_lossy_export``.
+    """
+    if export_dir and not allow_lossy_export:
+        raise ImproperlyConfigured(
+            "Exporting history removes it from the history timeline; "
+            "set HISTORY_ARCHIVE_EXPORT_LOSSY to export to files"
+        )
+
+    cutoff = get_retention_cutoff(retention_months, today)
+    summary = {}
+
+    if is_partitioned():
+        for month, name in get_partitions().items():
+            if add_months(month, 1) > cutoff:
+                continue
+            label = f"{month:%Y-%m}"
+            export_path = get_export_path(export_dir, label) if export_dir else None
+            summary[label] = archive_partition(month, name, export_path)
+
+    label = f"before-{cutoff:%Y-%m}"
+    export_path = get_export_path(export_dir, label) if export_dir else None
+    remaining = archive_queryset(
+        History.objects.filter(timestamp__lt=as_datetime(cutoff)), export_path
+    )
+    if remaining:
+        summary[label] = remaining
+
+    return summary
@@ -3,6 +3,13 @@ from rest_framework import serializers
 from TimeSyncPro.history.models import History
 
 
+class HistoryListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        records = list(data.all() if hasattr(data, "all") else data)
+        History.summarize_changes(records)
+        return super().to_representation(records)
+
+
 class HistorySerializer(serializers.ModelSerializer):
     changed_by = serializers.StringRelatedField()
     change_summary = serializers.CharField(read_only=True)
@@ -10,3 +17,4 @@ class HistorySerializer(serializers.ModelSerializer):
     class Meta:
         model = History
         fields = ["timestamp", "action", "changed_by", "changes", "change_summary"]
+        list_serializer_class = HistoryListSerializer
@@ -0,0 +1,32 @@
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="TimeSyncPro.history.tasks.write_history_records")
+def write_history_records(records):
+    from TimeSyncPro.history.writer import history_writer
+
+    logger.info(f"Writing {len(records)} history records")
+    return len(history_writer.write(records))
+
+
+@shared_task(name="TimeSyncPro.history.tasks.maintain_history_partitions")
+def maintain_history_partitions():
+    from django.conf import settings
+
+    from TimeSyncPro.history import partitions
+
+    logger.info("Starting history partition maintenance")
+    created = []
+    if partitions.is_partitioned():
+        created = partitions.ensure_partitions(settings.HISTORY_PARTITION_MONTHS_AHEAD)
+
+    summary = partitions.apply_retention(
+        settings.HISTORY_RETENTION_MONTHS,
+        export_dir=settings.HISTORY_ARCHIVE_EXPORT_DIR,
+        allow_lossy_export=settings.HISTORY_ARCHIVE_EXPORT_LOSSY,
+    )
+    return {"created": created, "archived": summary}
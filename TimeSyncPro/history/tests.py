@@ -1,3 +1,503 @@
-from django.test import TestCase
+import gzip
+import json
+import tempfile
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from TimeSyncPro.common.models import Address
+from TimeSyncPro.companies.models import Company, Department, Team
+from TimeSyncPro.history import partitions
+from TimeSyncPro.history.models import ArchivedHistory, History, HistoryTimeline
+from TimeSyncPro.history.serializers import HistorySerializer
+from TimeSyncPro.history.views import EmployeeHistoryAPIView
+from TimeSyncPro.history.writer import history_writer
+from TimeSyncPro.shifts.models import Shift
+
+UserModel = get_user_model()
+
+
+class HistoryWriterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.company = Company.objects.create(
+                name="History Company",
+                annual_leave=20,
+                address=Address.objects.create(country="BG"),
+                working_on_local_holidays=False,
+            )
+            cls.department = Department.objects.create(
+                company=cls.company, name="Support"
+            )
+
+    def get_department_history(self):
+        return History.objects.filter(
+            content_type=History.get_content_type(Department),
+            object_id=self.department.pk,
+        )
+
+    def test_create_is_recorded_on_commit(self):
+        history = self.get_department_history()
+
+        self.assertEqual(history.count(), 1)
+        self.assertEqual(history.get().action, "create")
+        self.assertEqual(history.get().changes["name"], {"old": None, "new": "Support"})
+
+    def test_update_diffs_against_loaded_snapshot(self):
+        department = Department.objects.get(pk=self.department.pk)
+        department.name = "Operations"
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertNumQueries(1):
+                department.save()
+
+        self.assertEqual(len(callbacks), 1)
+        record = self.get_department_history().get(action="update")
+        self.assertEqual(
+            record.changes, {"name": {"old": "Support", "new": "Operations"}}
+        )
+
+    def test_saves_in_one_transaction_are_written_in_one_batch(self):
+        department = Department.objects.get(pk=self.department.pk)
+        batches_before = history_writer.get_stats()["batches_written"]
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            for name in ("Operations", "Finance", "Sales"):
+                department.name = name
+                department.save()
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(
+            history_writer.get_stats()["batches_written"], batches_before + 1
+        )
+        self.assertEqual(
+            [
+                record.changes["name"]["new"]
+                for record in self.get_department_history()
+                .filter(action="update")
+                .order_by("id")
+            ],
+            ["Operations", "Finance", "Sales"],
+        )
+
+    def test_rolled_back_changes_are_not_written(self):
+        department = Department.objects.get(pk=self.department.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    department.name = "Rolled Back"
+                    department.save()
+                    raise ValueError
+            except ValueError:
+                pass
+
+            department.refresh_from_db()
+            department.name = "Committed"
+            department.save()
+
+        self.assertEqual(
+            [
+                record.changes["name"]["new"]
+                for record in self.get_department_history().filter(action="update")
+            ],
+            ["Committed"],
+        )
+
+    def test_savepoint_rollback_drops_its_records_only(self):
+        department = Department.objects.get(pk=self.department.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            department.name = "Before"
+            department.save()
+
+            try:
+                with transaction.atomic():
+                    department.name = "Rolled Back"
+                    department.save()
+                    raise ValueError
+            except ValueError:
+                pass
+
+            department.refresh_from_db()
+            department.name = "Committed"
+            department.save()
+
+        self.assertEqual(
+            [
+                record.changes["name"]["new"]
+                for record in self.get_department_history()
+                .filter(action="update")
+                .order_by("id")
+            ],
+            ["Before", "Committed"],
+        )
+
+    @override_settings(HISTORY_ASYNC_WRITES=True)
+    def test_async_writes_are_queued(self):
+        department = Department.objects.get(pk=self.department.pk)
+        department.name = "Queued"
+
+        with mock.patch(
+            "TimeSyncPro.history.tasks.write_history_records.delay"
+        ) as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                department.save()
+
+        delay.assert_called_once()
+        (records,) = delay.call_args.args
+        self.assertEqual(records[0]["object_id"], department.pk)
+        self.assertFalse(self.get_department_history().filter(action="update"))
+
+
+class HistorySnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.company = Company.objects.create(
+                name="Snapshot Company",
+                annual_leave=20,
+                address=Address.objects.create(country="BG"),
+                working_on_local_holidays=False,
+            )
+            cls.department = Department.objects.create(
+                company=cls.company, name="Support"
+            )
+            cls.team = Team.objects.create(
+                company=cls.company, name="Night Team", employees_holidays_at_a_time=5
+            )
+
+    def get_updates(self, obj):
+        return History.objects.filter(
+            content_type=History.get_content_type(obj.__class__),
+            object_id=obj.pk,
+            action="update",
+        )
+
+    def test_f_expression_update_is_not_reloaded_or_recorded(self):
+        team = Team.objects.get(pk=self.team.pk)
+        team.employees_holidays_at_a_time = F("employees_holidays_at_a_time") - 1
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                team.save(update_fields=["employees_holidays_at_a_time"])
+
+        self.assertFalse(
+            any(
+                query["sql"].startswith('SELECT "companies_team"')
+                for query in queries.captured_queries
+            )
+        )
+        self.assertFalse(self.get_updates(team).exists())
+        self.assertNotIn("employees_holidays_at_a_time", team._history_snapshot)
+
+        team.refresh_from_db()
+        self.assertEqual(team.employees_holidays_at_a_time, 4)
+
+    def test_only_update_fields_are_diffed(self):
+        department = Department.objects.get(pk=self.department.pk)
+        department.name = "Unsaved Name"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            department.save(update_fields=["holiday_approver"])
+
+        self.assertFalse(self.get_updates(department).exists())
+        self.assertEqual(department._history_snapshot["name"], "Support")
+
+    def test_untracked_update_fields_skip_history(self):
+        department = Department.objects.get(pk=self.department.pk)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertNumQueries(1):
+                department.save(update_fields=["company"])
+
+        self.assertEqual(callbacks, [])
+
+    def test_instance_not_loaded_from_db_falls_back_to_query(self):
+        department = Department(
+            pk=self.department.pk, company=self.company, name="Operations"
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(2):
+                department.save()
+
+        self.assertEqual(
+            self.get_updates(department).get().changes,
+            {"name": {"old": "Support", "new": "Operations"}},
+        )
+
+
+class ChangeSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.company = Company.objects.create(
+                name="Summary Company",
+                annual_leave=20,
+                address=Address.objects.create(country="BG"),
+                working_on_local_holidays=False,
+            )
+            cls.team = Team.objects.create(company=cls.company, name="Day Team")
+
+        cls.shifts = [
+            Shift(company=cls.company, name=name, start_date="2024-01-01")
+            for name in ("Early", "Late", "Night")
+        ]
+        Shift.objects.bulk_create(cls.shifts)
+
+        content_type = History.get_content_type(Team)
+        History.objects.bulk_create(
+            History(
+                content_type=content_type,
+                object_id=cls.team.pk,
+                action="update",
+                changes={"shift": {"old": old.pk, "new": new.pk}},
+            )
+            for old, new in zip(cls.shifts, cls.shifts[1:])
+        )
+
+    def test_page_resolves_related_objects_in_one_query(self):
+        records = History.objects.filter(action="update", object_id=self.team.pk)
+        ContentType.objects.get_for_model(Team)
+
+        with self.assertNumQueries(2):
+            data = HistorySerializer(records, many=True).data
+
+        self.assertCountEqual(
+            [row["change_summary"] for row in data],
+            [
+                "Shift: Early  →  Late",
+                "Shift: Late  →  Night",
+            ],
+        )
+
+    def test_single_record_summary(self):
+        record = History(
+            content_type=History.get_content_type(Team),
+            object_id=self.team.pk,
+            action="update",
+            changes={"shift": {"old": None, "new": self.shifts[0].pk}},
+        )
+
+        self.assertEqual(record.change_summary, "Shift:   Early")
+
+    def test_missing_related_object_falls_back_to_id(self):
+        record = History(
+            content_type=History.get_content_type(Team),
+            object_id=self.team.pk,
+            action="update",
+            changes={"shift": {"old": 999999, "new": None}},
+        )
+
+        self.assertEqual(record.change_summary, "Shift: 999999  →  ")
+
+
+class EmployeeHistoryStreamTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.user = UserModel.objects.create_user(
+                email="timeline@example.com", password="password"
+            )
+        cls.profile = cls.user.profile
+
+        History.get_for_objects(cls.user, cls.profile).delete()
+        now = timezone.now()
+        History.objects.bulk_create(
+            History(
+                content_type=History.get_content_type(
+                    UserModel if index % 2 else cls.profile.__class__
+                ),
+                object_id=cls.user.pk if index % 2 else cls.profile.pk,
+                action="update",
+                changes={"step": {"old": index - 1, "new": index}},
+                timestamp=now - timedelta(minutes=index),
+            )
+            for index in range(6)
+        )
+
+    def get_page(self, url):
+        request = APIRequestFactory().get(url)
+        force_authenticate(request, user=self.user)
+        response = EmployeeHistoryAPIView.as_view()(request, pk=self.user.pk)
+        response.render()
+        return response.data
+
+    def test_user_and_profile_history_is_one_query(self):
+        records = History.get_for_objects(self.user, self.profile)
+
+        with self.assertNumQueries(1):
+            steps = [record.changes["step"]["new"] for record in records]
+
+        self.assertEqual(steps, [0, 1, 2, 3, 4, 5])
+
+    def test_pages_follow_the_cursor(self):
+        first_page = self.get_page("/history/")
+
+        self.assertEqual(
+            [row["changes"]["step"]["new"] for row in first_page["results"]],
+            [0, 1, 2, 3],
+        )
+        self.assertIsNone(first_page["previous"])
+
+        second_page = self.get_page(first_page["next"])
+
+        self.assertEqual(
+            [row["changes"]["step"]["new"] for row in second_page["results"]],
+            [4, 5],
+        )
+        self.assertIsNone(second_page["next"])
+
+
+class HistoryPartitionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.company = Company.objects.create(
+                name="Partition Company",
+                annual_leave=20,
+                address=Address.objects.create(country="BG"),
+                working_on_local_holidays=False,
+            )
+            cls.department = Department.objects.create(
+                company=cls.company, name="Archive"
+            )
+
+    def create_history(self, timestamp):
+        return History.objects.create(
+            content_type=History.get_content_type(Department),
+            object_id=self.department.pk,
+            action="update",
+            changes={"name": {"old": "Old", "new": "Archive"}},
+            timestamp=timestamp,
+        )
+
+    def count_rows(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {table}")
+            return cursor.fetchone()[0]
+
+    def test_history_table_is_partitioned_by_month(self):
+        self.assertTrue(partitions.is_partitioned())
+        self.assertIn(partitions.month_start(date.today()), partitions.get_partitions())
+
+    def test_new_partition_takes_its_rows_from_the_default_partition(self):
+        self.create_history(datetime(2100, 1, 15, tzinfo=dt_timezone.utc))
+        self.assertEqual(self.count_rows(partitions.DEFAULT_PARTITION), 1)
+
+        created = partitions.ensure_partitions(0, today=date(2100, 1, 20))
+
+        self.assertEqual(created, ["history_history_p2100_01"])
+        self.assertEqual(self.count_rows(partitions.DEFAULT_PARTITION), 0)
+        self.assertEqual(self.count_rows("history_history_p2100_01"), 1)
+
+    def test_retention_archives_expired_partitions(self):
+        record = self.create_history(datetime(2000, 1, 15, tzinfo=dt_timezone.utc))
+        partitions.create_partition(date(2000, 1, 1))
+
+        summary = partitions.apply_retention(12)
+
+        self.assertEqual(summary, {"2000-01": 1})
+        self.assertNotIn(date(2000, 1, 1), partitions.get_partitions())
+        self.assertFalse(History.objects.filter(pk=record.pk).exists())
+        self.assertEqual(
+            ArchivedHistory.objects.get(pk=record.pk).changes, record.changes
+        )
+
+        timeline = HistoryTimeline.get_for_object(self.department)
+        self.assertTrue(timeline.get(pk=record.pk).is_archived)
+        self.assertTrue(timeline.filter(action="create", is_archived=False).exists())
+
+    def test_retention_exports_default_partition_rows(self):
+        record = self.create_history(datetime(2000, 1, 15, tzinfo=dt_timezone.utc))
+
+        with tempfile.TemporaryDirectory() as export_dir:
+            summary = partitions.apply_retention(
+                12, export_dir=export_dir, allow_lossy_export=True
+            )
+            ((label, archived),) = summary.items()
+
+            export_path = partitions.get_export_path(export_dir, label)
+            with gzip.open(export_path, "rt") as export_file:
+                rows = [json.loads(line) for line in export_file]
+
+        self.assertEqual(archived, 1)
+        self.assertEqual([row["id"] for row in rows], [record.pk])
+        self.assertFalse(History.objects.filter(pk=record.pk).exists())
+        self.assertFalse(ArchivedHistory.objects.filter(pk=record.pk).exists())
+
+    def test_partition_export_rewrites_file_of_interrupted_run(self):
+        record = self.create_history(datetime(2000, 1, 15, tzinfo=dt_timezone.utc))
+        partitions.create_partition(date(2000, 1, 1))
+
+        with tempfile.TemporaryDirectory() as export_dir:
+            export_path = partitions.get_export_path(export_dir, "2000-01")
+            with gzip.open(export_path, "wt") as export_file:
+                export_file.write(json.dumps({"id": record.pk}) + "\n")
+
+            summary = partitions.apply_retention(
+                12, export_dir=export_dir, allow_lossy_export=True
+            )
+
+            with gzip.open(export_path, "rt") as export_file:
+                rows = [json.loads(line) for line in export_file]
+
+        self.assertEqual(summary, {"2000-01": 1})
+        self.assertEqual([row["id"] for row in rows], [record.pk])
+        self.assertNotIn(date(2000, 1, 1), partitions.get_partitions())
+
+    def test_export_must_be_allowed_as_lossy(self):
+        record = self.create_history(datetime(2000, 1, 15, tzinfo=dt_timezone.utc))
+
+        with tempfile.TemporaryDirectory() as export_dir:
+            with self.assertRaises(ImproperlyConfigured):
+                partitions.apply_retention(12, export_dir=export_dir)
+
+        self.assertTrue(History.objects.filter(pk=record.pk).exists())
+
+    def test_default_partition_export_keeps_rows_of_earlier_runs(self):
+        exported = self.create_history(datetime(2000, 1, 15, tzinfo=dt_timezone.utc))
+        interrupted = self.create_history(datetime(2000, 2, 15, tzinfo=dt_timezone.utc))
+
+        with tempfile.TemporaryDirectory() as export_dir:
+            export_path = partitions.get_export_path(export_dir, "before-2000-06")
+            with gzip.open(export_path, "wt") as export_file:
+                export_file.write(json.dumps({"id": exported.pk + 1000}) + "\n")
+                export_file.write(json.dumps({"id": interrupted.pk}) + "\n")
+
+            partitions.archive_queryset(
+                History.objects.filter(pk=exported.pk), export_path
+            )
+            with mock.patch.object(
+                partitions.os, "replace", side_effect=OSError("disk full")
+            ), self.assertRaises(OSError):
+                partitions.archive_queryset(
+                    History.objects.filter(pk=interrupted.pk), export_path
+                )
+            self.assertTrue(History.objects.filter(pk=interrupted.pk).exists())
+
+            partitions.archive_queryset(
+                History.objects.filter(pk=interrupted.pk), export_path
+            )
+
+            with gzip.open(export_path, "rt") as export_file:
+                rows = [json.loads(line) for line in export_file]
+
+        self.assertCountEqual(
+            [row["id"] for row in rows],
+            [exported.pk, exported.pk + 1000, interrupted.pk],
+        )
+        self.assertFalse(
+            History.objects.filter(pk__in=[exported.pk, interrupted.pk]).exists()
+        )
@@ -0,0 +1,170 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from TimeSyncPro.history.models import History
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryWriter:
+    """
+    Buffers history records per transaction and persists them in one batch.
+
+    Records are collected while the transaction is open and flushed with a
+    single ``bulk_create`` from ``transaction.on_commit``. Each savepoint gets
+    its own buffer, so rolling back a savepoint or the transaction drops the
+    buffers registered inside it together with their commit hooks. With
+    ``HISTORY_ASYNC_WRITES`` enabled the batch is handed to a Celery task
+    instead, falling back to a synchronous write if the broker is unavailable.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.records_written = 0
+        self.batches_written = 0
+
+    @property
+    def is_async(self):
+        return getattr(settings, "HISTORY_ASYNC_WRITES", False)
+
+    def _get_buffer(self):
+        """
+        Return the buffer of the current savepoint, or of the transaction
+        outside any savepoint. Returns ``None`` in autocommit mode, where
+        records are written at once.
+
+        Django replaces ``run_on_commit`` whenever commit hooks run or are
+        discarded by a rollback, so buffers are only reused while it is the
+        list their hooks were added to.
+        """
+        connection = connections[self.using]
+        if not connection.in_atomic_block:
+            return None
+
+        if getattr(self._local, "hooks", None) is not connection.run_on_commit:
+            self._local.hooks = connection.run_on_commit
+            self._local.buffers = {}
+
+        key = tuple(connection.savepoint_ids)
+        buffer = self._local.buffers.get(key)
+        if buffer is not None and not buffer.flushed:
+            return buffer
+
+        buffer = _Buffer(self)
+        self._local.buffers[key] = buffer
+        transaction.on_commit(buffer.flush, using=self.using)
+        return buffer
+
+    def _add(self, records):
+        if not records:
+            return
+
+        buffer = self._get_buffer()
+        if buffer is None:
+            self.flush(records)
+        else:
+            buffer.extend(records)
+
+    def make_record(self, instance, action, changes, changed_by=None):
+        return {
+            "content_type_id": History.get_content_type(instance.__class__).pk,
+            "object_id": instance.pk,
+            "action": action,
+            "changed_by_id": changed_by.pk if changed_by else None,
+            "changes": changes,
+            "timestamp": timezone.now().isoformat(),
+        }
+
+    def record(self, instance, action, changes, changed_by=None):
+        if not changes:
+            return
+
+        if not instance.pk:
+            logger.warning("Cannot create history for unsaved instance")
+            return
+
+        self._add([self.make_record(instance, action, changes, changed_by)])
+
+    def record_many(self, instances, action, get_changes, changed_by=None):
+        """Record one entry per instance, with changes computed by ``get_changes(instance)``."""
+        records = []
+        for instance in instances:
+            changes = get_changes(instance)
+            if changes and instance.pk:
+                records.append(self.make_record(instance, action, changes, changed_by))
+        self._add(records)
+
+    def write(self, records):
+        """Persist a batch of records with a single INSERT."""
+        if not records:
+            return []
+
+        history = History.objects.using(self.using).bulk_create(
+            [
+                History(
+                    content_type_id=record["content_type_id"],
+                    object_id=record["object_id"],
+                    action=record["action"],
+                    changed_by_id=record["changed_by_id"],
+                    changes=record["changes"],
+                    timestamp=parse_datetime(record["timestamp"]),
+                )
+                for record in records
+            ]
+        )
+
+        with self._lock:
+            self.records_written += len(history)
+            self.batches_written += 1
+        return history
+
+    def flush(self, records):
+        if not records:
+            return
+
+        if self.is_async:
+            from TimeSyncPro.history.tasks import write_history_records
+
+            try:
+                write_history_records.delay(records)
+                return
+            except Exception as e:
+                logger.warning(
+                    f"Could not queue {len(records)} history records, "
+                    f"writing synchronously: {str(e)}"
+                )
+
+        try:
+            self.write(records)
+        except Exception as e:
+            logger.error(f"Error writing {len(records)} history records: {str(e)}")
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "records_written": self.records_written,
+                "batches_written": self.batches_written,
+            }
+
+
+class _Buffer(list):
+    def __init__(self, writer):
+        super().__init__()
+        self.writer = writer
+        self.flushed = False
+
+    def flush(self):
+        self.flushed = True
+        records = list(self)
+        self.clear()
+        self.writer.flush(records)
+
+
+history_writer = HistoryWriter()
@@ -1,80 +1,87 @@
+import re
+
 from django.contrib.auth import get_user_model
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils.deprecation import MiddlewareMixin
 
-from TimeSyncPro.middleware.utils import get_current_user, set_current_user
+from TimeSyncPro.middleware.principal import load_principal
+from TimeSyncPro.middleware.utils import get_current_user
+
+
+class AllowedRoutes:
+    """
+    Classifies request paths that skip the company check in constant time.
+
+    Static routes are reversed once into a frozenset. Routes that take the user
+    slug are reversed with a placeholder and compiled into a single regex, so
+    the hot path never calls ``reverse()``.
+    """
+
+    SLUG_PLACEHOLDER = "__slug__"
+    BYPASS_PREFIXES = ("/admin", "/static/", "/media/")
+
+    def __init__(self, static_route_names, slug_route_names):
+        self.static_paths = frozenset(reverse(name) for name in static_route_names)
+
+        slug_patterns = [
+            re.escape(reverse(name, kwargs={"slug": self.SLUG_PLACEHOLDER})).replace(
+                re.escape(self.SLUG_PLACEHOLDER), r"([-\w]+)"
+            )
+            for name in slug_route_names
+        ]
+        self.slug_paths = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in slug_patterns)
+        )
+
+    def is_allowed(self, path, user_slug=None):
+        if path in self.static_paths or path.startswith(self.BYPASS_PREFIXES):
+            return True
+
+        match = self.slug_paths.fullmatch(path)
+        if not match or user_slug is None:
+            return False
+        return user_slug in match.groups()
 
 
 class CompanyCheckMiddleware(MiddlewareMixin):
+    STATIC_ROUTE_NAMES = (
+        "sign_out",
+        "index",
+        "about",
+        "contact",
+        "features",
+        "privacy_policy",
+        "terms_and_conditions",
+        "terms_of_use",
+        "password_change",
+        "password_change_done",
+    )
+    SLUG_ROUTE_NAMES = (
+        "create_profile_company",
+        "profile",
+        "update_profile",
+    )
+
     def __init__(self, get_response=None):
         super().__init__(get_response)
-        self.base_allowed_urls = [
-            reverse("sign_out"),
-            reverse("index"),
-            reverse("about"),
-            reverse("contact"),
-            reverse("features"),
-            reverse("privacy_policy"),
-            reverse("terms_and_conditions"),
-            reverse("terms_of_use"),
-            reverse("password_change"),
-            reverse("password_change_done"),
-        ]
-
-    def get_allowed_urls(self, user_slug: str):
-        return self.base_allowed_urls + [
-            reverse("create_profile_company", kwargs={"slug": user_slug}),
-            reverse("profile", kwargs={"slug": user_slug}),
-            reverse("update_profile", kwargs={"slug": user_slug}),
-        ]
+        self.allowed_routes = AllowedRoutes(
+            self.STATIC_ROUTE_NAMES, self.SLUG_ROUTE_NAMES
+        )
 
     def get_user(self, request):
         return get_current_user() or request.user
 
     def cache_user(self, request) -> None:
-        if not hasattr(request, "_cached_user"):
-            try:
-                cached_user = (
-                    get_user_model()
-                    .objects.select_related(
-                        "profile",
-                        "profile__company",
-                        "profile__address",
-                        "profile__company__address",
-                    )
-                    .prefetch_related("user_permissions", "groups__permissions")
-                    .get(id=request.user.id)
-                )
-
-                if not hasattr(cached_user, "_cached_permissions"):
-                    all_permissions = cached_user.get_all_permissions()
-                    cached_user._cached_permissions = all_permissions
-                    cached_user.user_permissions_codenames = {
-                        perm.split(".")[-1] for perm in all_permissions
-                    }
-
-                request._cached_user = cached_user
-                request.user = cached_user
-                set_current_user(cached_user)
-            except get_user_model().DoesNotExist:
-                pass
+        load_principal(request)
 
     def should_bypass_check(self, request) -> bool:
         current_user = self.get_user(request)
 
-        if current_user.is_authenticated:
-            allowed_urls = self.get_allowed_urls(current_user.slug)
-        else:
-            allowed_urls = self.base_allowed_urls
-
         return (
             not current_user
             or not current_user.is_authenticated
-            or request.path in allowed_urls
-            or request.path.startswith("/admin")
-            or request.path.startswith("/static/")
-            or request.path.startswith("/media/")
+            or self.allowed_routes.is_allowed(request.path, current_user.slug)
         )
 
     def process_request(self, request):
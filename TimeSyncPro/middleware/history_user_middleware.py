@@ -2,6 +2,7 @@ from threading import local
 
 from django.utils.deprecation import MiddlewareMixin
 
+from TimeSyncPro.middleware.principal import load_principal
 from TimeSyncPro.middleware.utils import set_current_user, clear_current_user
 
 _user = local()
@@ -13,19 +14,7 @@ class HistoryUserMiddleware(MiddlewareMixin):
 
     def process_request(self, request):
         """Set current user and cache permissions"""
-        if request.user.is_authenticated:
-            if not hasattr(request.user, "_cached_permissions"):
-                # Cache all permissions
-                all_permissions = request.user.get_all_permissions()
-                request.user._cached_permissions = all_permissions
-                # Cache permission codenames
-                request.user.user_permissions_codenames = {
-                    perm.split(".")[-1] for perm in all_permissions
-                }
-
-            set_current_user(request.user)
-        else:
-            set_current_user(None)
+        set_current_user(load_principal(request))
         return None
 
     def process_response(self, request, response):
@@ -0,0 +1,94 @@
+import logging
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from TimeSyncPro.common.cache import bump_version
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_CACHE_PREFIX = "principal"
+PRINCIPAL_CACHE_TIMEOUT = 60 * 15
+
+PRINCIPAL_RELATED_FIELDS = (
+    "profile",
+    "profile__company",
+    "profile__address",
+    "profile__company__address",
+)
+
+
+def _version_key(scope):
+    return f"{PRINCIPAL_CACHE_PREFIX}:version:{scope}"
+
+
+def _bump_version(scope):
+    bump_version(_version_key(scope), cache)
+
+
+def get_permissions_cache_key(user_id):
+    user_key, global_key = _version_key(f"user:{user_id}"), _version_key("global")
+    versions = cache.get_many([user_key, global_key])
+    return (
+        f"{PRINCIPAL_CACHE_PREFIX}:permissions:{user_id}:"
+        f"v{versions.get(user_key, 1)}.{versions.get(global_key, 1)}"
+    )
+
+
+def invalidate_user_permissions(user_id):
+    _bump_version(f"user:{user_id}")
+
+
+def invalidate_all_permissions():
+    _bump_version("global")
+
+
+def get_user_permissions(user):
+    """Return the user's ``app_label.codename`` permission set, cached across processes."""
+    if not user.is_active:
+        return frozenset()
+
+    key = get_permissions_cache_key(user.pk)
+    permissions = cache.get(key)
+    if permissions is None:
+        permissions = frozenset(user.get_all_permissions())
+        cache.set(key, permissions, timeout=PRINCIPAL_CACHE_TIMEOUT)
+    return permissions
+
+
+def attach_permissions(user, permissions):
+    user._perm_cache = set(permissions)
+    user._cached_permissions = user._perm_cache
+    user.user_permissions_codenames = {perm.split(".")[-1] for perm in permissions}
+
+
+def load_principal(request):
+    """
+    Resolve the authenticated user, profile, company and permissions once per request.
+
+    The user is loaded with its profile and company, and its permission set is
+    read from the shared cache. Every middleware calls this, but only the first
+    call does any work.
+    """
+    if hasattr(request, "_principal"):
+        return request._principal
+
+    user = request.user
+    if not user.is_authenticated:
+        return None
+
+    if not user._meta.get_field("profile").is_cached(user):
+        try:
+            user = (
+                get_user_model()
+                .objects.select_related(*PRINCIPAL_RELATED_FIELDS)
+                .get(id=user.id)
+            )
+        except get_user_model().DoesNotExist:
+            return None
+
+    attach_permissions(user, get_user_permissions(user))
+
+    request._principal = user
+    request.user = user
+    return user
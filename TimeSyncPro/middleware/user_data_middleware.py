@@ -1,4 +1,4 @@
-from django.contrib.auth import get_user_model
+from TimeSyncPro.middleware.principal import load_principal
 
 
 class UserDataMiddleware:
@@ -6,12 +6,7 @@ class UserDataMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
-        if request.user.is_authenticated:
-            request.user = (
-                get_user_model()
-                .objects.select_related("profile", "profile__company")
-                .get(id=request.user.id)
-            )
+        load_principal(request)
 
         response = self.get_response(request)
         return response
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ReportsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "TimeSyncPro.reports"
+
+    def ready(self):
+        import TimeSyncPro.reports.signals
@@ -0,0 +1,140 @@
+import logging
+from datetime import timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from TimeSyncPro.absences.models import Absence
+from TimeSyncPro.accounts.models import Profile
+from TimeSyncPro.reports.models import BradfordScore
+
+logger = logging.getLogger(__name__)
+
+WINDOW_WEEKS = 52
+HIGH_RISK_SCORE = 900
+MEDIUM_RISK_SCORE = 400
+
+# Absences are clipped to the window and ordered per employee; an absence
+# starts a new spell unless it overlaps or directly follows one of the earlier
+# absences, and only adds the days no earlier absence already covered.
+SPELLS_SQL = f"""
+WITH clipped AS (
+    SELECT
+        id,
+        absentee_id,
+        GREATEST(start_date, %(window_start)s) AS start_date,
+        LEAST(end_date, %(window_end)s) AS end_date
+    FROM {Absence._meta.db_table}
+    WHERE absentee_id = ANY(%(profile_ids)s)
+        AND start_date <= %(window_end)s
+        AND end_date >= %(window_start)s
+),
+ordered AS (
+    SELECT
+        *,
+        MAX(end_date) OVER (
+            PARTITION BY absentee_id
+            ORDER BY start_date, id
+            ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+        ) AS covered_until
+    FROM clipped
+)
+SELECT
+    absentee_id,
+    COUNT(*) FILTER (
+        WHERE covered_until IS NULL OR start_date > covered_until + 1
+    ) AS spells,
+    SUM(
+        GREATEST(end_date - GREATEST(start_date, covered_until + 1) + 1, 0)
+    ) AS total_days
+FROM ordered
+GROUP BY absentee_id
+"""
+
+
+def get_window(today=None):
+    """Return the first and last day of the rolling 52-week window."""
+    window_end = today or timezone.now().date()
+    return window_end - timedelta(weeks=WINDOW_WEEKS) + timedelta(days=1), window_end
+
+
+def get_risk_level(score):
+    if score > HIGH_RISK_SCORE:
+        return BradfordScore.RiskLevels.HIGH
+    if score > MEDIUM_RISK_SCORE:
+        return BradfordScore.RiskLevels.MEDIUM
+    return BradfordScore.RiskLevels.LOW
+
+
+def calculate_spells(profile_ids, window_start, window_end):
+    """Return ``{profile id: (spells, total days)}`` in one grouped query."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            SPELLS_SQL,
+            {
+                "profile_ids": list(profile_ids),
+                "window_start": window_start,
+                "window_end": window_end,
+            },
+        )
+        return {
+            profile_id: (spells, total_days)
+            for profile_id, spells, total_days in cursor.fetchall()
+        }
+
+
+def refresh_scores(profiles, today=None):
+    """
+    Recalculate and store the scores of ``profiles``, a Profile queryset.
+    Employees without absences in the window get a zero score.
+    """
+    window_start, window_end = get_window(today)
+    companies = dict(
+        profiles.filter(company__isnull=False).values_list("id", "company_id")
+    )
+    if not companies:
+        return 0
+
+    spells = calculate_spells(companies, window_start, window_end)
+
+    scores = []
+    for profile_id, company_id in companies.items():
+        spell_count, total_days = spells.get(profile_id, (0, 0))
+        score = spell_count * spell_count * total_days
+        scores.append(
+            BradfordScore(
+                profile_id=profile_id,
+                company_id=company_id,
+                spells=spell_count,
+                total_days=total_days,
+                score=score,
+                risk_level=get_risk_level(score),
+                window_start=window_start,
+                window_end=window_end,
+            )
+        )
+
+    BradfordScore.objects.bulk_create(
+        scores,
+        update_conflicts=True,
+        unique_fields=["profile"],
+        update_fields=[
+            "company",
+            "spells",
+            "total_days",
+            "score",
+            "risk_level",
+            "window_start",
+            "window_end",
+            "calculated_at",
+        ],
+    )
+    return len(scores)
+
+
+def refresh_profile_scores(*profile_ids, today=None):
+    return refresh_scores(Profile.objects.filter(id__in=profile_ids), today)
+
+
+def refresh_company_scores(company, today=None):
+    return refresh_scores(Profile.objects.filter(company=company), today)
@@ -0,0 +1,203 @@
+from django.core.paginator import Paginator
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, Concat
+
+from TimeSyncPro.absences.models import Absence, Holiday
+from TimeSyncPro.reports.models import DailyAbsenceRollup
+from TimeSyncPro.reports.rollups import get_daily_totals
+
+HOLIDAY_TYPE = "holiday"
+REPORT_PAGE_SIZE = 50
+EXPORT_CHUNK_SIZE = 2000
+UNASSIGNED = "N/A"
+
+
+class AbsenceReport:
+    """
+    Absence and holiday report for one company and period.
+
+    Totals per type, department and team are computed with ``GROUP BY``
+    queries; detail rows are fetched one page of one type at a time, so the
+    report never loads the whole period into Python.
+    """
+
+    def __init__(self, user, company, start_date, end_date, department=None, team=None):
+        self.user = user
+        self.company = company
+        self.start_date = start_date
+        self.end_date = end_date
+        self.department = department
+        self.team = team
+
+    @property
+    def type_labels(self):
+        return {**dict(Absence.AbsenceTypes.choices), HOLIDAY_TYPE: "Holiday"}
+
+    def _scope(self, queryset, profile_field=None):
+        """
+        Restrict ``queryset`` to the profiles the user may report on, through
+        ``profile_field`` or the queryset's own department and team fields.
+        """
+        profile = self.user.profile
+        prefix = f"{profile_field}__" if profile_field else ""
+
+        if self.user.has_perm("reports.generate_all_reports"):
+            if self.department:
+                queryset = queryset.filter(**{f"{prefix}department": self.department})
+            if self.team:
+                queryset = queryset.filter(**{f"{prefix}team": self.team})
+            return queryset
+
+        if (
+            self.user.has_perm("reports.generate_department_reports")
+            and profile.department
+        ):
+            return queryset.filter(**{f"{prefix}department": profile.department})
+
+        if self.user.has_perm("reports.generate_team_reports") and profile.team:
+            return queryset.filter(**{f"{prefix}team": profile.team})
+
+        return queryset.none()
+
+    def get_absences(self):
+        return self._scope(
+            Absence.objects.filter(
+                Q(start_date__lte=self.end_date) & Q(end_date__gte=self.start_date),
+                absentee__company=self.company,
+            ),
+            "absentee",
+        )
+
+    def get_holidays(self):
+        return self._scope(
+            Holiday.objects.filter(
+                Q(start_date__lte=self.end_date) & Q(end_date__gte=self.start_date),
+                status=Holiday.StatusChoices.APPROVED,
+                requester__company=self.company,
+            ),
+            "requester",
+        )
+
+    def get_records(self, record_type):
+        """Return ``(queryset, profile field, days field)`` for one record type."""
+        if record_type == HOLIDAY_TYPE:
+            return self.get_holidays(), "requester", "days_requested"
+        return (
+            self.get_absences().filter(absence_type=record_type),
+            "absentee",
+            "days_of_absence",
+        )
+
+    def _group(self, queryset, group_by, days_field):
+        return (
+            queryset.order_by()
+            .values(group=group_by)
+            .annotate(records=Count("id"), days=Coalesce(Sum(days_field), 0))
+        )
+
+    def _merge_groups(self, *groups):
+        totals = {}
+        for rows in groups:
+            for row in rows:
+                name = row["group"] or UNASSIGNED
+                total = totals.setdefault(name, {"name": name, "records": 0, "days": 0})
+                total["records"] += row["records"]
+                total["days"] += row["days"]
+        return sorted(totals.values(), key=lambda total: total["name"])
+
+    def get_summary(self):
+        """Totals per type, department and team, in six aggregate queries."""
+        absences, holidays = self.get_absences(), self.get_holidays()
+        labels = self.type_labels
+
+        by_type = [
+            {
+                "type": row["group"],
+                "name": labels.get(row["group"], row["group"]),
+                **row,
+            }
+            for row in self._group(absences, F("absence_type"), "days_of_absence")
+        ]
+        by_type.extend(
+            {"type": HOLIDAY_TYPE, "name": labels[HOLIDAY_TYPE], **row}
+            for row in self._group(holidays, Value(HOLIDAY_TYPE), "days_requested")
+        )
+        by_type.sort(key=lambda row: row["name"])
+
+        return {
+            "by_type": by_type,
+            "by_department": self._merge_groups(
+                self._group(
+                    absences, F("absentee__department__name"), "days_of_absence"
+                ),
+                self._group(
+                    holidays, F("requester__department__name"), "days_requested"
+                ),
+            ),
+            "by_team": self._merge_groups(
+                self._group(absences, F("absentee__team__name"), "days_of_absence"),
+                self._group(holidays, F("requester__team__name"), "days_requested"),
+            ),
+            "total_records": sum(row["records"] for row in by_type),
+            "total_days": sum(row["days"] for row in by_type),
+        }
+
+    @staticmethod
+    def _detail_values(queryset, profile, days):
+        return queryset.order_by("start_date", "id").values(
+            "id",
+            "start_date",
+            "end_date",
+            "reason",
+            employee=Concat(
+                F(f"{profile}__first_name"), Value(" "), F(f"{profile}__last_name")
+            ),
+            department=Coalesce(F(f"{profile}__department__name"), Value(UNASSIGNED)),
+            team=Coalesce(F(f"{profile}__team__name"), Value(UNASSIGNED)),
+            days=F(days),
+        )
+
+    def get_detail_rows(self, record_type):
+        """Detail rows of one record type, as a lazy ``values()`` queryset."""
+        return self._detail_values(*self.get_records(record_type))
+
+    def count_records(self):
+        return self.get_absences().count() + self.get_holidays().count()
+
+    def iter_rows(self, chunk_size=EXPORT_CHUNK_SIZE):
+        """
+        Yield every absence, then every holiday, with a ``type`` label.
+
+        Rows are streamed from server-side cursors ``chunk_size`` at a time, so
+        memory use does not grow with the size of the report.
+        """
+        labels = self.type_labels
+        sources = (
+            (self.get_absences(), "absentee", "days_of_absence", F("absence_type")),
+            (self.get_holidays(), "requester", "days_requested", Value(HOLIDAY_TYPE)),
+        )
+        for queryset, profile, days, record_type in sources:
+            rows = self._detail_values(queryset, profile, days).annotate(
+                record_type=record_type
+            )
+
+            for row in rows.iterator(chunk_size=chunk_size):
+                record_type = row.pop("record_type")
+                row["type"] = labels.get(record_type, record_type)
+                yield row
+
+    def get_daily_totals(self):
+        """Headcount per day of the period, read from the daily rollups."""
+        return get_daily_totals(
+            self._scope(
+                DailyAbsenceRollup.objects.filter(
+                    company=self.company,
+                    date__range=(self.start_date, self.end_date),
+                )
+            )
+        )
+
+    def get_detail_page(self, record_type, page_number=1, page_size=REPORT_PAGE_SIZE):
+        return Paginator(self.get_detail_rows(record_type), page_size).get_page(
+            page_number
+        )
@@ -0,0 +1,163 @@
+import csv
+import logging
+import posixpath
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # XLSX export is optional
+    Workbook = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = (
+    ("Type", "type"),
+    ("Employee", "employee"),
+    ("Department", "department"),
+    ("Team", "team"),
+    ("Start Date", "start_date"),
+    ("End Date", "end_date"),
+    ("Days", "days"),
+    ("Reason", "reason"),
+)
+
+# Spreadsheet applications evaluate cells starting with these as formulas.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+DOWNLOAD_TOKEN_SALT = "reports.export_download"
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "xlsx": (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "xlsx",
+    ),
+}
+
+
+def is_format_available(export_format):
+    if export_format == "xlsx":
+        return Workbook is not None
+    return export_format in EXPORT_FORMATS
+
+
+def get_export_filename(report, export_format):
+    _, extension = EXPORT_FORMATS[export_format]
+    return (
+        f"absence-report-{report.company.slug}-"
+        f"{report.start_date:%Y%m%d}-{report.end_date:%Y%m%d}.{extension}"
+    )
+
+
+def _to_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _to_cells(row):
+    return [_to_cell(row[key]) for _, key in EXPORT_COLUMNS]
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the line instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    """Yield the rows as CSV lines, one at a time."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    for row in rows:
+        yield writer.writerow(_to_cells(row))
+
+
+def write_csv(rows, file):
+    for line in stream_csv(rows):
+        file.write(line.encode())
+
+
+def write_xlsx(rows, file):
+    """Write the rows with openpyxl's write-only (constant memory) workbook."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Absences")
+    sheet.append([header for header, _ in EXPORT_COLUMNS])
+    for row in rows:
+        sheet.append(_to_cells(row))
+    workbook.save(file)
+
+
+def write_export(report, export_format, chunk_size):
+    """Write the report to a temporary file and return it, rewound."""
+    file = tempfile.TemporaryFile()
+    writer = write_xlsx if export_format == "xlsx" else write_csv
+    writer(report.iter_rows(chunk_size), file)
+    file.seek(0)
+    return file
+
+
+def get_export_storage():
+    """
+    Return the storage of emailed exports. It lives outside the media root, so
+    files are only reachable through the signed download view.
+    """
+    return FileSystemStorage(location=settings.REPORT_EXPORT_ROOT)
+
+
+def make_download_token(name, user_id):
+    return signing.dumps({"name": name, "user": user_id}, salt=DOWNLOAD_TOKEN_SALT)
+
+
+def read_download_token(token, user_id):
+    """
+    Return the export name signed in ``token`` for ``user_id``, or ``None``
+    when the token is invalid, expired or was issued to another user.
+    """
+    try:
+        payload = signing.loads(
+            token,
+            salt=DOWNLOAD_TOKEN_SALT,
+            max_age=settings.REPORT_EXPORT_LINK_MAX_AGE,
+        )
+    except signing.BadSignature:
+        return None
+
+    if payload["user"] != user_id:
+        return None
+    return payload["name"]
+
+
+def delete_expired_exports(now=None):
+    """Delete the stored exports whose download links have expired."""
+    storage = get_export_storage()
+    if not storage.exists(""):
+        return 0
+
+    cutoff = (now or timezone.now()) - timedelta(
+        seconds=settings.REPORT_EXPORT_LINK_MAX_AGE
+    )
+    deleted = 0
+
+    for company_dir in storage.listdir("")[0]:
+        for export_dir in storage.listdir(company_dir)[0]:
+            path = posixpath.join(company_dir, export_dir)
+            for filename in storage.listdir(path)[1]:
+                name = posixpath.join(path, filename)
+                if storage.get_modified_time(name) < cutoff:
+                    storage.delete(name)
+                    deleted += 1
+
+            if storage.listdir(path) == ([], []):
+                storage.delete(path)
+
+    return deleted
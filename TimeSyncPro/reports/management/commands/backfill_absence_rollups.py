@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from TimeSyncPro.companies.models import Company
+from TimeSyncPro.reports.rollups import get_horizon, refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily headcount and absence rollups of a period"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-date",
+            type=date.fromisoformat,
+            help="First day to rebuild (default: one year ago)",
+        )
+        parser.add_argument(
+            "--end-date",
+            type=date.fromisoformat,
+            help="Last day to rebuild (default: the end of the planning horizon)",
+        )
+        parser.add_argument(
+            "--company",
+            action="append",
+            dest="company_slugs",
+            help="Only rebuild the given company slug (can be repeated)",
+        )
+        parser.add_argument(
+            "--batch-days",
+            type=int,
+            default=31,
+            help="Number of days rebuilt per transaction",
+        )
+
+    def handle(self, *args, **options):
+        today, horizon_end = get_horizon()
+        start_date = options["start_date"] or today - timedelta(days=365)
+        end_date = options["end_date"] or horizon_end
+        if start_date > end_date:
+            raise CommandError("The start date must be before the end date")
+
+        companies = Company.objects.order_by("id")
+        if options["company_slugs"]:
+            companies = companies.filter(slug__in=options["company_slugs"])
+
+        total_rollups = 0
+        for company in companies.iterator():
+            rollups = 0
+            batch_start = start_date
+            while batch_start <= end_date:
+                batch_end = min(
+                    batch_start + timedelta(days=options["batch_days"] - 1), end_date
+                )
+                rollups += refresh_rollups(company.id, batch_start, batch_end)
+                batch_start = batch_end + timedelta(days=1)
+
+            total_rollups += rollups
+            self.stdout.write(f"Company {company.slug}: {rollups} rollups")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backfilled {total_rollups} rollups from {start_date} to {end_date}"
+            )
+        )
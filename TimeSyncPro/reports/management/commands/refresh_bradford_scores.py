@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from TimeSyncPro.companies.models import Company
+from TimeSyncPro.reports.bradford import refresh_company_scores
+
+
+class Command(BaseCommand):
+    help = "Calculate the Bradford Factor scores of every employee"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--company",
+            action="append",
+            dest="company_slugs",
+            help="Only refresh the given company slug (can be repeated)",
+        )
+
+    def handle(self, *args, **options):
+        companies = Company.objects.order_by("id")
+        if options["company_slugs"]:
+            companies = companies.filter(slug__in=options["company_slugs"])
+
+        total_scores = 0
+        for company in companies.iterator():
+            scores = refresh_company_scores(company)
+            total_scores += scores
+            self.stdout.write(f"Company {company.slug}: {scores} scores")
+
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {total_scores} scores"))
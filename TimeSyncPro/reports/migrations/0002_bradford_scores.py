@@ -0,0 +1,70 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_alter_profile_date_of_hire"),
+        ("companies", "0002_initial"),
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BradfordScore",
+            fields=[
+                (
+                    "profile",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="bradford_score",
+                        serialize=False,
+                        to="accounts.profile",
+                    ),
+                ),
+                ("spells", models.PositiveIntegerField(default=0)),
+                ("total_days", models.PositiveIntegerField(default=0)),
+                ("score", models.PositiveIntegerField(default=0)),
+                (
+                    "risk_level",
+                    models.CharField(
+                        choices=[
+                            ("low", "Low"),
+                            ("medium", "Medium"),
+                            ("high", "High"),
+                        ],
+                        default="low",
+                        max_length=6,
+                    ),
+                ),
+                ("window_start", models.DateField()),
+                ("window_end", models.DateField()),
+                ("calculated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "company",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="bradford_scores",
+                        to="companies.company",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-score", "profile_id"],
+                "indexes": [
+                    models.Index(
+                        fields=["company", "risk_level", "-score", "profile"],
+                        name="bradford_company_risk_idx",
+                    ),
+                    models.Index(
+                        fields=["company", "-score", "profile"],
+                        name="bradford_company_score_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("companies", "0002_initial"),
+        ("reports", "0002_bradford_scores"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyAbsenceRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("scheduled", models.PositiveIntegerField(default=0)),
+                ("on_holiday", models.PositiveIntegerField(default=0)),
+                ("pending_requests", models.PositiveIntegerField(default=0)),
+                ("sick", models.PositiveIntegerField(default=0)),
+                ("personal", models.PositiveIntegerField(default=0)),
+                ("unpaid", models.PositiveIntegerField(default=0)),
+                ("other", models.PositiveIntegerField(default=0)),
+                ("calculated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "company",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="absence_rollups",
+                        to="companies.company",
+                    ),
+                ),
+                (
+                    "department",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="absence_rollups",
+                        to="companies.department",
+                    ),
+                ),
+                (
+                    "team",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="absence_rollups",
+                        to="companies.team",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["date"],
+                "indexes": [
+                    models.Index(
+                        fields=["company", "date"], name="rollup_company_date_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("company", "department", "team", "date"),
+                        name="unique_daily_absence_rollup",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+    ]
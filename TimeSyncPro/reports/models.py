@@ -11,3 +11,149 @@ class Report(models.Model):
             ("generate_team_reports", "Can generate team reports"),
             ("generate_reports", "Can generate own reports"),
         )
+
+
+class BradfordScore(models.Model):
+    """
+    Bradford Factor of one employee over the rolling window ending on
+    ``window_end``, kept up to date by ``TimeSyncPro.reports.bradford``.
+    """
+
+    class RiskLevels(models.TextChoices):
+        LOW = "low", "Low"
+        MEDIUM = "medium", "Medium"
+        HIGH = "high", "High"
+
+    profile = models.OneToOneField(
+        "accounts.Profile",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="bradford_score",
+    )
+
+    company = models.ForeignKey(
+        "companies.Company",
+        on_delete=models.CASCADE,
+        related_name="bradford_scores",
+    )
+
+    spells = models.PositiveIntegerField(
+        default=0,
+    )
+
+    total_days = models.PositiveIntegerField(
+        default=0,
+    )
+
+    score = models.PositiveIntegerField(
+        default=0,
+    )
+
+    risk_level = models.CharField(
+        max_length=max(len(choice) for choice in RiskLevels.values),
+        choices=RiskLevels.choices,
+        default=RiskLevels.LOW,
+    )
+
+    window_start = models.DateField()
+
+    window_end = models.DateField()
+
+    calculated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    class Meta:
+        ordering = ["-score", "profile_id"]
+        indexes = [
+            models.Index(
+                fields=["company", "risk_level", "-score", "profile"],
+                name="bradford_company_risk_idx",
+            ),
+            models.Index(
+                fields=["company", "-score", "profile"],
+                name="bradford_company_score_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.profile_id} - {self.score} ({self.risk_level})"
+
+
+class DailyAbsenceRollup(models.Model):
+    """
+    Headcount of one department/team of a company on one day, maintained by
+    ``TimeSyncPro.reports.rollups``.
+    """
+
+    company = models.ForeignKey(
+        "companies.Company",
+        on_delete=models.CASCADE,
+        related_name="absence_rollups",
+    )
+
+    department = models.ForeignKey(
+        "companies.Department",
+        on_delete=models.CASCADE,
+        related_name="absence_rollups",
+        blank=True,
+        null=True,
+    )
+
+    team = models.ForeignKey(
+        "companies.Team",
+        on_delete=models.CASCADE,
+        related_name="absence_rollups",
+        blank=True,
+        null=True,
+    )
+
+    date = models.DateField()
+
+    scheduled = models.PositiveIntegerField(
+        default=0,
+    )
+
+    on_holiday = models.PositiveIntegerField(
+        default=0,
+    )
+
+    pending_requests = models.PositiveIntegerField(
+        default=0,
+    )
+
+    sick = models.PositiveIntegerField(
+        default=0,
+    )
+
+    personal = models.PositiveIntegerField(
+        default=0,
+    )
+
+    unpaid = models.PositiveIntegerField(
+        default=0,
+    )
+
+    other = models.PositiveIntegerField(
+        default=0,
+    )
+
+    calculated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    class Meta:
+        ordering = ["date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company", "department", "team", "date"],
+                name="unique_daily_absence_rollup",
+                nulls_distinct=False,
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["company", "date"], name="rollup_company_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.company_id} - {self.date}"
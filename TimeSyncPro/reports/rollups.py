@@ -0,0 +1,188 @@
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from TimeSyncPro.absences.models import Absence, Holiday
+from TimeSyncPro.accounts.models import Profile
+from TimeSyncPro.companies.models import Company
+from TimeSyncPro.reports.models import DailyAbsenceRollup
+from TimeSyncPro.shifts.working_calendar import working_calendar
+
+logger = logging.getLogger(__name__)
+
+COUNT_FIELDS = (
+    "scheduled",
+    "on_holiday",
+    "pending_requests",
+    *Absence.AbsenceTypes.values,
+)
+
+
+def get_horizon(today=None):
+    """Return the days kept up to date for future planning: today and ahead."""
+    start_date = today or timezone.now().date()
+    return start_date, start_date + timedelta(days=settings.DAILY_ROLLUP_DAYS_AHEAD)
+
+
+def _group_filter(groups):
+    """Return a ``Q`` matching any of the ``(department id, team id)`` groups."""
+    condition = Q(pk__in=[])
+    for department_id, team_id in groups:
+        condition |= Q(department_id=department_id, team_id=team_id)
+    return condition
+
+
+def _days(start_date, end_date):
+    return [
+        start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)
+    ]
+
+
+def calculate_rollups(company_id, start_date, end_date, groups=None):
+    """
+    Return the ``DailyAbsenceRollup`` rows of ``company_id`` between the dates,
+    limited to the ``(department id, team id)`` groups when given.
+
+    A profile counts on a day only when it is one of its working days, the same
+    way holiday and absence days are counted.
+    """
+    profiles = Profile.objects.filter(company_id=company_id).select_related(
+        "company", "shift", "team__shift"
+    )
+    if groups is not None:
+        profiles = profiles.filter(_group_filter(groups))
+
+    working_days = {}
+    profile_groups = {}
+    for profile in profiles:
+        working_days[profile.pk] = set(
+            working_calendar.get_working_days(profile, start_date, end_date)
+        )
+        profile_groups[profile.pk] = (profile.department_id, profile.team_id)
+
+    counts = defaultdict(lambda: dict.fromkeys(COUNT_FIELDS, 0))
+    for profile_id, days in working_days.items():
+        for day in days:
+            counts[(profile_groups[profile_id], day)]["scheduled"] += 1
+
+    overlapping = Q(start_date__lte=end_date, end_date__gte=start_date)
+    records = list(
+        Holiday.objects.filter(
+            overlapping,
+            requester_id__in=working_days,
+            status__in=[Holiday.StatusChoices.APPROVED, Holiday.StatusChoices.PENDING],
+        ).values_list("requester_id", "start_date", "end_date", "status")
+    )
+    records += Absence.objects.filter(
+        overlapping, absentee_id__in=working_days
+    ).values_list("absentee_id", "start_date", "end_date", "absence_type")
+
+    # A person counts once per day and category, even with overlapping records
+    marked = set()
+    for profile_id, first, last, category in records:
+        field = {
+            Holiday.StatusChoices.APPROVED: "on_holiday",
+            Holiday.StatusChoices.PENDING: "pending_requests",
+        }.get(category, category)
+
+        for day in _days(max(first, start_date), min(last, end_date)):
+            if (
+                day in working_days[profile_id]
+                and (profile_id, day, field) not in marked
+            ):
+                marked.add((profile_id, day, field))
+                counts[(profile_groups[profile_id], day)][field] += 1
+
+    return [
+        DailyAbsenceRollup(
+            company_id=company_id,
+            department_id=department_id,
+            team_id=team_id,
+            date=day,
+            **values,
+        )
+        for ((department_id, team_id), day), values in counts.items()
+    ]
+
+
+def refresh_rollups(company_id, start_date, end_date, groups=None):
+    """
+    Replace the stored rollups of the company (or of its ``groups``) in the period.
+
+    Refreshes of one company are serialized on its row, and the rows are
+    calculated once the lock is held. Concurrent commit hooks then neither
+    collide on the unique constraint nor store counts older than the data.
+    """
+    if not company_id or start_date > end_date:
+        return 0
+
+    stored = DailyAbsenceRollup.objects.filter(
+        company_id=company_id, date__range=(start_date, end_date)
+    )
+    if groups is not None:
+        stored = stored.filter(_group_filter(groups))
+
+    with transaction.atomic():
+        list(
+            Company.objects.select_for_update()
+            .filter(pk=company_id)
+            .values_list("pk", flat=True)
+        )
+        rollups = calculate_rollups(company_id, start_date, end_date, groups)
+        stored.delete()
+        DailyAbsenceRollup.objects.bulk_create(rollups)
+
+    return len(rollups)
+
+
+def refresh_profile_rollups(profile_id, start_date, end_date, groups=()):
+    """
+    Refresh the group of one profile in the period, together with any
+    ``groups`` it was moved out of.
+    """
+    profile = (
+        Profile.objects.filter(pk=profile_id)
+        .values("company_id", "department_id", "team_id")
+        .first()
+    )
+    if not profile:
+        return 0
+
+    groups = {*groups, (profile["department_id"], profile["team_id"])}
+    return refresh_rollups(profile["company_id"], start_date, end_date, groups)
+
+
+def refresh_company_rollups_on_commit(company_id):
+    """
+    Refresh the planning horizon of the whole company once the transaction
+    commits, for changes that move working days without saving profiles:
+    shift blocks, bulk shift assignments and the company holiday setting.
+
+    The working calendar of the company is invalidated first, as its own
+    commit hooks may be registered after this one.
+    """
+
+    def refresh():
+        try:
+            working_calendar.invalidate_company(company_id)
+            refresh_rollups(company_id, *get_horizon())
+        except Exception as e:
+            logger.error(
+                f"Failed to refresh absence rollups of company {company_id}: {str(e)}"
+            )
+
+    transaction.on_commit(refresh)
+
+
+def get_daily_totals(rollups):
+    """Sum a filtered rollup queryset per day, in one range scan."""
+    return (
+        rollups.order_by("date")
+        .values("date")
+        .annotate(**{field: Sum(field) for field in COUNT_FIELDS})
+    )
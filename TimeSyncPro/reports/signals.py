@@ -0,0 +1,198 @@
+from datetime import date
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from TimeSyncPro.absences.models import Absence, Holiday
+from TimeSyncPro.accounts.models import Profile
+from TimeSyncPro.companies.models import Company
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_PROFILE_FIELDS = ("company_id", "department_id", "team_id", "shift_id")
+
+
+def _changes_rollup_group(update_fields):
+    # ``update_fields`` may name a foreign key by its field or its attname.
+    return update_fields is None or any(
+        Profile._meta.get_field(field).attname in ROLLUP_PROFILE_FIELDS
+        for field in update_fields
+    )
+
+
+def _refresh_scores_on_commit(profile_ids):
+    from .bradford import refresh_profile_scores
+
+    def refresh():
+        try:
+            refresh_profile_scores(*profile_ids)
+        except Exception as e:
+            logger.error(
+                f"Failed to refresh Bradford scores of profiles {profile_ids}: {str(e)}"
+            )
+
+    transaction.on_commit(refresh)
+
+
+@receiver(post_save, sender=Absence)
+@receiver(post_delete, sender=Absence)
+def refresh_absentee_bradford_score(sender, instance, **kwargs):
+    # The snapshot still holds the loaded state, so a reassigned absence also
+    # refreshes the employee it was moved away from.
+    snapshot = getattr(instance, "_history_snapshot", None) or {}
+    _refresh_scores_on_commit({instance.absentee_id, snapshot.get("absentee")} - {None})
+
+
+def _get_profile_id(instance):
+    if isinstance(instance, Holiday):
+        return instance.requester_id
+    return instance.absentee_id
+
+
+def _refresh_on_commit(refresh, *args, **kwargs):
+    def run():
+        try:
+            refresh(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Failed to refresh absence rollups: {str(e)}")
+
+    transaction.on_commit(run)
+
+
+def _get_loaded_period(instance):
+    """
+    Return the ``(profile id, start date, end date)`` the record was loaded
+    with: the history snapshot of absences, the loaded period of holidays.
+    """
+    if isinstance(instance, Holiday):
+        return getattr(instance, "_loaded_period", None)
+
+    snapshot = getattr(instance, "_history_snapshot", None)
+    if not snapshot or not snapshot.get("start_date") or not snapshot.get("end_date"):
+        return None
+    return (
+        snapshot.get("absentee"),
+        date.fromisoformat(snapshot["start_date"]),
+        date.fromisoformat(snapshot["end_date"]),
+    )
+
+
+@receiver(pre_save, sender=Holiday)
+@receiver(pre_save, sender=Absence)
+def remember_rollup_period(sender, instance, **kwargs):
+    instance._rollup_previous = None
+    if not instance.pk:
+        return
+
+    # Records built in memory have no loaded state and fall back to a query.
+    instance._rollup_previous = _get_loaded_period(instance)
+    if instance._rollup_previous is None:
+        profile_field = "requester_id" if sender is Holiday else "absentee_id"
+        instance._rollup_previous = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list(profile_field, "start_date", "end_date")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Holiday)
+@receiver(post_save, sender=Absence)
+@receiver(post_delete, sender=Holiday)
+@receiver(post_delete, sender=Absence)
+def refresh_absence_rollups(sender, instance, **kwargs):
+    from .rollups import refresh_profile_rollups
+
+    profile_id = _get_profile_id(instance)
+    start_date, end_date = instance.start_date, instance.end_date
+    previous = getattr(instance, "_rollup_previous", None)
+    if previous and previous[0] != profile_id:
+        _refresh_on_commit(refresh_profile_rollups, *previous)
+    elif previous:
+        start_date, end_date = min(start_date, previous[1]), max(end_date, previous[2])
+
+    _refresh_on_commit(refresh_profile_rollups, profile_id, start_date, end_date)
+
+
+@receiver(pre_save, sender=Profile)
+def remember_rollup_group(sender, instance, update_fields=None, **kwargs):
+    instance._rollup_previous = None
+    if instance.pk and _changes_rollup_group(update_fields):
+        instance._rollup_previous = (
+            Profile.objects.filter(pk=instance.pk)
+            .values(*ROLLUP_PROFILE_FIELDS)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Profile)
+def refresh_profile_group_rollups(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    from .rollups import get_horizon, refresh_profile_rollups, refresh_rollups
+
+    if not _changes_rollup_group(update_fields):
+        return
+
+    current = {field: getattr(instance, field) for field in ROLLUP_PROFILE_FIELDS}
+    previous = getattr(instance, "_rollup_previous", None)
+    if previous == current or not (created or previous):
+        return
+
+    start_date, end_date = get_horizon()
+    if previous and previous["company_id"] != current["company_id"]:
+        _refresh_on_commit(
+            refresh_rollups,
+            previous["company_id"],
+            start_date,
+            end_date,
+            {(previous["department_id"], previous["team_id"])},
+        )
+        previous = None
+
+    groups = {(previous["department_id"], previous["team_id"])} if previous else ()
+    _refresh_on_commit(
+        refresh_profile_rollups, instance.pk, start_date, end_date, groups
+    )
+
+
+@receiver(post_save, sender=Profile)
+def refresh_joined_profile_bradford_score(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    # New members get a score right away instead of after the nightly task.
+    previous = getattr(instance, "_rollup_previous", None)
+    joined = created or (previous and previous["company_id"] != instance.company_id)
+    if instance.company_id and joined:
+        _refresh_scores_on_commit({instance.pk})
+
+
+@receiver(post_delete, sender=Profile)
+def refresh_deleted_profile_rollups(sender, instance, **kwargs):
+    from .rollups import get_horizon, refresh_rollups
+
+    _refresh_on_commit(
+        refresh_rollups,
+        instance.company_id,
+        *get_horizon(),
+        {(instance.department_id, instance.team_id)},
+    )
+
+
+@receiver(post_save, sender=Company)
+def refresh_company_holiday_rollups(sender, instance, created, **kwargs):
+    from .rollups import refresh_company_rollups_on_commit
+
+    if created:
+        return
+
+    # Working on local holidays or not moves the working days of everyone.
+    field = "working_on_local_holidays"
+    snapshot = getattr(instance, "_history_snapshot", None) or {}
+    previous = snapshot.get(field)
+    if previous is None or previous == instance._get_state([field]).get(field):
+        return
+
+    refresh_company_rollups_on_commit(instance.pk)
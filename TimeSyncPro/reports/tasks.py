@@ -0,0 +1,118 @@
+import logging
+import uuid
+from datetime import date, timedelta
+from urllib.parse import urljoin
+
+from celery import shared_task
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.mail import send_mail
+from django.urls import reverse
+
+from TimeSyncPro.companies.models import Department, Team
+from TimeSyncPro.reports.engine import AbsenceReport
+from TimeSyncPro.reports.exports import (
+    delete_expired_exports,
+    get_export_filename,
+    get_export_storage,
+    make_download_token,
+    write_export,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="TimeSyncPro.reports.tasks.export_report_task")
+def export_report_task(
+    user_id,
+    start_date,
+    end_date,
+    department_id=None,
+    team_id=None,
+    export_format="csv",
+    base_url="",
+):
+    user = get_user_model().objects.select_related("profile__company").get(id=user_id)
+    company = user.profile.company
+
+    report = AbsenceReport(
+        user,
+        company,
+        date.fromisoformat(start_date),
+        date.fromisoformat(end_date),
+        Department.objects.filter(id=department_id, company=company).first(),
+        Team.objects.filter(id=team_id, company=company).first(),
+    )
+
+    filename = get_export_filename(report, export_format)
+    logger.info(f"Exporting {filename} for user {user_id}")
+
+    with write_export(
+        report, export_format, settings.REPORT_EXPORT_CHUNK_SIZE
+    ) as export_file:
+        name = get_export_storage().save(
+            f"{company.slug}/{uuid.uuid4().hex}/{filename}", File(export_file)
+        )
+
+    url = urljoin(
+        base_url,
+        reverse(
+            "download_report_export",
+            kwargs={
+                "company_slug": company.slug,
+                "token": make_download_token(name, user.id),
+            },
+        ),
+    )
+    hours = settings.REPORT_EXPORT_LINK_MAX_AGE // 3600
+    send_mail(
+        subject=f"Your absence report {filename} is ready",
+        message=(
+            f"Your absence report is ready to download for the next {hours} "
+            f"hours: {url}"
+        ),
+        from_email=settings.EMAIL_HOST_USER or "noreply@example.com",
+        recipient_list=[user.email],
+        fail_silently=False,
+    )
+
+    logger.info(f"Export {name} emailed to {user.email}")
+    return name
+
+
+@shared_task(name="TimeSyncPro.reports.tasks.delete_expired_report_exports")
+def delete_expired_report_exports():
+    deleted = delete_expired_exports()
+    logger.info(f"Deleted {deleted} expired report exports")
+    return deleted
+
+
+@shared_task(name="TimeSyncPro.reports.tasks.refresh_bradford_scores")
+def refresh_bradford_scores():
+    from TimeSyncPro.companies.models import Company
+    from TimeSyncPro.reports.bradford import refresh_company_scores
+
+    refreshed = 0
+    for company in Company.objects.all():
+        refreshed += refresh_company_scores(company)
+
+    logger.info(f"Refreshed {refreshed} Bradford scores")
+    return refreshed
+
+
+@shared_task(name="TimeSyncPro.reports.tasks.refresh_absence_rollups")
+def refresh_absence_rollups():
+    """Close yesterday and roll the planning horizon forward by a day."""
+    from TimeSyncPro.companies.models import Company
+    from TimeSyncPro.reports.rollups import get_horizon, refresh_rollups
+
+    start_date, end_date = get_horizon()
+    start_date -= timedelta(days=1)
+
+    refreshed = 0
+    for company_id in Company.objects.values_list("id", flat=True):
+        refreshed += refresh_rollups(company_id, start_date, end_date)
+
+    logger.info(f"Refreshed {refreshed} daily absence rollups")
+    return refreshed
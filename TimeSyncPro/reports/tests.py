@@ -1,3 +1,681 @@
-from django.test import TestCase
+import io
+import os
+import re
+import tempfile
+from datetime import date, timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from TimeSyncPro.absences.models import Absence, Holiday
+from TimeSyncPro.accounts.models import Profile
+from TimeSyncPro.common.models import Address
+from TimeSyncPro.common.test_utils import create_profile
+from TimeSyncPro.companies.forms.team_forms import EditTeamForm
+from TimeSyncPro.companies.models import Company, Department, Team
+from TimeSyncPro.reports import bradford, exports, rollups
+from TimeSyncPro.reports import signals as rollup_signals
+from TimeSyncPro.reports.engine import HOLIDAY_TYPE, AbsenceReport
+from TimeSyncPro.reports.models import BradfordScore, DailyAbsenceRollup
+from TimeSyncPro.reports.tasks import export_report_task
+
+UserModel = get_user_model()
+
+
+class AbsenceReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(
+            name="Report Company",
+            annual_leave=20,
+            address=Address.objects.create(country="BG"),
+            working_on_local_holidays=False,
+        )
+        cls.support = Department.objects.create(company=cls.company, name="Support")
+        cls.night_team = Team.objects.create(company=cls.company, name="Night Team")
+
+        cls.manager = create_profile(cls.company, "manager@example.com")
+        cls.manager.user.is_superuser = True
+        cls.manager.user.save()
+
+        cls.agent = create_profile(
+            cls.company,
+            "agent@example.com",
+            department=cls.support,
+            team=cls.night_team,
+        )
+        cls.engineer = create_profile(cls.company, "engineer@example.com")
+
+        for day, profile in ((4, cls.agent), (11, cls.agent), (18, cls.engineer)):
+            Absence.objects.create(
+                absentee=profile,
+                start_date=date(2024, 3, day),
+                end_date=date(2024, 3, day + 1),
+                absence_type=Absence.AbsenceTypes.SICK,
+                days_of_absence=2,
+            )
+        Absence.objects.create(
+            absentee=cls.engineer,
+            start_date=date(2024, 3, 25),
+            end_date=date(2024, 3, 25),
+            absence_type=Absence.AbsenceTypes.PERSONAL,
+            days_of_absence=1,
+        )
+        Holiday.objects.create(
+            requester=cls.agent,
+            start_date=date(2024, 3, 6),
+            end_date=date(2024, 3, 8),
+            status=Holiday.StatusChoices.APPROVED,
+            days_requested=3,
+        )
+        Holiday.objects.create(
+            requester=cls.engineer,
+            start_date=date(2024, 3, 6),
+            end_date=date(2024, 3, 8),
+            status=Holiday.StatusChoices.PENDING,
+            days_requested=3,
+        )
+
+    def get_report(self, **filters):
+        user = UserModel.objects.select_related("profile").get(pk=self.manager.user_id)
+        return AbsenceReport(
+            user, self.company, date(2024, 3, 1), date(2024, 3, 31), **filters
+        )
+
+    def test_summary_is_aggregated_in_the_database(self):
+        report = self.get_report()
+        report.user.has_perm("reports.generate_all_reports")
+
+        with self.assertNumQueries(6):
+            summary = report.get_summary()
+
+        self.assertEqual(
+            [(row["type"], row["records"], row["days"]) for row in summary["by_type"]],
+            [(HOLIDAY_TYPE, 1, 3), ("personal", 1, 1), ("sick", 3, 6)],
+        )
+        self.assertEqual(
+            summary["by_department"],
+            [
+                {"name": "N/A", "records": 2, "days": 3},
+                {"name": "Support", "records": 3, "days": 7},
+            ],
+        )
+        self.assertEqual(summary["total_records"], 5)
+        self.assertEqual(summary["total_days"], 10)
+
+    def test_department_filter_applies_to_summary(self):
+        summary = self.get_report(department=self.support).get_summary()
+
+        self.assertEqual(
+            summary["by_team"], [{"name": "Night Team", "records": 3, "days": 7}]
+        )
+
+    def test_detail_rows_are_paginated_per_type(self):
+        page = self.get_report().get_detail_page("sick", page_size=2)
+
+        self.assertEqual(page.paginator.count, 3)
+        self.assertEqual(
+            [(row["employee"], row["department"], row["days"]) for row in page],
+            [("Agent Tester", "Support", 2), ("Agent Tester", "Support", 2)],
+        )
+        self.assertEqual(
+            [row["employee"] for row in page.paginator.page(2)], ["Engineer Tester"]
+        )
+
+    def test_report_page_loads_summary_then_details(self):
+        self.client.force_login(self.manager.user)
+        url = reverse("generate_report", kwargs={"company_slug": self.company.slug})
+        period = {"start_date": "2024-03-01", "end_date": "2024-03-31"}
+
+        response = self.client.get(url, period)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["total_absences"], 5)
+        self.assertIsNone(response.context["page_obj"])
+
+        response = self.client.get(url, {**period, "type": "sick"})
+
+        self.assertEqual(response.context["page_obj"].paginator.count, 3)
+        self.assertContains(response, "Engineer Tester")
+
+    def test_iter_rows_streams_absences_then_holidays(self):
+        rows = list(self.get_report().iter_rows(chunk_size=2))
+
+        self.assertEqual(
+            [(row["type"], row["employee"]) for row in rows],
+            [
+                ("Sick Leave", "Agent Tester"),
+                ("Sick Leave", "Agent Tester"),
+                ("Sick Leave", "Engineer Tester"),
+                ("Personal Leave", "Engineer Tester"),
+                ("Holiday", "Agent Tester"),
+            ],
+        )
+
+    def test_unknown_absence_types_use_their_value_as_label(self):
+        Absence.objects.filter(absence_type="personal").update(absence_type="legacy")
+        report = self.get_report()
+
+        summary = report.get_summary()
+        rows = list(report.iter_rows())
+
+        self.assertIn(
+            ("legacy", "legacy"),
+            [(row["type"], row["name"]) for row in summary["by_type"]],
+        )
+        self.assertIn("legacy", [row["type"] for row in rows])
+
+    def get_export_url(self, **params):
+        self.client.force_login(self.manager.user)
+        url = reverse("export_report", kwargs={"company_slug": self.company.slug})
+        return url, {"start_date": "2024-03-01", "end_date": "2024-03-31", **params}
+
+    def test_csv_export_is_streamed(self):
+        url, params = self.get_export_url(format="csv")
+
+        response = self.client.get(url, params)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("absence-report-", response["Content-Disposition"])
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            lines[0], "Type,Employee,Department,Team,Start Date,End Date,Days,Reason"
+        )
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(lines[-1].startswith("Holiday,Agent Tester,Support,Night Team"))
+
+    @patch("TimeSyncPro.reports.exports.Workbook", None)
+    def test_xlsx_export_requires_openpyxl(self):
+        url, params = self.get_export_url(format="xlsx")
+
+        response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, 400)
+
+    @patch("TimeSyncPro.reports.views.export_report_task")
+    def test_email_delivery_is_offloaded_to_celery(self, export_task):
+        url, params = self.get_export_url(format="csv", deliver="email")
+
+        response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, 302)
+        export_task.delay.assert_called_once()
+        self.assertEqual(export_task.delay.call_args.kwargs["start_date"], "2024-03-01")
+
+    @override_settings(REPORT_EXPORT_ASYNC_THRESHOLD=3)
+    @patch("TimeSyncPro.reports.views.export_report_task")
+    def test_large_exports_are_offloaded_to_celery(self, export_task):
+        url, params = self.get_export_url(format="csv")
+
+        response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, 302)
+        export_task.delay.assert_called_once()
+
+    def test_xlsx_export_round_trips(self):
+        url, params = self.get_export_url(format="xlsx")
+
+        response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, 200)
+        workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)))
+        rows = list(workbook["Absences"].iter_rows(values_only=True))
+        self.assertEqual(rows[0][:3], ("Type", "Employee", "Department"))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(
+            rows[-1][:4], ("Holiday", "Agent Tester", "Support", "Night Team")
+        )
+
+    def test_exports_escape_formulas(self):
+        Absence.objects.filter(absentee=self.engineer).update(
+            reason='=HYPERLINK("https://example.com")'
+        )
+        url, params = self.get_export_url(format="csv")
+
+        response = self.client.get(url, params)
+
+        content = b"".join(response.streaming_content).decode()
+        self.assertIn("'=HYPERLINK", content)
+        self.assertNotIn(',"=HYPERLINK', content)
+
+    def run_export_task(self):
+        export_report_task(
+            self.manager.user_id,
+            "2024-03-01",
+            "2024-03-31",
+            department_id=self.support.id,
+            base_url="https://example.com/",
+        )
+        (url,) = re.findall(r"https://example\.com(/\S+)", mail.outbox[-1].body)
+        return url
+
+    def test_export_task_emails_signed_download_link(self):
+        with tempfile.TemporaryDirectory() as export_root:
+            with self.settings(REPORT_EXPORT_ROOT=export_root):
+                url = self.run_export_task()
+                self.assertNotIn("/media/", url)
+
+                self.client.force_login(self.manager.user)
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn(".csv", response["Content-Disposition"])
+                self.assertTrue(b"".join(response.streaming_content))
+
+                colleague = create_profile(self.company, "colleague@example.com")
+                UserModel.objects.filter(pk=colleague.user_id).update(is_superuser=True)
+                self.client.force_login(colleague.user)
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+                self.client.force_login(self.manager.user)
+                with self.settings(REPORT_EXPORT_LINK_MAX_AGE=-1):
+                    self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_expired_exports_are_deleted(self):
+        with tempfile.TemporaryDirectory() as export_root:
+            with self.settings(REPORT_EXPORT_ROOT=export_root):
+                self.run_export_task()
+
+                self.assertEqual(exports.delete_expired_exports(), 0)
+                self.assertEqual(
+                    exports.delete_expired_exports(
+                        now=timezone.now() + timedelta(days=2)
+                    ),
+                    1,
+                )
+                self.assertEqual(
+                    os.listdir(os.path.join(export_root, "report-company")), []
+                )
+
+
+class BradfordScoreTests(TestCase):
+    today = date(2024, 6, 30)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(
+            name="Bradford Company",
+            annual_leave=20,
+            address=Address.objects.create(country="BG"),
+            working_on_local_holidays=False,
+        )
+        cls.manager = create_profile(cls.company, "bradford.manager@example.com")
+        cls.employee = create_profile(cls.company, "bradford.employee@example.com")
+
+    def add_absence(self, start_date, end_date, profile=None):
+        return Absence.objects.create(
+            absentee=profile or self.employee,
+            start_date=start_date,
+            end_date=end_date,
+            absence_type=Absence.AbsenceTypes.SICK,
+            days_of_absence=1,
+        )
+
+    def refresh(self):
+        bradford.refresh_company_scores(self.company, today=self.today)
+        return BradfordScore.objects.get(profile=self.employee)
+
+    def test_overlapping_and_adjacent_absences_form_one_spell(self):
+        self.add_absence(date(2024, 3, 4), date(2024, 3, 8))
+        self.add_absence(date(2024, 3, 6), date(2024, 3, 7))
+        self.add_absence(date(2024, 3, 9), date(2024, 3, 10))
+        self.add_absence(date(2024, 5, 1), date(2024, 5, 2))
+
+        score = self.refresh()
+
+        self.assertEqual((score.spells, score.total_days), (2, 9))
+        self.assertEqual(score.score, 36)
+        self.assertEqual(score.risk_level, BradfordScore.RiskLevels.LOW)
+
+    def test_absences_are_clipped_to_the_window(self):
+        window_start, _ = bradford.get_window(self.today)
+        self.add_absence(window_start - timedelta(days=5), window_start + timedelta(1))
+        self.add_absence(window_start - timedelta(days=30), window_start - timedelta(9))
+
+        score = self.refresh()
+
+        self.assertEqual((score.spells, score.total_days), (1, 2))
+        self.assertEqual(BradfordScore.objects.get(profile=self.manager).score, 0)
+
+    def test_scores_are_refreshed_when_absences_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            absence = self.add_absence(
+                timezone.now().date() - timedelta(days=20),
+                timezone.now().date() - timedelta(days=1),
+            )
+
+        score = BradfordScore.objects.get(profile=self.employee)
+        self.assertEqual((score.spells, score.total_days, score.score), (1, 20, 20))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            absence.delete()
+
+        score.refresh_from_db()
+        self.assertEqual(score.score, 0)
+
+    def test_reassigned_absence_refreshes_both_employees(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            absence = self.add_absence(
+                timezone.now().date() - timedelta(days=5),
+                timezone.now().date() - timedelta(days=1),
+            )
+        absence = Absence.objects.get(pk=absence.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            absence.absentee = self.manager
+            absence.save()
+
+        self.assertEqual(BradfordScore.objects.get(profile=self.employee).score, 0)
+        self.assertEqual(BradfordScore.objects.get(profile=self.manager).score, 5)
+
+    def test_command_seeds_scores_of_every_company(self):
+        self.assertFalse(BradfordScore.objects.exists())
+
+        call_command("refresh_bradford_scores", stdout=io.StringIO())
+
+        self.assertEqual(
+            set(BradfordScore.objects.values_list("profile_id", flat=True)),
+            {self.manager.pk, self.employee.pk},
+        )
+
+    def test_employee_joining_the_company_gets_a_score(self):
+        user = UserModel.objects.create_user(
+            email="bradford.joiner@example.com", password="password"
+        )
+        profile = Profile.objects.get(user=user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.company = self.company
+            profile.save()
+
+        self.assertEqual(BradfordScore.objects.get(profile=profile).score, 0)
+
+    def test_report_view_does_not_recalculate_scores(self):
+        bradford.refresh_company_scores(self.company, today=self.today)
+        self.client.force_login(self.manager.user)
+        url = reverse(
+            "bradford_factor_report", kwargs={"company_slug": self.company.slug}
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(
+            {data["window_end"] for data in response.context["bradford_data"]},
+            {self.today},
+        )
+        self.assertFalse(BradfordScore.objects.exclude(window_end=self.today).exists())
+
+    def test_report_view_filters_precomputed_scores_by_risk(self):
+        today = timezone.now().date()
+        for week in range(1, 5):
+            start_date = today - timedelta(weeks=week * 3)
+            self.add_absence(start_date, start_date + timedelta(days=15))
+        bradford.refresh_company_scores(self.company)
+        self.client.force_login(self.manager.user)
+        url = reverse(
+            "bradford_factor_report", kwargs={"company_slug": self.company.slug}
+        )
+
+        response = self.client.get(url, {"risk": "high"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [data["employee"] for data in response.context["bradford_data"]],
+            ["Bradford.Employee Tester"],
+        )
+        self.assertEqual(response.context["bradford_data"][0]["spells"], 4)
+
+        response = self.client.get(url, {"risk": "low"})
+
+        self.assertEqual(
+            [data["employee"] for data in response.context["bradford_data"]],
+            ["Bradford.Manager Tester"],
+        )
+
+
+class DailyAbsenceRollupTests(TestCase):
+    monday = date(2024, 6, 10)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(
+            name="Rollup Company",
+            annual_leave=20,
+            address=Address.objects.create(country="BG"),
+            working_on_local_holidays=True,
+        )
+        cls.support = Department.objects.create(company=cls.company, name="Support")
+        cls.night_team = Team.objects.create(company=cls.company, name="Night Team")
+        cls.day_team = Team.objects.create(company=cls.company, name="Day Team")
+
+        cls.agent = create_profile(
+            cls.company,
+            "rollup.agent@example.com",
+            department=cls.support,
+            team=cls.night_team,
+        )
+        cls.colleague = create_profile(
+            cls.company,
+            "rollup.colleague@example.com",
+            department=cls.support,
+            team=cls.night_team,
+        )
+
+    def day(self, offset):
+        return self.monday + timedelta(days=offset)
+
+    def get_rollup(self, day, team=None):
+        return DailyAbsenceRollup.objects.get(
+            company=self.company, team=team or self.night_team, date=day
+        )
+
+    def test_rollups_count_each_person_once_per_working_day(self):
+        Holiday.objects.create(
+            requester=self.agent,
+            start_date=self.day(0),
+            end_date=self.day(2),
+            status=Holiday.StatusChoices.APPROVED,
+        )
+        Holiday.objects.create(
+            requester=self.colleague,
+            start_date=self.day(1),
+            end_date=self.day(1),
+        )
+        for start_date in (self.day(3), self.day(4)):
+            Absence.objects.create(
+                absentee=self.agent,
+                start_date=start_date,
+                end_date=self.day(6),
+                absence_type=Absence.AbsenceTypes.SICK,
+            )
+
+        rollups.refresh_rollups(self.company.id, self.day(0), self.day(6))
+
+        self.assertEqual(
+            [
+                (rollup.date, rollup.scheduled, rollup.on_holiday, rollup.sick)
+                for rollup in DailyAbsenceRollup.objects.filter(company=self.company)
+            ],
+            [
+                (self.day(offset), 2, int(offset < 3), int(offset > 2))
+                for offset in range(5)
+            ],
+        )
+        self.assertEqual(self.get_rollup(self.day(1)).pending_requests, 1)
+
+    def test_rollups_follow_holiday_and_profile_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            holiday = Holiday.objects.create(
+                requester=self.agent,
+                start_date=self.day(0),
+                end_date=self.day(0),
+            )
+
+        self.assertEqual(self.get_rollup(self.day(0)).pending_requests, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            holiday.status = Holiday.StatusChoices.APPROVED
+            holiday.end_date = self.day(1)
+            holiday.save()
+
+        self.assertEqual(
+            (
+                self.get_rollup(self.day(1)).pending_requests,
+                self.get_rollup(self.day(1)).on_holiday,
+            ),
+            (0, 1),
+        )
+
+        today = timezone.now().date()
+        rollups.refresh_rollups(self.company.id, *rollups.get_horizon())
+        night_scheduled = sum(
+            DailyAbsenceRollup.objects.filter(
+                team=self.night_team, date__gte=today
+            ).values_list("scheduled", flat=True)
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.colleague.team = self.day_team
+            self.colleague.save()
+
+        self.assertEqual(
+            sum(
+                DailyAbsenceRollup.objects.filter(
+                    team=self.night_team, date__gte=today
+                ).values_list("scheduled", flat=True)
+            ),
+            night_scheduled // 2,
+        )
+        self.assertTrue(
+            DailyAbsenceRollup.objects.filter(
+                team=self.day_team, date__gte=today
+            ).exists()
+        )
+
+    def test_moved_absence_refreshes_the_days_and_employee_it_left(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Absence.objects.create(
+                absentee=self.agent,
+                start_date=self.day(0),
+                end_date=self.day(0),
+                absence_type=Absence.AbsenceTypes.SICK,
+            )
+
+        absence = Absence.objects.get(absentee=self.agent)
+        absence.absentee = self.colleague
+        absence.start_date = absence.end_date = self.day(1)
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(0):
+                rollup_signals.remember_rollup_period(Absence, absence)
+            absence.save()
+
+        self.assertEqual(self.get_rollup(self.day(0)).sick, 0)
+        self.assertEqual(self.get_rollup(self.day(1)).sick, 1)
+
+    def test_profile_saved_with_attname_update_fields_moves_group(self):
+        rollups.refresh_rollups(self.company.id, *rollups.get_horizon())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.colleague.team_id = self.day_team.id
+            self.colleague.save(update_fields=["team_id"])
+
+        self.assertTrue(
+            DailyAbsenceRollup.objects.filter(
+                team=self.day_team, date__gte=timezone.now().date()
+            ).exists()
+        )
+
+    def test_refresh_locks_the_company_before_calculating(self):
+        with CaptureQueriesContext(connection) as queries:
+            rollups.refresh_rollups(self.company.id, self.day(0), self.day(0))
+
+        statements = [query["sql"] for query in queries]
+        lock = next(i for i, sql in enumerate(statements) if "FOR UPDATE" in sql)
+        first_profile_read = next(
+            i for i, sql in enumerate(statements) if "accounts_profile" in sql
+        )
+        self.assertLess(lock, first_profile_read)
+
+    def test_team_form_member_moves_regroup_rollups(self):
+        rollups.refresh_rollups(self.company.id, *rollups.get_horizon())
+        form = EditTeamForm(
+            data={
+                "name": "Night Team",
+                "employees_holidays_at_a_time": 1,
+                "team_members": [self.agent.pk],
+            },
+            instance=self.night_team,
+            company=self.company,
+            team=self.night_team,
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            form.save()
+
+        today = timezone.now().date()
+        self.assertEqual(
+            set(
+                DailyAbsenceRollup.objects.filter(
+                    company=self.company, date__gte=today
+                ).values_list("team_id", "scheduled")
+            ),
+            {(self.night_team.id, 1), (None, 1)},
+        )
+
+    @patch("TimeSyncPro.reports.rollups.refresh_rollups")
+    def test_company_holiday_setting_refreshes_company_rollups(self, refresh_rollups):
+        company = Company.objects.get(pk=self.company.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            company.name = "Renamed Rollup Company"
+            company.save()
+
+        refresh_rollups.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            company.working_on_local_holidays = False
+            company.save()
+
+        refresh_rollups.assert_called_once_with(self.company.id, *rollups.get_horizon())
+
+    def test_backfill_command_and_report_read_the_rollups(self):
+        Holiday.objects.create(
+            requester=self.agent,
+            start_date=self.day(0),
+            end_date=self.day(4),
+            status=Holiday.StatusChoices.APPROVED,
+        )
+        call_command(
+            "backfill_absence_rollups",
+            f"--start-date={self.day(0)}",
+            f"--end-date={self.day(13)}",
+            f"--company={self.company.slug}",
+            "--batch-days=5",
+            stdout=io.StringIO(),
+        )
+
+        self.assertEqual(
+            DailyAbsenceRollup.objects.filter(company=self.company).count(), 10
+        )
+
+        manager = create_profile(self.company, "rollup.manager@example.com")
+        manager.user.is_superuser = True
+        manager.user.save()
+        report = AbsenceReport(
+            manager.user, self.company, self.day(0), self.day(6), team=self.night_team
+        )
+
+        with self.assertNumQueries(1):
+            totals = list(report.get_daily_totals())
+
+        self.assertEqual(len(totals), 5)
+        self.assertEqual((totals[0]["scheduled"], totals[0]["on_holiday"]), (2, 1))
@@ -1,6 +1,11 @@
 from django.urls import path, include
 
-from TimeSyncPro.reports.views import BradfordFactorReport, generate_report
+from TimeSyncPro.reports.views import (
+    BradfordFactorReport,
+    download_report_export,
+    export_report,
+    generate_report,
+)
 
 urlpatterns = [
     path(
@@ -8,6 +13,12 @@ urlpatterns = [
         include(
             [
                 path("", generate_report, name="generate_report"),
+                path("export/", export_report, name="export_report"),
+                path(
+                    "export/<str:token>/",
+                    download_report_export,
+                    name="download_report_export",
+                ),
                 path(
                     "bradford-factor/",
                     BradfordFactorReport.as_view(),
@@ -1,36 +1,45 @@
+import os
+
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
 from django.core.exceptions import PermissionDenied
-from django.db.models import Prefetch
-from django.shortcuts import render
+from django.db.models import Prefetch, prefetch_related_objects
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponseBadRequest,
+    StreamingHttpResponse,
+)
+from django.shortcuts import redirect, render
+from django.urls import reverse
 from datetime import datetime
+from urllib.parse import urlencode
 
-from TimeSyncPro.absences.models import Absence, Holiday
-from TimeSyncPro.accounts.models import Profile
+from TimeSyncPro.absences.models import Absence
 from TimeSyncPro.common.views_mixins import CompanyAccessMixin
 from TimeSyncPro.companies.models import Department, Team
+from TimeSyncPro.reports.engine import AbsenceReport
+from TimeSyncPro.reports.exports import (
+    EXPORT_FORMATS,
+    get_export_filename,
+    get_export_storage,
+    is_format_available,
+    read_download_token,
+    stream_csv,
+    write_export,
+)
+from TimeSyncPro.reports.tasks import export_report_task
+
+from TimeSyncPro.reports.models import BradfordScore
 
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views import generic as views
-from django.db.models import (
-    Count,
-    F,
-    ExpressionWrapper,
-    IntegerField,
-    Sum,
-    Case,
-    When,
-    Value,
-    CharField,
-    Q,
-)
 from django.utils import timezone
-from django.db.models.functions import Greatest, ExtractDay
-from datetime import timedelta
 
 
-@login_required
-@permission_required("reports.generate_reports", raise_exception=True)
-def generate_report(request, company_slug):
+def build_report(request, company_slug):
+    """Build the ``AbsenceReport`` described by the request's filter parameters."""
     user = request.user
     company = request.user.profile.company
     if company.slug != company_slug:
@@ -66,179 +75,183 @@ def generate_report(request, company_slug):
     except (Department.DoesNotExist, Team.DoesNotExist):
         pass
 
-    # Get absences
-    absences_query = Absence.objects.filter(
-        Q(start_date__lte=end_date) & Q(end_date__gte=start_date),
-        absentee__company=company,
-    ).select_related("absentee", "absentee__department", "absentee__team")
+    return AbsenceReport(user, company, start_date, end_date, department, team)
 
-    if user.has_perm("reports.generate_all_reports"):
-        if department:
-            absences_query = absences_query.filter(absentee__department=department)
-        if team:
-            absences_query = absences_query.filter(absentee__team=team)
 
-    elif (
-        user.has_perm("reports.generate_department_reports") and user.profile.department
-    ):
-        absences_query = absences_query.filter(
-            absentee__department=user.profile.department
-        )
-
-    elif user.has_perm("reports.generate_team_reports") and user.profile.team:
-        absences_query = absences_query.filter(absentee__team=user.profile.team)
-
-    else:
-        absences_query = absences_query.none()
-
-    holidays_query = Holiday.objects.filter(
-        Q(start_date__lte=end_date) & Q(end_date__gte=start_date),
-        status="approved",
-        requester__company=company,
-    ).select_related("requester", "requester__department", "requester__team")
-
-    if user.has_perm("reports.generate_all_reports"):
-        if department:
-            holidays_query = holidays_query.filter(requester__department=department)
-        if team:
-            holidays_query = holidays_query.filter(requester__team=team)
-    elif (
-        user.has_perm("reports.generate_department_reports") and user.profile.department
-    ):
-        holidays_query = holidays_query.filter(
-            requester__department=user.profile.department
-        )
-    elif user.has_perm("reports.generate_team_reports") and user.profile.team:
-        holidays_query = holidays_query.filter(requester__team=user.profile.team)
-    else:
-        holidays_query = holidays_query.none()
-
-    absence_by_type = {}
-    for absence in absences_query:
-        absence_type = absence.get_absence_type_display()
-        if absence_type not in absence_by_type:
-            absence_by_type[absence_type] = []
-        absence_by_type[absence_type].append(
-            {
-                "employee": absence.absentee.full_name,
-                "department": (
-                    absence.absentee.department.name
-                    if absence.absentee.department
-                    else "N/A"
-                ),
-                "team": absence.absentee.team.name if absence.absentee.team else "N/A",
-                "start_date": absence.start_date,
-                "end_date": absence.end_date,
-                "days": absence.days_of_absence,
-                "reason": absence.reason,
-            }
-        )
+@login_required
+@permission_required("reports.generate_reports", raise_exception=True)
+def generate_report(request, company_slug):
+    report = build_report(request, company_slug)
+    company = report.company
+    summary = report.get_summary()
 
-    # Process holidays
-    holidays_data = [
-        {
-            "employee": holiday.requester.full_name,
-            "department": (
-                holiday.requester.department.name
-                if holiday.requester.department
-                else "N/A"
-            ),
-            "team": holiday.requester.team.name if holiday.requester.team else "N/A",
-            "start_date": holiday.start_date,
-            "end_date": holiday.end_date,
-            "days": holiday.days_requested,
-            "reason": holiday.reason,
-        }
-        for holiday in holidays_query
-    ]
-
-    if holidays_data:
-        absence_by_type["Holiday"] = holidays_data
+    # Detail rows are loaded for one type at a time; the initial load is summary only
+    record_type = request.GET.get("type")
+    if record_type not in report.type_labels:
+        record_type = None
 
     context = {
         "departments": Department.objects.filter(company=company),
         "teams": Team.objects.filter(company=company),
-        "absence_by_type": absence_by_type,
-        "start_date": start_date,
-        "end_date": end_date,
-        "selected_department": department,
-        "selected_team": team,
-        "total_absences": sum(len(abs_list) for abs_list in absence_by_type.values()),
+        "summary": summary,
+        "start_date": report.start_date,
+        "end_date": report.end_date,
+        "selected_department": report.department,
+        "selected_team": report.team,
+        "xlsx_available": is_format_available("xlsx"),
+        "export_query": urlencode(
+            {
+                "start_date": report.start_date.isoformat(),
+                "end_date": report.end_date.isoformat(),
+                "department": report.department.id if report.department else "",
+                "team": report.team.id if report.team else "",
+            }
+        ),
+        "selected_type": record_type,
+        "selected_type_label": report.type_labels.get(record_type),
+        "page_obj": (
+            report.get_detail_page(record_type, request.GET.get("page"))
+            if record_type
+            else None
+        ),
+        "total_absences": summary["total_records"],
+        "daily_totals": report.get_daily_totals(),
     }
 
     return render(request, "reports/generate_report.html", context)
 
 
+@login_required
+@permission_required("reports.generate_reports", raise_exception=True)
+def export_report(request, company_slug):
+    report = build_report(request, company_slug)
+
+    export_format = request.GET.get("format", "csv")
+    if not is_format_available(export_format):
+        return HttpResponseBadRequest(f"Export format {export_format} is not available")
+
+    chunk_size = settings.REPORT_EXPORT_CHUNK_SIZE
+    filename = get_export_filename(report, export_format)
+    content_type, _ = EXPORT_FORMATS[export_format]
+
+    if (
+        request.GET.get("deliver") == "email"
+        or report.count_records() > settings.REPORT_EXPORT_ASYNC_THRESHOLD
+    ):
+        export_report_task.delay(
+            user_id=request.user.id,
+            start_date=report.start_date.isoformat(),
+            end_date=report.end_date.isoformat(),
+            department_id=report.department.id if report.department else None,
+            team_id=report.team.id if report.team else None,
+            export_format=export_format,
+            base_url=request.build_absolute_uri("/"),
+        )
+        messages.success(
+            request,
+            f"The export is being prepared and will be emailed to {request.user.email}.",
+        )
+        return redirect(
+            f"{reverse('generate_report', kwargs={'company_slug': company_slug})}"
+            f"?{request.GET.urlencode()}"
+        )
+
+    if export_format == "csv":
+        response = StreamingHttpResponse(
+            stream_csv(report.iter_rows(chunk_size)), content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    return FileResponse(
+        write_export(report, export_format, chunk_size),
+        as_attachment=True,
+        filename=filename,
+        content_type=content_type,
+    )
+
+
+@login_required
+@permission_required("reports.generate_reports", raise_exception=True)
+def download_report_export(request, company_slug, token):
+    """Serve an emailed export to the user it was generated for."""
+    name = read_download_token(token, request.user.id)
+    storage = get_export_storage()
+    if (
+        name is None
+        or not name.startswith(f"{company_slug}/")
+        or not storage.exists(name)
+    ):
+        raise Http404("This download link is invalid or has expired.")
+
+    return FileResponse(
+        storage.open(name, "rb"),
+        as_attachment=True,
+        filename=os.path.basename(name),
+    )
+
+
 class BradfordFactorReport(CompanyAccessMixin, LoginRequiredMixin, views.ListView):
     template_name = "reports/bradford_factor.html"
+    paginate_by = 20
 
-    @staticmethod
-    def get_date_range():
-        end_date = timezone.now().date()
-        start_date = end_date - timedelta(days=365)
-        return start_date, end_date
+    def get_risk_level(self):
+        risk_level = self.request.GET.get("risk")
+        if risk_level in BradfordScore.RiskLevels.values:
+            return risk_level
+        return None
 
     def get_queryset(self):
-        start_date, end_date = self.get_date_range()
+        company = self.request.user.profile.company
+        queryset = BradfordScore.objects.filter(company=company).select_related(
+            "profile__department"
+        )
 
-        return (
-            Profile.objects.select_related(
-                "department",
-            )
-            .prefetch_related(
+        risk_level = self.get_risk_level()
+        if risk_level:
+            queryset = queryset.filter(risk_level=risk_level)
+
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        scores = context["object_list"]
+
+        # Scores are refreshed by the nightly task, so each one is shown with the
+        # absences of the window it was calculated for. Absence history is only
+        # loaded for the employees on the current page.
+        if scores:
+            prefetch_related_objects(
+                [score.profile for score in scores],
                 Prefetch(
                     "absences",
                     queryset=Absence.objects.filter(
-                        start_date__range=(start_date, end_date)
+                        start_date__lte=max(score.window_end for score in scores),
+                        end_date__gte=min(score.window_start for score in scores),
                     ).order_by("start_date"),
-                    to_attr="filtered_absences",
-                )
-            )
-            .annotate(
-                spells=Count(
-                    "absences",
-                    filter=Q(absences__start_date__range=(start_date, end_date)),
-                ),
-                total_days=Sum(
-                    Greatest(
-                        ExtractDay(F("absences__end_date") - F("absences__start_date"))
-                        + 1,
-                        0,
-                    ),
-                    filter=Q(absences__start_date__range=(start_date, end_date)),
+                    to_attr="window_absences",
                 ),
             )
-            .annotate(
-                bradford_score=ExpressionWrapper(
-                    F("spells") * F("spells") * F("total_days"),
-                    output_field=IntegerField(),
-                ),
-                risk_level=Case(
-                    When(bradford_score__gt=900, then=Value("High")),
-                    When(bradford_score__gt=400, then=Value("Medium")),
-                    default=Value("Low"),
-                    output_field=CharField(),
-                ),
-            )
-            .filter(company=self.request.user.profile.company)
-            .order_by("bradford_score")
-        )
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-
-        bradford_data = [
+        context["bradford_data"] = [
             {
-                "employee": employee.full_name,
-                "department": employee.department,
-                "spells": employee.spells,
-                "total_days": employee.total_days or 0,
-                "bradford_score": employee.bradford_score or 0,
-                "risk_level": employee.risk_level,
-                "absences": employee.filtered_absences,
+                "employee": score.profile.full_name,
+                "department": score.profile.department,
+                "spells": score.spells,
+                "total_days": score.total_days,
+                "bradford_score": score.score,
+                "risk_level": score.get_risk_level_display(),
+                "window_start": score.window_start,
+                "window_end": score.window_end,
+                "absences": [
+                    absence
+                    for absence in score.profile.window_absences
+                    if absence.start_date <= score.window_end
+                    and absence.end_date >= score.window_start
+                ],
             }
-            for employee in context["object_list"]
+            for score in scores
         ]
-
-        context["bradford_data"] = bradford_data
+        context["risk_levels"] = BradfordScore.RiskLevels.choices
+        context["selected_risk_level"] = self.get_risk_level()
         return context
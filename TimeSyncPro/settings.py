@@ -42,7 +42,7 @@ INTERNAL_IPS = [
 
 AUTHENTICATION_BACKENDS = [
     "TimeSyncPro.accounts.backends.CaseInsensitiveEmailBackend",
-    "django.contrib.auth.backends.ModelBackend",
+    "TimeSyncPro.accounts.backends.GroupPermissionBackend",
 ]
 
 INSTALLED_APPS = [
@@ -52,6 +52,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "django_celery_beat",
     "storages",
@@ -177,6 +178,7 @@ if DEBUG:
 
 # Internationalization
 DEFAULT_COUNTRY_CODE = os.getenv("DEFAULT_COUNTRY_CODE")
+HOLIDAY_CALENDAR_MAX_SIZE = int(os.getenv("HOLIDAY_CALENDAR_MAX_SIZE", 128))
 LANGUAGE_CODE = os.getenv("LANGUAGE_CODE", 'en-us')
 TIME_ZONE = os.getenv("TIME_ZONE")
 USE_I18N = os.getenv("USE_I18N") == "True"
@@ -250,22 +252,73 @@ LOGGING = {
     },
 }
 
-# CACHES = {
-#     'default': {
-#         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-#         'LOCATION': 'redis://127.0.0.1:6379/1',
-#     }
-# }
+CACHE_URL = os.getenv("CACHE_URL")
+
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "timesyncpro"),
+            "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", 300)),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "timesyncpro",
+        }
+    }
 
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND")
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 
+SHIFT_WORKING_DATES_HORIZON_DAYS = int(os.getenv("SHIFT_WORKING_DATES_HORIZON_DAYS", 400))
+SHIFT_GENERATION_CHUNK_SIZE = int(os.getenv("SHIFT_GENERATION_CHUNK_SIZE", 50))
+WORKING_CALENDAR_CACHE_TIMEOUT = int(os.getenv("WORKING_CALENDAR_CACHE_TIMEOUT", 86400))
+TEAM_CAPACITY_CACHE_TIMEOUT = int(os.getenv("TEAM_CAPACITY_CACHE_TIMEOUT", 3600))
+TENANT_CACHE_SIZE_SAMPLE_RATE = int(os.getenv("TENANT_CACHE_SIZE_SAMPLE_RATE", 10))
+HOLIDAY_APPROVERS_CACHE_TIMEOUT = int(os.getenv("HOLIDAY_APPROVERS_CACHE_TIMEOUT", 3600))
+HISTORY_ASYNC_WRITES = os.getenv("HISTORY_ASYNC_WRITES") == "True"
+HISTORY_PARTITION_MONTHS_AHEAD = int(os.getenv("HISTORY_PARTITION_MONTHS_AHEAD", 3))
+HISTORY_RETENTION_MONTHS = int(os.getenv("HISTORY_RETENTION_MONTHS", 24))
+# Export expired history to files instead of ArchivedHistory. Exported rows are
+# deleted from the database and drop out of the history timeline, so exporting
+# also needs HISTORY_ARCHIVE_EXPORT_LOSSY=True.
+HISTORY_ARCHIVE_EXPORT_DIR = os.getenv("HISTORY_ARCHIVE_EXPORT_DIR")
+HISTORY_ARCHIVE_EXPORT_LOSSY = os.getenv("HISTORY_ARCHIVE_EXPORT_LOSSY") == "True"
+REPORT_EXPORT_CHUNK_SIZE = int(os.getenv("REPORT_EXPORT_CHUNK_SIZE", 2000))
+REPORT_EXPORT_ASYNC_THRESHOLD = int(os.getenv("REPORT_EXPORT_ASYNC_THRESHOLD", 20000))
+# Emailed exports are kept outside the media root and served by a signed link.
+REPORT_EXPORT_ROOT = os.getenv("REPORT_EXPORT_ROOT", os.path.join(BASE_DIR, "private", "report_exports"))
+REPORT_EXPORT_LINK_MAX_AGE = int(os.getenv("REPORT_EXPORT_LINK_MAX_AGE", 86400))
+DAILY_ROLLUP_DAYS_AHEAD = int(os.getenv("DAILY_ROLLUP_DAYS_AHEAD", 90))
+
 CELERY_BEAT_SCHEDULE = {
     "generate-shift-dates": {
         "task": "TimeSyncPro.shifts.tasks.generate_shift_dates_for_next_year",
-        "schedule": crontab(month_of_year="1", day_of_month="1", hour="0", minute="5"),
+        "schedule": crontab(hour="0", minute="5"),
+    },
+    "maintain-history-partitions": {
+        "task": "TimeSyncPro.history.tasks.maintain_history_partitions",
+        "schedule": crontab(day_of_month="1", hour="2", minute="0"),
+    },
+    # Seed the scores after deploying with `manage.py refresh_bradford_scores`,
+    # the report only reads the stored ones.
+    "refresh-bradford-scores": {
+        "task": "TimeSyncPro.reports.tasks.refresh_bradford_scores",
+        "schedule": crontab(hour="0", minute="15"),
+    },
+    "refresh-absence-rollups": {
+        "task": "TimeSyncPro.reports.tasks.refresh_absence_rollups",
+        "schedule": crontab(hour="0", minute="30"),
+    },
+    "delete-expired-report-exports": {
+        "task": "TimeSyncPro.reports.tasks.delete_expired_report_exports",
+        "schedule": crontab(minute="45"),
     },
     "yearly-leave-days-update": {
         "task": "TimeSyncPro.companies.tasks.yearly_set_next_year_leave_days",
@@ -1,6 +1,10 @@
 from django import forms
 
-from TimeSyncPro.companies.forms.mixins import Select2SlideCheckboxWidget
+from TimeSyncPro.accounts.directory import UNASSIGNED, get_autocomplete_url
+from TimeSyncPro.companies.forms.mixins import (
+    LazySelect2SlideCheckboxWidget,
+    Select2SlideCheckboxWidget,
+)
 from TimeSyncPro.common.form_mixins import CheckExistingNamePerCompanyMixin, LabelMixin
 from TimeSyncPro.common.form_mixins import ReadonlyFieldsFormMixin
 from TimeSyncPro.shifts.models import Shift
@@ -19,7 +23,7 @@ class ShiftBaseForm(
     shift_members = forms.ModelMultipleChoiceField(
         queryset=None,
         required=False,
-        widget=Select2SlideCheckboxWidget(
+        widget=LazySelect2SlideCheckboxWidget(
             attrs={"class": "select2-checkbox", "data-placeholder": "Select members..."}
         ),
     )
@@ -74,6 +78,9 @@ class ShiftBaseForm(
             shift=None
         )
         self.fields["shift_teams"].queryset = self.company.teams.filter(shift=None)
+        self.fields["shift_members"].widget.attrs["data-autocomplete-url"] = (
+            get_autocomplete_url(self.company, shift=[UNASSIGNED])
+        )
 
         self.fields["rotation_weeks"].widget.attrs["id"] = "rotation-weeks"
 
@@ -111,6 +118,9 @@ class UpdateShiftForm(ShiftBaseForm):
 
         self.fields["shift_members"].queryset = combined_queryset
         self.fields["shift_members"].initial = self.initial_shift_members
+        self.fields["shift_members"].widget.attrs["data-autocomplete-url"] = (
+            get_autocomplete_url(self.company, shift=[UNASSIGNED, self.shift.pk])
+        )
 
         self.fields["shift_teams"].queryset = combined_teams_queryset
         self.fields["shift_teams"].initial = self.initial_shift_teams
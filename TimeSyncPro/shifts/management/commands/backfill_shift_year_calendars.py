@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from TimeSyncPro.shifts.models import Shift
+
+
+class Command(BaseCommand):
+    help = "Build the per-year working day bitmaps from the materialized shift dates"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--shift",
+            type=int,
+            action="append",
+            dest="shift_ids",
+            help="Only backfill the given shift id (can be repeated)",
+        )
+
+    def handle(self, *args, **options):
+        shifts = Shift.objects.order_by("id")
+        if options["shift_ids"]:
+            shifts = shifts.filter(id__in=options["shift_ids"])
+
+        total_calendars = 0
+        for shift in shifts.iterator():
+            calendars = shift.backfill_year_calendars()
+            total_calendars += calendars
+            self.stdout.write(f"Shift {shift.id}: {calendars} year calendars")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backfilled {total_calendars} year calendars for {shifts.count()} shifts"
+            )
+        )
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:41
+
+import TimeSyncPro.shifts.models.shift_year_calendar
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shifts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShiftYearCalendar",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveSmallIntegerField()),
+                (
+                    "working_days",
+                    models.BinaryField(
+                        default=b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+                        max_length=46,
+                    ),
+                ),
+                (
+                    "block_orders",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.PositiveSmallIntegerField(),
+                        default=TimeSyncPro.shifts.models.shift_year_calendar.get_empty_block_orders,
+                        size=366,
+                    ),
+                ),
+                (
+                    "shift",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="year_calendars",
+                        to="shifts.shift",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("shift", "year"), name="unique_shift_year_calendar"
+                    )
+                ],
+            },
+        ),
+    ]
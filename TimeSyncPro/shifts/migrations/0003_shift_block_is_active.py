@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 11:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shifts", "0002_shift_year_calendar"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shiftblock",
+            name="is_active",
+            field=models.BooleanField(default=True),
+        ),
+    ]
@@ -0,0 +1,61 @@
+from collections import defaultdict
+from datetime import date
+
+from django.db import migrations
+
+DAYS_IN_YEAR = 366
+BITMAP_LENGTH = (DAYS_IN_YEAR + 7) // 8
+
+
+def build_shift_year_calendars(apps, schema_editor):
+    """
+    Rebuild the year bitmaps of every shift from its materialized working
+    dates, so existing shifts keep their working days once reads move to the
+    bitmaps.
+    """
+    Shift = apps.get_model("shifts", "Shift")
+    ShiftBlock = apps.get_model("shifts", "ShiftBlock")
+    ShiftYearCalendar = apps.get_model("shifts", "ShiftYearCalendar")
+    WorkingDate = ShiftBlock.working_dates.through
+
+    for shift_id in Shift.objects.order_by("id").values_list("id", flat=True):
+        working_dates = WorkingDate.objects.filter(
+            shiftblock__pattern_id=shift_id
+        ).values_list("shiftblock__order", "date__date")
+
+        days_by_year = defaultdict(list)
+        for block_order, day in working_dates:
+            days_by_year[day.year].append((day, block_order))
+
+        calendars = []
+        for year, days in sorted(days_by_year.items()):
+            bits = 0
+            block_orders = [0] * DAYS_IN_YEAR
+            for day, block_order in days:
+                index = (day - date(year, 1, 1)).days
+                bits |= 1 << index
+                block_orders[index] = block_order
+            calendars.append(
+                ShiftYearCalendar(
+                    shift_id=shift_id,
+                    year=year,
+                    working_days=bits.to_bytes(BITMAP_LENGTH, "little"),
+                    block_orders=block_orders,
+                )
+            )
+
+        ShiftYearCalendar.objects.filter(shift_id=shift_id).delete()
+        ShiftYearCalendar.objects.bulk_create(calendars)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shifts", "0003_shift_block_is_active"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            build_shift_year_calendars, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:15
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def set_block_effective_dates(apps, schema_editor):
+    """
+    Date the active blocks of edited shifts from their first working date, so
+    the retired blocks keep answering for the days before it. Earlier edits
+    cannot be told apart and stay one retired set.
+    """
+    ShiftBlock = apps.get_model("shifts", "ShiftBlock")
+    WorkingDate = ShiftBlock.working_dates.through
+
+    edited_shift_ids = (
+        ShiftBlock.objects.filter(is_active=False)
+        .values_list("pattern_id", flat=True)
+        .distinct()
+    )
+    for shift_id in edited_shift_ids:
+        effective_from = WorkingDate.objects.filter(
+            shiftblock__pattern_id=shift_id, shiftblock__is_active=True
+        ).aggregate(first_day=Min("date__date"))["first_day"]
+        if effective_from is None:
+            continue
+
+        blocks = ShiftBlock.objects.filter(pattern_id=shift_id)
+        blocks.filter(is_active=True).update(effective_from=effective_from)
+        blocks.filter(is_active=False).update(effective_until=effective_from)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shifts", "0004_build_shift_year_calendars"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shiftblock",
+            name="effective_from",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="shiftblock",
+            name="effective_until",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(
+            set_block_effective_dates, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -1,3 +1,4 @@
 from .shift import Shift
 from .shift_block import ShiftBlock
 from .date import Date
+from .shift_year_calendar import ShiftYearCalendar
@@ -1,4 +1,3 @@
-import holidays
 from django.db import models
 
 
@@ -16,14 +15,9 @@ class Date(models.Model):
 
     def is_holiday(self, company):
         try:
-            country_code = company.country_code
-
-            country_holidays = holidays.country_holidays(country_code)
-
-            return self.date in country_holidays
-
-        except (AttributeError, KeyError, ValueError) as e:
+            return company.is_holiday(self.date)
+        except AttributeError:
             return False
 
     def is_working_day(self, shift):
-        return self.shift_blocks.filter(pattern=shift).exists()
+        return self.shift_blocks(manager="all_objects").filter(pattern=shift).exists()
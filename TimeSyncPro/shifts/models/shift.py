@@ -1,13 +1,23 @@
-from django.db import models
+import logging
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import models, transaction
 from django.core.validators import (
     MinValueValidator,
     MinLengthValidator,
     MaxValueValidator,
 )
 from django.utils import timezone
-from datetime import timedelta, datetime
+from datetime import timedelta
 from TimeSyncPro.history.model_mixins import HistoryMixin
 from .date import Date
+from .shift_block import ShiftBlock
+from .shift_year_calendar import ShiftYearCalendar
+from ..patterns import ShiftSchedule
+
+logger = logging.getLogger(__name__)
 
 
 class Shift(HistoryMixin, models.Model):
@@ -15,6 +25,8 @@ class Shift(HistoryMixin, models.Model):
     MAX_NAME_LENGTH = 50
     MIN_ROTATION_WEEKS = 1
     MAX_ROTATION_WEEKS = 52
+    WORKING_DATES_BATCH_SIZE = 1000
+    DEFAULT_WORKING_DATES_HORIZON_DAYS = 400
 
     tracked_fields = ["name", "description", "start_date", "rotation_weeks"]
 
@@ -59,55 +71,189 @@ class Shift(HistoryMixin, models.Model):
         null=True,
     )
 
-    def generate_shift_working_dates(self, is_edit=False):
-        today = timezone.now().date()
-        current_date = (
-            self.last_generated_date + timedelta(days=1)
-            if self.last_generated_date
-            else self.start_date
+    def get_pattern(self):
+        if not hasattr(self, "_pattern"):
+            self._pattern = ShiftSchedule.from_blocks(
+                self.start_date,
+                ShiftBlock.all_objects.filter(pattern=self),
+                self.company,
+            )
+        return self._pattern
+
+    def compute_shift_working_dates(self, blocks, start_date, end_date):
+        """
+        Return (block_id, date) pairs for every working day in the range,
+        each answered by the block set in effect on that day.
+        """
+        pattern = ShiftSchedule.from_blocks(self.start_date, blocks, self.company)
+        return [
+            (block.pk, day)
+            for day, block in pattern.iter_working_days(start_date, end_date)
+        ]
+
+    @staticmethod
+    def get_working_dates_horizon_end(today=None):
+        today = today or timezone.now().date()
+        horizon_days = getattr(
+            settings,
+            "SHIFT_WORKING_DATES_HORIZON_DAYS",
+            Shift.DEFAULT_WORKING_DATES_HORIZON_DAYS,
         )
-        end_date = datetime(today.year + 2, 12, 31).date()
-        work_on_local_holidays = self.company.working_on_local_holidays
+        return today + timedelta(days=horizon_days)
+
+    def generate_shift_working_dates(self, is_edit=False, effective_from=None):
+        """
+        Materialize working dates up to the rolling horizon.
+
+        Without ``is_edit`` only the missing tail after ``last_generated_date`` is
+        appended. On edit, rows from ``effective_from`` (today by default) onwards
+        are recomputed and everything before it is kept as history.
+        """
+        started_at = time.monotonic()
+        today = timezone.now().date()
+        end_date = self.get_working_dates_horizon_end(today)
 
         self.refresh_from_db()
-        blocks = self.blocks.all().order_by("order")
+        blocks = list(ShiftBlock.all_objects.filter(pattern=self).order_by("order"))
+        working_dates_model = ShiftBlock.working_dates.through
 
         if is_edit:
+            effective_from = effective_from or today
+            current_date = max(effective_from, self.start_date)
+        elif self.last_generated_date:
+            current_date = self.last_generated_date + timedelta(days=1)
+        else:
             current_date = self.start_date
-            for block in blocks:
-                block.working_dates.clear()
 
-        try:
-            while current_date <= end_date:
-                for block in blocks:
-                    for day in block.on_off_days:
+        stats = {
+            "shift_id": self.pk,
+            "rows_written": 0,
+            "elapsed": 0.0,
+        }
+
+        working_dates = self.compute_shift_working_dates(blocks, current_date, end_date)
 
-                        if day == 1:
-                            date_obj, created = Date.objects.get_or_create(
-                                date=current_date
-                            )
-                            if work_on_local_holidays or not date_obj.is_holiday(
-                                self.company
-                            ):
-                                block.working_dates.add(date_obj)
+        with transaction.atomic():
+            if is_edit:
+                working_dates_model.objects.filter(
+                    shiftblock__pattern=self, date__date__gte=effective_from
+                ).delete()
 
-                        current_date += timedelta(days=1)
+            if working_dates:
+                dates = sorted({date for _, date in working_dates})
+                Date.objects.bulk_create(
+                    [Date(date=date) for date in dates],
+                    ignore_conflicts=True,
+                    batch_size=self.WORKING_DATES_BATCH_SIZE,
+                )
+                date_ids = dict(
+                    Date.objects.filter(date__range=(dates[0], dates[-1])).values_list(
+                        "date", "id"
+                    )
+                )
+                working_dates_model.objects.bulk_create(
+                    [
+                        working_dates_model(
+                            shiftblock_id=block_id, date_id=date_ids[date]
+                        )
+                        for block_id, date in working_dates
+                    ],
+                    ignore_conflicts=True,
+                    batch_size=self.WORKING_DATES_BATCH_SIZE,
+                )
 
-            self.last_generated_date = current_date
-            self.save()
+            self.update_year_calendars(
+                blocks,
+                working_dates,
+                effective_from if is_edit else current_date,
+                max(end_date, self.last_generated_date or end_date),
+            )
 
-        except ValueError as e:
-            print(f"Error generating working dates: {e}")
+            if is_edit or current_date <= end_date:
+                self.last_generated_date = end_date
+                Shift.objects.filter(pk=self.pk).update(last_generated_date=end_date)
+
+        stats["rows_written"] = len(working_dates)
+        stats["elapsed"] = round(time.monotonic() - started_at, 3)
+        logger.info(
+            f"Generated {stats['rows_written']} working dates for shift {self.pk} "
+            f"in {stats['elapsed']}s"
+        )
+        return stats
+
+    def update_year_calendars(self, blocks, working_dates, start_date, end_date):
+        """Replace the bitmap days between the dates with ``working_dates``."""
+        if start_date > end_date:
+            return
+
+        block_orders = {block.pk: block.order for block in blocks}
+        days_by_year = defaultdict(list)
+        for block_id, day in working_dates:
+            days_by_year[day.year].append((day, block_orders[block_id]))
+
+        calendars = {
+            calendar.year: calendar
+            for calendar in self.year_calendars.filter(
+                year__range=(start_date.year, end_date.year)
+            )
+        }
+        calendars_to_create = []
+
+        for year in range(start_date.year, end_date.year + 1):
+            calendar = calendars.get(year)
+            if calendar is None:
+                if not days_by_year[year]:
+                    continue
+                calendar = ShiftYearCalendar(shift=self, year=year)
+                calendars_to_create.append(calendar)
+
+            calendar.clear_range(start_date, end_date)
+            calendar.add_working_days(days_by_year[year])
+
+        ShiftYearCalendar.objects.bulk_create(calendars_to_create)
+        ShiftYearCalendar.objects.bulk_update(
+            list(calendars.values()), ["working_days", "block_orders"]
+        )
+
+    def backfill_year_calendars(self):
+        """Rebuild the year bitmaps from the materialized working dates."""
+        working_dates = ShiftBlock.working_dates.through.objects.filter(
+            shiftblock__pattern=self
+        ).values_list("shiftblock__order", "date__date")
+
+        days_by_year = defaultdict(list)
+        for block_order, day in working_dates:
+            days_by_year[day.year].append((day, block_order))
+
+        calendars = []
+        for year, days in sorted(days_by_year.items()):
+            calendar = ShiftYearCalendar(shift=self, year=year)
+            calendar.add_working_days(days)
+            calendars.append(calendar)
+
+        with transaction.atomic():
+            self.year_calendars.all().delete()
+            ShiftYearCalendar.objects.bulk_create(calendars)
+
+        return len(calendars)
+
+    def get_year_calendars(self, start_date, end_date):
+        return list(
+            self.year_calendars.filter(
+                year__range=(start_date.year, end_date.year)
+            ).order_by("year")
+        )
 
     class Meta:
         unique_together = ("company", "name")
 
     def get_current_block(self):
         current_date = timezone.now().date()
-        for block in self.blocks.all():
-            if current_date in block.working_dates.all():
-                return block
-        return None
+        calendar = self.year_calendars.filter(year=current_date.year).first()
+        block_order = calendar.get_block_order(current_date) if calendar else None
+        if block_order is None:
+            return None
+        return ShiftBlock.all_objects.filter(pattern=self, order=block_order).first()
 
     def get_shift_pattern(self):
         block = self.blocks.first()
@@ -118,13 +264,18 @@ class Shift(HistoryMixin, models.Model):
                 return "Custom"
         return "No pattern"
 
-    def get_queryset_of_shift_working_dates_by_period(
-        self, start_date=None, end_date=None
-    ):
+    @staticmethod
+    def get_period(start_date=None, end_date=None):
         if not start_date:
             start_date = timezone.now().date()
         if not end_date:
             end_date = start_date + timedelta(days=30)
+        return start_date, end_date
+
+    def get_queryset_of_shift_working_dates_by_period(
+        self, start_date=None, end_date=None
+    ):
+        start_date, end_date = self.get_period(start_date, end_date)
 
         queryset = Date.objects.filter(
             shift_blocks__pattern=self, date__gte=start_date, date__lte=end_date
@@ -132,30 +283,38 @@ class Shift(HistoryMixin, models.Model):
         return queryset
 
     def get_shift_working_dates_by_period(self, start_date=None, end_date=None):
-        dates_queryset = self.get_queryset_of_shift_working_dates_by_period(
-            start_date, end_date
-        )
-        return [d.date for d in dates_queryset] or []
+        start_date, end_date = self.get_period(start_date, end_date)
+        return [
+            day
+            for calendar in self.get_year_calendars(start_date, end_date)
+            for day in calendar.get_working_dates(start_date, end_date)
+        ]
 
     def get_count_of_shift_working_days_by_period(self, start_date=None, end_date=None):
-        return self.get_queryset_of_shift_working_dates_by_period(
-            start_date, end_date
-        ).count()
+        start_date, end_date = self.get_period(start_date, end_date)
+        return sum(
+            calendar.count_working_days(start_date, end_date)
+            for calendar in self.get_year_calendars(start_date, end_date)
+        )
 
     def get_shift_working_dates_with_time_by_period(
         self, start_date=None, end_date=None
     ):
-        dates_queryset = self.get_queryset_of_shift_working_dates_by_period(
-            start_date, end_date
-        )
+        start_date, end_date = self.get_period(start_date, end_date)
+        blocks = {
+            block.order: block for block in ShiftBlock.all_objects.filter(pattern=self)
+        }
 
         dates_dict = {}
-        for d in dates_queryset:
-            shift_block = d.shift_blocks.get(pattern=self)
-            dates_dict[d.date] = {
-                "start_time": shift_block.start_time,
-                "end_time": shift_block.end_time,
-            }
+        for calendar in self.get_year_calendars(start_date, end_date):
+            for day in calendar.get_working_dates(start_date, end_date):
+                shift_block = blocks.get(calendar.get_block_order(day))
+                if shift_block is None:
+                    continue
+                dates_dict[day] = {
+                    "start_time": shift_block.start_time,
+                    "end_time": shift_block.end_time,
+                }
         return dates_dict
 
     def __str__(self):
@@ -8,7 +8,25 @@ from django.utils import timezone
 from TimeSyncPro.history.model_mixins import HistoryMixin
 
 
+class ActiveShiftBlockManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
+
+
 class ShiftBlock(HistoryMixin, models.Model):
+    """
+    One block of a shift rotation.
+
+    Blocks are never edited or deleted once saved, because the generated
+    working dates and the year bitmaps point at them. A changed rotation
+    retires the current blocks and adds new ones with higher ``order``
+    values, so ``order`` stays unique within a shift. ``objects`` and the
+    ``shift.blocks`` relation only return active blocks.
+
+    ``effective_from`` and ``effective_until`` (exclusive) bound the days a
+    block set was in effect; empty means since the shift start and until now.
+    """
+
     MIN_DAYS_ON = 1
     MAX_DAYS_ON = 28
     MIN_DAYS_OFF = 1
@@ -80,6 +98,23 @@ class ShiftBlock(HistoryMixin, models.Model):
         blank=True,
     )
 
+    is_active = models.BooleanField(
+        default=True,
+    )
+
+    effective_from = models.DateField(
+        blank=True,
+        null=True,
+    )
+
+    effective_until = models.DateField(
+        blank=True,
+        null=True,
+    )
+
+    objects = ActiveShiftBlockManager()
+    all_objects = models.Manager()
+
     class Meta:
         ordering = ["order"]
 
@@ -0,0 +1,118 @@
+from datetime import date, timedelta
+
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+
+
+def get_empty_block_orders():
+    return [0] * ShiftYearCalendar.DAYS_IN_YEAR
+
+
+class ShiftYearCalendar(models.Model):
+    """
+    Working days of a shift for one calendar year.
+
+    Bit ``n`` of ``working_days`` is set when the shift works on day ``n`` of the
+    year (0-based, little-endian), and ``block_orders[n]`` holds the ``order`` of
+    the block working that day, or 0 on days off.
+    """
+
+    DAYS_IN_YEAR = 366
+    BITMAP_LENGTH = (DAYS_IN_YEAR + 7) // 8
+
+    shift = models.ForeignKey(
+        "Shift",
+        on_delete=models.CASCADE,
+        related_name="year_calendars",
+    )
+
+    year = models.PositiveSmallIntegerField(
+        blank=False,
+        null=False,
+    )
+
+    working_days = models.BinaryField(
+        max_length=BITMAP_LENGTH,
+        default=bytes(BITMAP_LENGTH),
+        blank=False,
+        null=False,
+    )
+
+    block_orders = ArrayField(
+        models.PositiveSmallIntegerField(),
+        size=DAYS_IN_YEAR,
+        default=get_empty_block_orders,
+        blank=False,
+        null=False,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["shift", "year"], name="unique_shift_year_calendar"
+            )
+        ]
+
+    @staticmethod
+    def get_day_index(day):
+        return day.timetuple().tm_yday - 1
+
+    @property
+    def bitmap(self):
+        return int.from_bytes(self.working_days, "little")
+
+    @bitmap.setter
+    def bitmap(self, value):
+        self.working_days = value.to_bytes(self.BITMAP_LENGTH, "little")
+
+    def _clamp_range(self, start_date, end_date):
+        first_day = date(self.year, 1, 1)
+        last_day = date(self.year, 12, 31)
+        return max(start_date, first_day), min(end_date, last_day)
+
+    def _range_mask(self, start_date, end_date):
+        start_date, end_date = self._clamp_range(start_date, end_date)
+        if start_date > end_date:
+            return 0
+        start_index = self.get_day_index(start_date)
+        length = (end_date - start_date).days + 1
+        return ((1 << length) - 1) << start_index
+
+    def add_working_days(self, working_days):
+        """Mark ``(day, block_order)`` pairs of this year as working days."""
+        bits = self.bitmap
+        for day, block_order in working_days:
+            index = self.get_day_index(day)
+            bits |= 1 << index
+            self.block_orders[index] = block_order
+        self.bitmap = bits
+
+    def clear_range(self, start_date, end_date):
+        mask = self._range_mask(start_date, end_date)
+        self.bitmap &= ~mask
+        start_date, end_date = self._clamp_range(start_date, end_date)
+        for i in range((end_date - start_date).days + 1):
+            self.block_orders[self.get_day_index(start_date) + i] = 0
+
+    def count_working_days(self, start_date, end_date):
+        return (self.bitmap & self._range_mask(start_date, end_date)).bit_count()
+
+    def get_working_dates(self, start_date, end_date):
+        bits = self.bitmap & self._range_mask(start_date, end_date)
+        first_day = date(self.year, 1, 1)
+        working_dates = []
+
+        while bits:
+            lowest_bit = bits & -bits
+            working_dates.append(
+                first_day + timedelta(days=lowest_bit.bit_length() - 1)
+            )
+            bits ^= lowest_bit
+
+        return working_dates
+
+    def get_block_order(self, day):
+        return self.block_orders[self.get_day_index(day)] or None
+
+    def __str__(self):
+        return f"{self.shift} - {self.year}"
@@ -0,0 +1,176 @@
+from datetime import timedelta
+from itertools import groupby
+
+
+class ShiftPattern:
+    """Answers working-day questions for a shift rotation without touching the database.
+
+    A rotation is fully defined by the shift start date, the ordered
+    ``on_off_days`` of its blocks and the company holiday calendar, so the
+    block working on any date is found with modular arithmetic.
+    """
+
+    def __init__(
+        self,
+        start_date,
+        blocks,
+        company=None,
+        effective_from=None,
+        effective_until=None,
+    ):
+        self.start_date = start_date
+        self.blocks = list(blocks)
+        self.company = company
+
+        # The rotation is anchored at the shift start date, but only answers
+        # for the days it was in effect: ``effective_until`` is exclusive.
+        self.first_day = max(start_date, effective_from or start_date)
+        self.last_day = effective_until - timedelta(days=1) if effective_until else None
+
+        self.cycle_days = [
+            block if day == 1 else None
+            for block in self.blocks
+            for day in block.on_off_days
+        ]
+        self.cycle_length = len(self.cycle_days)
+
+        self._working_days_before = [0]
+        for block in self.cycle_days:
+            self._working_days_before.append(
+                self._working_days_before[-1] + (block is not None)
+            )
+
+    def covers(self, day):
+        return self.first_day <= day and (self.last_day is None or day <= self.last_day)
+
+    def _clip(self, start_date, end_date):
+        start_date = max(start_date, self.first_day)
+        if self.last_day is not None:
+            end_date = min(end_date, self.last_day)
+        return start_date, end_date
+
+    @property
+    def working_days_per_cycle(self):
+        return self._working_days_before[-1]
+
+    def get_holiday_dates(self, start_date, end_date):
+        if not self.company or self.company.working_on_local_holidays:
+            return frozenset()
+        return self.company.get_holiday_dates(start_date, end_date)
+
+    def get_pattern_block(self, day):
+        """Block scheduled on ``day`` by the rotation alone, ignoring holidays."""
+        if not self.cycle_length or not self.covers(day):
+            return None
+        return self.cycle_days[(day - self.start_date).days % self.cycle_length]
+
+    def get_block(self, day):
+        block = self.get_pattern_block(day)
+        if block is None or day in self.get_holiday_dates(day, day):
+            return None
+        return block
+
+    def is_working_day(self, day):
+        return self.get_block(day) is not None
+
+    def _count_pattern_days_before(self, day_index):
+        full_cycles, remainder = divmod(day_index, self.cycle_length)
+        return (
+            full_cycles * self.working_days_per_cycle
+            + self._working_days_before[remainder]
+        )
+
+    def count_working_days(self, start_date, end_date):
+        start_date, end_date = self._clip(start_date, end_date)
+        if not self.cycle_length or start_date > end_date:
+            return 0
+
+        first_index = (start_date - self.start_date).days
+        last_index = (end_date - self.start_date).days
+
+        count = self._count_pattern_days_before(
+            last_index + 1
+        ) - self._count_pattern_days_before(first_index)
+
+        for day in self.get_holiday_dates(start_date, end_date):
+            if self.get_pattern_block(day) is not None:
+                count -= 1
+
+        return count
+
+    def iter_working_days(self, start_date, end_date):
+        start_date, end_date = self._clip(start_date, end_date)
+        if not self.cycle_length or start_date > end_date:
+            return
+
+        holiday_dates = self.get_holiday_dates(start_date, end_date)
+        offset = (start_date - self.start_date).days
+
+        for i in range((end_date - start_date).days + 1):
+            block = self.cycle_days[(offset + i) % self.cycle_length]
+            day = start_date + timedelta(days=i)
+
+            if block is not None and day not in holiday_dates:
+                yield day, block
+
+    def get_working_dates(self, start_date, end_date):
+        return [day for day, _ in self.iter_working_days(start_date, end_date)]
+
+
+class ShiftSchedule:
+    """The rotations a shift went through, each answering for its own dates.
+
+    Editing a rotation keeps the old blocks for the days before the edit, so
+    past days are counted with the blocks that were worked on them.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = sorted(patterns, key=lambda pattern: pattern.first_day)
+
+    @classmethod
+    def from_blocks(cls, start_date, blocks, company=None):
+        """Build one pattern per block set sharing its effective dates."""
+
+        def get_effective_dates(block):
+            return block.effective_from, block.effective_until
+
+        blocks = sorted(blocks, key=lambda block: block.order)
+        patterns = [
+            ShiftPattern(start_date, block_set, company, *effective_dates)
+            for effective_dates, block_set in groupby(blocks, get_effective_dates)
+        ]
+        return cls(
+            pattern
+            for pattern in patterns
+            if pattern.last_day is None or pattern.first_day <= pattern.last_day
+        )
+
+    def _get_pattern(self, day):
+        for pattern in self.patterns:
+            if pattern.covers(day):
+                return pattern
+        return None
+
+    def get_pattern_block(self, day):
+        pattern = self._get_pattern(day)
+        return pattern.get_pattern_block(day) if pattern else None
+
+    def get_block(self, day):
+        pattern = self._get_pattern(day)
+        return pattern.get_block(day) if pattern else None
+
+    def is_working_day(self, day):
+        return self.get_block(day) is not None
+
+    def count_working_days(self, start_date, end_date):
+        return sum(
+            pattern.count_working_days(start_date, end_date)
+            for pattern in self.patterns
+        )
+
+    def iter_working_days(self, start_date, end_date):
+        for pattern in self.patterns:
+            yield from pattern.iter_working_days(start_date, end_date)
+
+    def get_working_dates(self, start_date, end_date):
+        return [day for day, _ in self.iter_working_days(start_date, end_date)]
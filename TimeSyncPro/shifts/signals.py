@@ -1,8 +1,12 @@
-# from celery import shared_task
-# from django.db.models.signals import post_save
-# from django.dispatch import receiver
-#
-# from TimeSyncPro.shifts.models import Shift
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from TimeSyncPro.accounts.models import Profile
+from TimeSyncPro.companies.models import Company, Team
+from TimeSyncPro.shifts.models import Shift, ShiftBlock
+from TimeSyncPro.shifts.working_calendar import working_calendar
+
 # from .tasks import generate_shift_working_dates_task
 #
 #
@@ -12,3 +16,44 @@
 #         generate_shift_working_dates_task.delay(instance.id)
 #     else:
 #         generate_shift_working_dates_task.delay(instance.id, is_edit=True)
+
+
+@receiver([post_save, post_delete], sender=Shift)
+def invalidate_shift_working_calendar(sender, instance, **kwargs):
+    transaction.on_commit(lambda: working_calendar.invalidate_shift(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=ShiftBlock)
+def invalidate_shift_block_working_calendar(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: working_calendar.invalidate_shift(instance.pattern_id)
+    )
+
+
+@receiver(post_delete, sender=ShiftBlock)
+def rebuild_shift_year_calendars(sender, instance, **kwargs):
+    """Drop the deleted block's days from the year bitmaps of its shift."""
+    shift_id = instance.pattern_id
+
+    def rebuild():
+        shift = Shift.objects.filter(pk=shift_id).first()
+        if shift:
+            shift.backfill_year_calendars()
+
+    transaction.on_commit(rebuild)
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_profile_working_calendar(sender, instance, **kwargs):
+    transaction.on_commit(lambda: working_calendar.invalidate_profiles([instance.pk]))
+
+
+@receiver(post_save, sender=Team)
+def invalidate_team_working_calendar(sender, instance, **kwargs):
+    profile_ids = list(instance.employees.values_list("id", flat=True))
+    transaction.on_commit(lambda: working_calendar.invalidate_profiles(profile_ids))
+
+
+@receiver(post_save, sender=Company)
+def invalidate_company_working_calendar(sender, instance, **kwargs):
+    transaction.on_commit(lambda: working_calendar.invalidate_company(instance.pk))
@@ -1,33 +1,109 @@
 import logging
-from celery import shared_task
+import time
+from datetime import date
+
+from celery import chord, shared_task
+from django.conf import settings
+from django.db import transaction
 
 from .models import Shift
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SHIFT_GENERATION_CHUNK_SIZE = 50
+
 
 @shared_task()
-def generate_shift_working_dates_task(shift_id, is_edit=False):
+def generate_shift_working_dates_task(shift_id, is_edit=False, effective_from=None):
     logger.info("Starting shift working dates generation")
     try:
-        shift = Shift.objects.get(id=shift_id)
-        shift.generate_shift_working_dates(is_edit=is_edit)
-        return f"Successfully generated working dates for shift {shift_id}"
+        with transaction.atomic():
+            shift = Shift.objects.select_for_update().get(id=shift_id)
+            return shift.generate_shift_working_dates(
+                is_edit=is_edit,
+                effective_from=(
+                    date.fromisoformat(effective_from) if effective_from else None
+                ),
+            )
 
     except Exception as e:
         logger.error(f"Error generating dates for shift {shift_id}: {str(e)}")
         raise
 
 
-@shared_task(name="TimeSyncPro.shift.tasks.generate_shift_dates_for_next_year")
-def generate_shift_dates_for_next_year():
-    logger.info("Starting shift working dates generation for next year")
+def chunk_ids(ids, size):
+    return [ids[i : i + size] for i in range(0, len(ids), size)]
+
 
-    shifts = Shift.objects.all()
+@shared_task(name="TimeSyncPro.shifts.tasks.generate_shift_dates_chunk")
+def generate_shift_dates_chunk(shift_ids):
+    summary = {
+        "shifts_processed": 0,
+        "rows_written": 0,
+        "skipped": [],
+        "failures": [],
+    }
 
-    for shift in shifts:
+    for shift_id in shift_ids:
         try:
-            shift.generate_shift_working_dates()
-            logger.info(f"Generated dates for shift {shift.id}")
+            with transaction.atomic():
+                shift = (
+                    Shift.objects.select_for_update(skip_locked=True)
+                    .filter(pk=shift_id)
+                    .first()
+                )
+                if shift is None:
+                    logger.info(f"Shift {shift_id} is locked or deleted, skipping")
+                    summary["skipped"].append(shift_id)
+                    continue
+
+                stats = shift.generate_shift_working_dates()
+
+            summary["shifts_processed"] += 1
+            summary["rows_written"] += stats["rows_written"]
+
         except Exception as e:
-            logger.error(f"Error generating dates for shift {shift.id}: {str(e)}")
+            logger.error(f"Error generating dates for shift {shift_id}: {str(e)}")
+            summary["failures"].append(shift_id)
+
+    return summary
+
+
+@shared_task(name="TimeSyncPro.shifts.tasks.summarize_shift_dates_generation")
+def summarize_shift_dates_generation(chunk_summaries, started_at):
+    summary = {
+        "shifts_processed": sum(c["shifts_processed"] for c in chunk_summaries),
+        "rows_written": sum(c["rows_written"] for c in chunk_summaries),
+        "skipped": [i for c in chunk_summaries for i in c["skipped"]],
+        "failures": [i for c in chunk_summaries for i in c["failures"]],
+        "duration": round(time.time() - started_at, 3),
+    }
+
+    logger.info(
+        f"Generated {summary['rows_written']} dates for "
+        f"{summary['shifts_processed']} shifts in {summary['duration']}s "
+        f"({len(summary['skipped'])} skipped, {len(summary['failures'])} failed)"
+    )
+    if summary["failures"]:
+        logger.error(f"Shift dates generation failed for: {summary['failures']}")
+
+    return summary
+
+
+@shared_task(name="TimeSyncPro.shifts.tasks.generate_shift_dates_for_next_year")
+def generate_shift_dates_for_next_year():
+    logger.info("Starting shift working dates generation for next year")
+
+    shift_ids = list(Shift.objects.order_by("id").values_list("id", flat=True))
+    if not shift_ids:
+        logger.info("No shifts to generate working dates for")
+        return None
+
+    chunk_size = getattr(
+        settings, "SHIFT_GENERATION_CHUNK_SIZE", DEFAULT_SHIFT_GENERATION_CHUNK_SIZE
+    )
+    result = chord(
+        generate_shift_dates_chunk.s(chunk)
+        for chunk in chunk_ids(shift_ids, chunk_size)
+    )(summarize_shift_dates_generation.s(time.time()))
+    return result.id
@@ -1,3 +1,638 @@
-from django.test import TestCase
+import json
+import time as time_module
+from importlib import import_module
+from datetime import date, time, timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import holidays
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from TimeSyncPro.common.models import Address
+from TimeSyncPro.common.test_utils import create_profile
+from TimeSyncPro.companies.models import Company
+from TimeSyncPro.shifts.models import Shift, ShiftBlock, Date, ShiftYearCalendar
+from TimeSyncPro.shifts.tasks import (
+    generate_shift_dates_chunk,
+    generate_shift_dates_for_next_year,
+    summarize_shift_dates_generation,
+)
+from TimeSyncPro.shifts.utils import save_shift_blocks
+from TimeSyncPro.shifts.working_calendar import working_calendar
+
+
+class ShiftTestDataMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(
+            name="Shift Company",
+            annual_leave=20,
+            address=Address.objects.create(country="BG"),
+            working_on_local_holidays=False,
+        )
+        cls.shift = Shift.objects.create(
+            company=cls.company,
+            name="Four On Four Off",
+            start_date=date(2024, 1, 1),
+        )
+        cls.block = ShiftBlock.objects.create(
+            pattern=cls.shift,
+            on_off_days=[1, 1, 1, 1, 0, 0, 0, 0],
+            start_time=time(8, 0),
+            end_time=time(16, 0),
+            order=1,
+        )
+
+    def expected_working_dates(self, start_date, end_date):
+        bg_holidays = holidays.country_holidays(
+            "BG", years=range(start_date.year, end_date.year + 1)
+        )
+        expected = []
+        current_date = start_date
+        while current_date <= end_date:
+            offset = (current_date - self.shift.start_date).days % 8
+            if offset < 4 and current_date not in bg_holidays:
+                expected.append(current_date)
+            current_date += timedelta(days=1)
+        return expected
+
+
+class GenerateShiftWorkingDatesTests(ShiftTestDataMixin, TestCase):
+    def test_generates_working_dates_in_bulk(self):
+        stats = self.shift.generate_shift_working_dates()
+
+        stored = list(
+            self.block.working_dates.order_by("date").values_list("date", flat=True)
+        )
+        expected = self.expected_working_dates(
+            self.shift.start_date, self.shift.last_generated_date
+        )
+
+        self.assertEqual(stored, expected)
+        self.assertEqual(stats["rows_written"], len(expected))
+        self.assertIn("elapsed", stats)
+
+    def test_appends_only_missing_tail(self):
+        Shift.objects.filter(pk=self.shift.pk).update(start_date=timezone.now().date())
+
+        stats = self.shift.generate_shift_working_dates()
+
+        self.assertEqual(stats["rows_written"], self.block.working_dates.count())
+        self.assertEqual(
+            Date.objects.filter(shift_blocks=self.block).count(), stats["rows_written"]
+        )
+        self.assertEqual(self.shift.generate_shift_working_dates()["rows_written"], 0)
+
+    def test_edit_regenerates_without_duplicates(self):
+        self.shift.generate_shift_working_dates()
+        first_count = self.block.working_dates.count()
+
+        self.shift.generate_shift_working_dates(is_edit=True)
+
+        self.assertEqual(self.block.working_dates.count(), first_count)
+        self.assertEqual(
+            Date.objects.count(), Date.objects.values("date").distinct().count()
+        )
+
+    def test_resume_keeps_rotation_in_phase(self):
+        self.shift.generate_shift_working_dates()
+        self.block.working_dates.clear()
+        Shift.objects.filter(pk=self.shift.pk).update(
+            last_generated_date=date(2024, 1, 2)
+        )
+
+        self.shift.generate_shift_working_dates()
+
+        stored = list(
+            self.block.working_dates.order_by("date").values_list("date", flat=True)
+        )
+        expected = self.expected_working_dates(
+            date(2024, 1, 3), self.shift.last_generated_date
+        )
+        self.assertEqual(stored, expected)
+
+    @override_settings(SHIFT_WORKING_DATES_HORIZON_DAYS=30)
+    def test_generates_up_to_rolling_horizon(self):
+        self.shift.generate_shift_working_dates()
+
+        self.assertEqual(
+            self.shift.last_generated_date,
+            timezone.now().date() + timedelta(days=30),
+        )
+
+    def test_append_only_writes_missing_tail(self):
+        with override_settings(SHIFT_WORKING_DATES_HORIZON_DAYS=30):
+            self.shift.generate_shift_working_dates()
+        previous_end = self.shift.last_generated_date
+
+        with override_settings(SHIFT_WORKING_DATES_HORIZON_DAYS=60):
+            stats = self.shift.generate_shift_working_dates()
+
+        self.assertEqual(
+            stats["rows_written"],
+            len(
+                self.expected_working_dates(
+                    previous_end + timedelta(days=1), self.shift.last_generated_date
+                )
+            ),
+        )
+        with override_settings(SHIFT_WORKING_DATES_HORIZON_DAYS=60):
+            stats = self.shift.generate_shift_working_dates()
+        self.assertEqual(stats["rows_written"], 0)
+
+    def test_edit_recomputes_only_from_effective_date(self):
+        self.shift.generate_shift_working_dates()
+        effective_from = date(2025, 1, 1)
+        history = self.expected_working_dates(
+            self.shift.start_date, effective_from - timedelta(days=1)
+        )
+
+        ShiftBlock.objects.filter(pk=self.block.pk).update(
+            on_off_days=[1, 1, 0, 0, 0, 0, 0, 0]
+        )
+        stats = self.shift.generate_shift_working_dates(
+            is_edit=True, effective_from=effective_from
+        )
+
+        stored = list(
+            self.block.working_dates.order_by("date").values_list("date", flat=True)
+        )
+        recomputed = [
+            day
+            for day in self.expected_working_dates(
+                effective_from, self.shift.last_generated_date
+            )
+            if (day - self.shift.start_date).days % 8 < 2
+        ]
+        self.assertEqual(stored, history + recomputed)
+        self.assertEqual(stats["rows_written"], len(recomputed))
+        self.assertEqual(
+            self.shift.get_shift_working_dates_by_period(
+                self.shift.start_date, self.shift.last_generated_date
+            ),
+            stored,
+        )
+
+
+class BlockFormStub:
+    def __init__(self, block):
+        self.block = block
+        self.cleaned_data = {}
+
+    def is_valid(self):
+        return True
+
+    def save(self, commit=True):
+        return self.block
+
+
+class SaveShiftBlocksTests(ShiftTestDataMixin, TestCase):
+    def get_block_copy(self, **fields):
+        block = ShiftBlock.objects.get(pk=self.block.pk)
+        for name, value in fields.items():
+            setattr(block, name, value)
+        return block
+
+    def test_unchanged_rotation_keeps_blocks(self):
+        changed = save_shift_blocks([BlockFormStub(self.get_block_copy())], self.shift)
+
+        self.assertFalse(changed)
+        self.assertEqual(list(self.shift.blocks.all()), [self.block])
+
+    def test_changed_rotation_retires_blocks_and_keeps_history(self):
+        self.shift.generate_shift_working_dates()
+        effective_from = date(2025, 1, 1)
+        history = list(
+            self.block.working_dates.filter(date__lt=effective_from).values_list(
+                "date", flat=True
+            )
+        )
+
+        changed = save_shift_blocks(
+            [BlockFormStub(self.get_block_copy(start_time=time(20, 0)))],
+            self.shift,
+            effective_from=effective_from,
+        )
+        self.shift.generate_shift_working_dates(
+            is_edit=True, effective_from=effective_from
+        )
+
+        self.assertTrue(changed)
+        retired = ShiftBlock.all_objects.get(pk=self.block.pk)
+        new_block = self.shift.blocks.get()
+        self.assertFalse(retired.is_active)
+        self.assertEqual(retired.start_time, time(8, 0))
+        self.assertEqual(new_block.order, 2)
+        self.assertEqual(
+            list(retired.working_dates.order_by("date").values_list("date", flat=True)),
+            history,
+        )
+        self.assertFalse(
+            new_block.working_dates.filter(date__lt=effective_from).exists()
+        )
+
+    def test_edited_rotation_keeps_counting_past_days_with_old_blocks(self):
+        self.shift.generate_shift_working_dates()
+        effective_from = date(2025, 1, 1)
+        past = (date(2024, 6, 1), date(2024, 12, 31))
+        past_count = len(self.expected_working_dates(*past))
+
+        save_shift_blocks(
+            [BlockFormStub(self.get_block_copy(on_off_days=[1, 1, 0, 0, 0, 0, 0, 0]))],
+            Shift.objects.get(pk=self.shift.pk),
+            effective_from=effective_from,
+        )
+        shift = Shift.objects.get(pk=self.shift.pk)
+        shift.generate_shift_working_dates(is_edit=True, effective_from=effective_from)
+        pattern = shift.get_pattern()
+
+        self.assertEqual(pattern.count_working_days(*past), past_count)
+        self.assertEqual(
+            shift.get_count_of_shift_working_days_by_period(*past), past_count
+        )
+        self.assertEqual(
+            pattern.get_working_dates(date(2024, 6, 1), date(2025, 3, 31)),
+            shift.get_shift_working_dates_by_period(
+                date(2024, 6, 1), date(2025, 3, 31)
+            ),
+        )
+        self.assertEqual(pattern.get_block(date(2025, 1, 3)), shift.blocks.get())
+
+
+class ShiftPatternTests(ShiftTestDataMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.weekly_shift = Shift.objects.create(
+            company=cls.company,
+            name="Alternating Weeks",
+            start_date=date(2024, 1, 1),
+        )
+        cls.weekly_blocks = [
+            ShiftBlock.objects.create(
+                pattern=cls.weekly_shift,
+                on_off_days=[1, 1, 1, 1, 1, 0, 0],
+                selected_days=[1, 2, 3, 4, 5],
+                start_time=time(6, 0),
+                end_time=time(14, 0),
+                order=1,
+            ),
+            ShiftBlock.objects.create(
+                pattern=cls.weekly_shift,
+                on_off_days=[0, 0, 1, 1, 1, 1, 1],
+                selected_days=[3, 4, 5, 6, 7],
+                start_time=time(14, 0),
+                end_time=time(22, 0),
+                order=2,
+            ),
+        ]
+
+    def assertPatternMatchesMaterializedDates(self, shift):
+        shift.generate_shift_working_dates()
+        start_date, end_date = shift.start_date, shift.last_generated_date
+        pattern = shift.get_pattern()
+
+        self.assertEqual(
+            pattern.get_working_dates(start_date, end_date),
+            sorted(shift.get_shift_working_dates_by_period(start_date, end_date)),
+        )
+
+        for period_start, period_end in [
+            (date(2024, 1, 1), date(2024, 1, 31)),
+            (date(2024, 2, 27), date(2024, 3, 8)),
+            (date(2024, 12, 20), date(2025, 1, 10)),
+            (date(2023, 12, 1), date(2024, 1, 5)),
+        ]:
+            self.assertEqual(
+                pattern.count_working_days(period_start, period_end),
+                shift.get_count_of_shift_working_days_by_period(
+                    period_start, period_end
+                ),
+            )
+
+        for working_date in shift.get_queryset_of_shift_working_dates_by_period(
+            start_date, end_date
+        ).prefetch_related("shift_blocks"):
+            self.assertEqual(
+                pattern.get_block(working_date.date),
+                working_date.shift_blocks.get(pattern=shift),
+            )
+
+    def test_single_block_pattern_matches_materialized_dates(self):
+        self.assertPatternMatchesMaterializedDates(self.shift)
+
+    def test_multi_block_pattern_matches_materialized_dates(self):
+        self.assertPatternMatchesMaterializedDates(self.weekly_shift)
+
+    def test_days_before_start_date_are_not_working_days(self):
+        pattern = self.shift.get_pattern()
+
+        self.assertFalse(pattern.is_working_day(date(2023, 12, 31)))
+        self.assertEqual(
+            pattern.count_working_days(date(2023, 12, 1), date(2023, 12, 31)), 0
+        )
+
+    def test_evaluates_without_queries(self):
+        pattern = self.shift.get_pattern()
+        pattern.count_working_days(date(2024, 1, 1), date(2024, 1, 1))
+
+        with self.assertNumQueries(0):
+            pattern.count_working_days(date(2024, 1, 1), date(2026, 12, 31))
+            pattern.get_working_dates(date(2024, 1, 1), date(2026, 12, 31))
+            pattern.is_working_day(date(2025, 6, 1))
+
+
+class GenerateShiftDatesTasksTests(ShiftTestDataMixin, TestCase):
+    def test_beat_schedule_points_at_registered_task(self):
+        self.assertEqual(
+            generate_shift_dates_for_next_year.name,
+            settings.CELERY_BEAT_SCHEDULE["generate-shift-dates"]["task"],
+        )
+
+    def test_chunk_reports_processed_and_failed_shifts(self):
+        missing_shift_id = self.shift.pk + 1000
+
+        with mock.patch.object(
+            Shift,
+            "generate_shift_working_dates",
+            side_effect=[{"rows_written": 5}, ValueError("boom")],
+        ):
+            other_shift = Shift.objects.create(
+                company=self.company, name="Broken Shift", start_date=date(2024, 1, 1)
+            )
+            summary = generate_shift_dates_chunk(
+                [self.shift.pk, other_shift.pk, missing_shift_id]
+            )
+
+        self.assertEqual(summary["shifts_processed"], 1)
+        self.assertEqual(summary["rows_written"], 5)
+        self.assertEqual(summary["failures"], [other_shift.pk])
+        self.assertEqual(summary["skipped"], [missing_shift_id])
+
+    def test_chunk_counts_generation_errors_as_failures(self):
+        with mock.patch.object(
+            Shift, "compute_shift_working_dates", side_effect=ValueError("bad pattern")
+        ):
+            summary = generate_shift_dates_chunk([self.shift.pk])
+
+        self.assertEqual(summary["shifts_processed"], 0)
+        self.assertEqual(summary["failures"], [self.shift.pk])
+
+    def test_summary_aggregates_chunks(self):
+        summary = summarize_shift_dates_generation(
+            [
+                {
+                    "shifts_processed": 2,
+                    "rows_written": 10,
+                    "skipped": [],
+                    "failures": [3],
+                },
+                {
+                    "shifts_processed": 1,
+                    "rows_written": 4,
+                    "skipped": [7],
+                    "failures": [],
+                },
+            ],
+            time_module.time(),
+        )
+
+        self.assertEqual(summary["shifts_processed"], 3)
+        self.assertEqual(summary["rows_written"], 14)
+        self.assertEqual(summary["skipped"], [7])
+        self.assertEqual(summary["failures"], [3])
+        self.assertIn("duration", summary)
+
+    @override_settings(SHIFT_GENERATION_CHUNK_SIZE=2)
+    def test_fans_out_shifts_in_chunks(self):
+        for i in range(4):
+            Shift.objects.create(
+                company=self.company, name=f"Shift {i}", start_date=date(2024, 1, 1)
+            )
+
+        with mock.patch("TimeSyncPro.shifts.tasks.chord") as chord_mock:
+            chord_mock.return_value.return_value.id = "chord-id"
+            result = generate_shift_dates_for_next_year()
+
+        header = list(chord_mock.call_args.args[0])
+        self.assertEqual([len(sig.args[0]) for sig in header], [2, 2, 1])
+        self.assertEqual(json.loads(json.dumps(result)), "chord-id")
+
+
+class ShiftYearCalendarTests(ShiftTestDataMixin, TestCase):
+    def test_bitmap_range_queries(self):
+        calendar = ShiftYearCalendar(year=2024)
+        calendar.add_working_days(
+            [(date(2024, 1, 1), 1), (date(2024, 2, 29), 2), (date(2024, 12, 31), 1)]
+        )
+
+        self.assertEqual(
+            calendar.get_working_dates(date(2023, 12, 1), date(2025, 1, 31)),
+            [date(2024, 1, 1), date(2024, 2, 29), date(2024, 12, 31)],
+        )
+        self.assertEqual(
+            calendar.count_working_days(date(2024, 1, 2), date(2024, 12, 30)), 1
+        )
+        self.assertEqual(calendar.get_block_order(date(2024, 2, 29)), 2)
+        self.assertIsNone(calendar.get_block_order(date(2024, 3, 1)))
+
+        calendar.clear_range(date(2024, 2, 1), date(2024, 12, 31))
+
+        self.assertEqual(
+            calendar.get_working_dates(date(2024, 1, 1), date(2024, 12, 31)),
+            [date(2024, 1, 1)],
+        )
+        self.assertIsNone(calendar.get_block_order(date(2024, 2, 29)))
+
+    def test_bitmaps_match_materialized_working_dates(self):
+        self.shift.generate_shift_working_dates()
+        start_date, end_date = self.shift.start_date, self.shift.last_generated_date
+
+        self.assertEqual(
+            self.shift.get_shift_working_dates_by_period(start_date, end_date),
+            list(
+                self.block.working_dates.order_by("date").values_list("date", flat=True)
+            ),
+        )
+        self.assertEqual(
+            self.shift.get_count_of_shift_working_days_by_period(start_date, end_date),
+            self.block.working_dates.count(),
+        )
+
+    def test_backfill_command_rebuilds_bitmaps(self):
+        self.shift.generate_shift_working_dates()
+        start_date, end_date = self.shift.start_date, self.shift.last_generated_date
+        expected = self.shift.get_shift_working_dates_by_period(start_date, end_date)
+        self.shift.year_calendars.all().delete()
+
+        call_command("backfill_shift_year_calendars", stdout=StringIO())
+
+        self.assertEqual(
+            self.shift.get_shift_working_dates_by_period(start_date, end_date),
+            expected,
+        )
+        self.assertEqual(
+            self.shift.year_calendars.count(), end_date.year - start_date.year + 1
+        )
+
+    def test_migration_builds_bitmaps_of_existing_shifts(self):
+        migration = import_module(
+            "TimeSyncPro.shifts.migrations.0004_build_shift_year_calendars"
+        )
+        self.shift.generate_shift_working_dates()
+        start_date, end_date = self.shift.start_date, self.shift.last_generated_date
+        expected = self.shift.get_shift_working_dates_by_period(start_date, end_date)
+        self.shift.year_calendars.all().delete()
+
+        migration.build_shift_year_calendars(apps, None)
+
+        self.assertEqual(
+            self.shift.get_shift_working_dates_by_period(start_date, end_date),
+            expected,
+        )
+
+    def test_deleting_block_rebuilds_bitmaps(self):
+        second_block = ShiftBlock.objects.create(
+            pattern=self.shift,
+            on_off_days=[1, 1, 0, 0],
+            start_time=time(20, 0),
+            end_time=time(4, 0),
+            order=2,
+        )
+        self.shift.generate_shift_working_dates()
+        start_date, end_date = self.shift.start_date, self.shift.last_generated_date
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second_block.delete()
+
+        self.assertEqual(
+            self.shift.get_count_of_shift_working_days_by_period(start_date, end_date),
+            self.block.working_dates.count(),
+        )
+        self.assertTrue(
+            all(
+                calendar.get_block_order(day) == 1
+                for calendar in self.shift.year_calendars.all()
+                for day in calendar.get_working_dates(start_date, end_date)
+            )
+        )
+
+    def test_working_dates_with_time_use_constant_queries(self):
+        self.shift.generate_shift_working_dates()
+        start_date = date(2025, 1, 1)
+        end_date = date(2025, 12, 31)
+
+        with self.assertNumQueries(2):
+            dates = self.shift.get_shift_working_dates_with_time_by_period(
+                start_date, end_date
+            )
+
+        self.assertEqual(list(dates), self.expected_working_dates(start_date, end_date))
+        self.assertTrue(
+            all(
+                times == {"start_time": time(8, 0), "end_time": time(16, 0)}
+                for times in dates.values()
+            )
+        )
+
+    def test_working_dates_with_time_resolve_retired_and_skip_missing_blocks(self):
+        self.shift.generate_shift_working_dates()
+        start_date = date(2025, 1, 1)
+        end_date = date(2025, 1, 31)
+        ShiftBlock.objects.filter(pk=self.block.pk).update(is_active=False)
+        calendar = self.shift.year_calendars.get(year=2025)
+        first_day = calendar.get_working_dates(start_date, end_date)[0]
+        calendar.block_orders[calendar.get_day_index(first_day)] = 99
+        calendar.save()
+
+        dates = self.shift.get_shift_working_dates_with_time_by_period(
+            start_date, end_date
+        )
+
+        self.assertEqual(
+            list(dates), self.expected_working_dates(start_date, end_date)[1:]
+        )
+
+    def test_current_block_uses_constant_queries(self):
+        self.shift.generate_shift_working_dates()
+        today = timezone.now().date()
+        expected = (
+            self.block if today in self.expected_working_dates(today, today) else None
+        )
+
+        with self.assertNumQueries(2 if expected else 1):
+            self.assertEqual(self.shift.get_current_block(), expected)
+
+
+class WorkingCalendarTests(ShiftTestDataMixin, TestCase):
+    start_date = date(2024, 3, 1)
+    end_date = date(2024, 3, 31)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.profile = create_profile(
+            cls.company, "calendar@example.com", shift=cls.shift
+        )
+
+    def setUp(self):
+        cache.clear()
+        working_calendar.hits = working_calendar.misses = 0
+
+    def test_reuses_cached_year(self):
+        first = self.profile.get_working_days(self.start_date, self.end_date)
+        count = self.profile.get_count_of_working_days_by_period(
+            self.start_date, self.end_date
+        )
+
+        self.assertEqual(
+            first, self.expected_working_dates(self.start_date, self.end_date)
+        )
+        self.assertEqual(count, len(first))
+        self.assertEqual(working_calendar.get_stats()["misses"], 1)
+        self.assertEqual(working_calendar.get_stats()["hits"], 1)
+
+    def test_block_change_invalidates_shift_calendar(self):
+        self.profile.get_working_days(self.start_date, self.end_date)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.block.on_off_days = [1, 0]
+            self.block.save()
+        self.profile.refresh_from_db()
+
+        self.assertEqual(
+            self.profile.get_count_of_working_days_by_period(
+                date(2024, 3, 1), date(2024, 3, 2)
+            ),
+            1,
+        )
+
+    def test_profile_shift_change_invalidates_profile(self):
+        self.profile.get_working_days(self.start_date, self.end_date)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.shift = None
+            self.profile.save()
+
+        self.assertEqual(
+            self.profile.get_count_of_working_days_by_period(
+                date(2024, 3, 11), date(2024, 3, 17)
+            ),
+            5,
+        )
+
+    def test_company_holiday_toggle_invalidates_calendar(self):
+        new_year = date(2024, 1, 1)
+        self.assertNotIn(new_year, self.profile.get_working_days(new_year, new_year))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.company.working_on_local_holidays = True
+            self.company.save()
+        self.profile.refresh_from_db()
+
+        self.assertIn(new_year, self.profile.get_working_days(new_year, new_year))
@@ -2,11 +2,26 @@ from django.db import transaction
 from django.shortcuts import render, redirect
 from TimeSyncPro.companies.models import Team
 from django.db.models import Max
+from django.utils import timezone
 
 from TimeSyncPro import settings
 from TimeSyncPro.accounts.models import Profile
+from TimeSyncPro.history.writer import history_writer
+from TimeSyncPro.middleware.utils import get_current_user
+from TimeSyncPro.reports.rollups import refresh_company_rollups_on_commit
 from TimeSyncPro.shifts.models import ShiftBlock
 from TimeSyncPro.shifts.tasks import generate_shift_working_dates_task
+from TimeSyncPro.shifts.working_calendar import working_calendar
+
+BLOCK_DEFINITION_FIELDS = [
+    "on_off_days",
+    "selected_days",
+    "days_on",
+    "days_off",
+    "start_time",
+    "end_time",
+    "duration",
+]
 
 
 def has_consistent_block_type(form, formset):
@@ -69,11 +84,6 @@ def validate_shift_start_date(form, formset):
     return True
 
 
-def delete_shift_blocks(shift, is_existing):
-    if is_existing:
-        shift.blocks.all().delete()
-
-
 def clear_deleted_blocks(formset):
     new_forms = []
     for i, form in enumerate(formset):
@@ -94,52 +104,125 @@ def clean_formset(request, template_name, context, form, formset):
         return render(request, template_name, context)
 
 
-def save_shift_blocks(formset, shift):
+def get_block_definitions(blocks):
+    return [
+        [getattr(block, field) for field in BLOCK_DEFINITION_FIELDS] for block in blocks
+    ]
+
+
+def save_shift_blocks(formset, shift, effective_from=None):
+    """
+    Save the formset blocks as the active blocks of the shift.
+
+    Existing blocks are never changed in place, as generated working dates
+    point at them. When the rotation changed, the current blocks are retired
+    and the new ones get orders after every earlier block of the shift. The
+    new blocks take effect from ``effective_from`` (today by default) and the
+    retired ones keep answering for the days before it.
+    """
     with transaction.atomic():
+        current_blocks = list(shift.blocks.order_by("order"))
+        blocks = [
+            form.save(commit=False)
+            for form in formset
+            if form.is_valid() and not form.cleaned_data.get("DELETE")
+        ]
+
+        if get_block_definitions(blocks) == get_block_definitions(current_blocks):
+            return False
+
+        last_order = (
+            ShiftBlock.all_objects.filter(pattern=shift).aggregate(Max("order"))[
+                "order__max"
+            ]
+            or 0
+        )
+        if current_blocks:
+            effective_from = effective_from or timezone.now().date()
+        for index, block in enumerate(blocks, start=1):
+            block.pk = None
+            block.pattern = shift
+            block.order = last_order + index
+            block.is_active = True
+            block.effective_from = effective_from if current_blocks else None
+            block.effective_until = None
+
+        ShiftBlock.objects.filter(pk__in=[b.pk for b in current_blocks]).update(
+            is_active=False, effective_until=effective_from
+        )
+        ShiftBlock.objects.bulk_create(blocks)
+        return True
+
+
+def invalidate_profiles_on_commit(profile_ids):
+    profile_ids = list(profile_ids)
+    transaction.on_commit(lambda: working_calendar.invalidate_profiles(profile_ids))
+
+
+def invalidate_team_profiles_on_commit(teams):
+    invalidate_profiles_on_commit(
+        Profile.objects.filter(team_id__in=[t.id for t in teams]).values_list(
+            "id", flat=True
+        )
+    )
+
 
-        blocks_to_create = []
+def record_shift_assignment_history(objects, shift_id):
+    """Record the ``shift`` change of profiles or teams moved by a bulk ``update``."""
 
-        for index, form in enumerate(formset, start=1):
-            if form.is_valid() and not form.cleaned_data.get("DELETE"):
-                block = form.save(commit=False)
-                block.pattern = shift
-                block.order = index
-                blocks_to_create.append(block)
+    def get_changes(obj):
+        if obj.shift_id == shift_id:
+            return None
+        return {"shift": {"old": obj.shift_id, "new": shift_id}}
 
-        ShiftBlock.objects.bulk_create(blocks_to_create)
+    history_writer.record_many(
+        objects, "update", get_changes, changed_by=get_current_user()
+    )
 
 
 def save_shift_members(shift, form, is_existing=False):
     final_shift_members = set(form.cleaned_data.get("shift_members", []))
 
     if not is_existing:
+        record_shift_assignment_history(final_shift_members, shift.id)
         Profile.objects.filter(id__in=[m.id for m in final_shift_members]).update(
             shift=shift
         )
+        invalidate_profiles_on_commit([m.id for m in final_shift_members])
 
-        return
+        return bool(final_shift_members)
 
     members_to_remove = form.initial_shift_members - final_shift_members
+    record_shift_assignment_history(members_to_remove, None)
     Profile.objects.filter(id__in=[m.id for m in members_to_remove]).update(shift=None)
 
     members_to_add = final_shift_members - form.initial_shift_members
+    record_shift_assignment_history(members_to_add, shift.id)
     Profile.objects.filter(id__in=[m.id for m in members_to_add]).update(shift=shift)
+    invalidate_profiles_on_commit([m.id for m in members_to_remove | members_to_add])
+    return bool(members_to_remove or members_to_add)
 
 
 def save_shift_teams(shift, form, is_existing=False):
     final_shift_teams = set(form.cleaned_data.get("shift_teams", []))
 
     if not is_existing:
+        record_shift_assignment_history(final_shift_teams, shift.id)
         Team.objects.filter(id__in=[t.id for t in final_shift_teams]).update(
             shift=shift
         )
-        return
+        invalidate_team_profiles_on_commit(final_shift_teams)
+        return bool(final_shift_teams)
 
     teams_to_remove = form.initial_shift_teams - final_shift_teams
+    record_shift_assignment_history(teams_to_remove, None)
     Team.objects.filter(id__in=[t.id for t in teams_to_remove]).update(shift=None)
 
     teams_to_add = final_shift_teams - form.initial_shift_teams
+    record_shift_assignment_history(teams_to_add, shift.id)
     Team.objects.filter(id__in=[t.id for t in teams_to_add]).update(shift=shift)
+    invalidate_team_profiles_on_commit(teams_to_remove | teams_to_add)
+    return bool(teams_to_remove or teams_to_add)
 
 
 def handle_shift_post(
@@ -178,11 +261,18 @@ def handle_shift_post(
                     formset = clear_deleted_blocks(formset)
                     shift.company = company
                     clean_formset(request, template_name, context, form, formset)
-                    delete_shift_blocks(shift, is_existing=is_existing)
                     shift.save()
-                    save_shift_blocks(shift=shift, formset=formset)
-                    save_shift_members(shift=shift, form=form, is_existing=is_existing)
-                    save_shift_teams(shift=shift, form=form, is_existing=is_existing)
+                    blocks_changed = save_shift_blocks(shift=shift, formset=formset)
+                    members_changed = save_shift_members(
+                        shift=shift, form=form, is_existing=is_existing
+                    )
+                    teams_changed = save_shift_teams(
+                        shift=shift, form=form, is_existing=is_existing
+                    )
+                    # Bulk updates send no signals, so refresh the absence
+                    # rollups after the calendar invalidations above.
+                    if blocks_changed or members_changed or teams_changed:
+                        refresh_company_rollups_on_commit(company.id)
                     # shift.save()
 
                 except Exception as e:
@@ -0,0 +1,138 @@
+import logging
+import threading
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+
+from TimeSyncPro.common.cache import bump_version
+
+logger = logging.getLogger(__name__)
+
+
+class WorkingCalendar:
+    """
+    Cache of profile working days per (effective shift, pattern version, year).
+
+    Profiles without a shift share the weekday calendar of their company. Each
+    year is computed once and stored in Django's cache, so every profile on the
+    same shift reuses it until the shift or company version is bumped.
+    """
+
+    KEY_PREFIX = "working_calendar"
+    DEFAULT_TIMEOUT = 60 * 60 * 24
+
+    def __init__(self, timeout=None):
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def timeout(self):
+        if self._timeout:
+            return self._timeout
+        return getattr(settings, "WORKING_CALENDAR_CACHE_TIMEOUT", self.DEFAULT_TIMEOUT)
+
+    def _version_key(self, kind, object_id):
+        return f"{self.KEY_PREFIX}:version:{kind}:{object_id}"
+
+    def _profile_key(self, profile_id):
+        return f"{self.KEY_PREFIX}:profile:{profile_id}"
+
+    def _get_versions(self, shift_id, company_id):
+        keys = {
+            "shift": self._version_key("shift", shift_id),
+            "company": self._version_key("company", company_id),
+        }
+        versions = cache.get_many(keys.values())
+        return tuple(versions.get(key, 1) for key in keys.values())
+
+    def _bump_version(self, kind, object_id):
+        bump_version(self._version_key(kind, object_id), cache)
+
+    def _count(self, hits=0, misses=0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def get_effective_shift_id(self, profile):
+        key = self._profile_key(profile.pk)
+        shift_id = cache.get(key, default=False)
+        if shift_id is not False:
+            return shift_id
+
+        shift = profile.get_shift()
+        shift_id = shift.pk if shift else None
+        cache.set(key, shift_id, timeout=self.timeout)
+        return shift_id
+
+    def get_years(self, profile, first_year, last_year):
+        """Return {year: frozenset of working days} for the profile."""
+        shift_id = self.get_effective_shift_id(profile)
+        shift_version, company_version = self._get_versions(
+            shift_id, profile.company_id
+        )
+        owner = f"shift:{shift_id}" if shift_id else "weekdays"
+
+        keys = {
+            year: (
+                f"{self.KEY_PREFIX}:{owner}:company:{profile.company_id}:"
+                f"v{shift_version}.{company_version}:{year}"
+            )
+            for year in range(first_year, last_year + 1)
+        }
+        cached = cache.get_many(keys.values())
+
+        years = {}
+        missing = {}
+        for year, key in keys.items():
+            if key in cached:
+                years[year] = cached[key]
+            else:
+                years[year] = frozenset(
+                    profile.compute_working_days(date(year, 1, 1), date(year, 12, 31))
+                )
+                missing[key] = years[year]
+
+        if missing:
+            cache.set_many(missing, timeout=self.timeout)
+
+        self._count(hits=len(cached), misses=len(missing))
+        return years
+
+    def get_working_days(self, profile, start_date, end_date):
+        if start_date > end_date:
+            return []
+
+        years = self.get_years(profile, start_date.year, end_date.year)
+        return sorted(
+            day
+            for working_days in years.values()
+            for day in working_days
+            if start_date <= day <= end_date
+        )
+
+    def count_working_days(self, profile, start_date, end_date):
+        return len(self.get_working_days(profile, start_date, end_date))
+
+    def invalidate_shift(self, shift_id):
+        self._bump_version("shift", shift_id)
+
+    def invalidate_company(self, company_id):
+        self._bump_version("company", company_id)
+
+    def invalidate_profiles(self, profile_ids):
+        cache.delete_many([self._profile_key(profile_id) for profile_id in profile_ids])
+
+    def get_stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+working_calendar = WorkingCalendar()
@@ -0,0 +1,30 @@
+$(document).ready(function() {
+    $('select[data-autocomplete-url]').each(function() {
+        const $select = $(this);
+        const baseUrl = $select.data('autocomplete-url');
+        let nextUrl = null;
+
+        $select.select2({
+            width: '100%',
+            closeOnSelect: !$select.prop('multiple'),
+            allowClear: true,
+            placeholder: $select.data('placeholder') || 'Search...',
+            ajax: {
+                delay: 250,
+                url: function(params) {
+                    return (params.page || 1) > 1 && nextUrl ? nextUrl : baseUrl;
+                },
+                data: function(params) {
+                    return (params.page || 1) > 1 ? {} : { search: params.term || '' };
+                },
+                processResults: function(data) {
+                    nextUrl = data.next;
+                    return {
+                        results: data.results,
+                        pagination: { more: Boolean(data.next) }
+                    };
+                }
+            }
+        });
+    });
+});
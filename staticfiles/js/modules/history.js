@@ -1,8 +1,8 @@
-function loadHistory(page = 1) {
+function loadHistory(url = apiConfig.urls.history) {
     const historyList = document.getElementById('history-list');
     historyList.innerHTML = '<div class="loading">Loading history...</div>';
 
-    fetch(`${apiConfig.urls.history}?page=${page}`)
+    fetch(url)
         .then(response => {
             if (!response.ok) throw new Error('Network response was not ok');
             return response.json();
@@ -30,7 +30,7 @@ function loadHistory(page = 1) {
                 </div>
             `).join('');
 
-            renderPagination(data, 'history-pagination', loadHistory);
+            renderCursorPagination(data, 'history-pagination', loadHistory);
         })
         .catch(error => {
             console.error('Error:', error);
@@ -46,3 +46,38 @@ function renderPagination(data, elementId, loadFunction) {
         });
     });
 }
+
+function renderCursorPagination(data, elementId, loadFunction) {
+    const paginationElement = document.getElementById(elementId);
+
+    if (!data || (!data.next && !data.previous)) {
+        paginationElement.innerHTML = '';
+        return;
+    }
+
+    let html = `<nav aria-label="Page navigation"><ul class="pagination justify-content-center">`;
+
+    if (data.previous) {
+        html += `
+            <li class="page-item">
+                <a class="page-link" href="javascript:void(0)" data-url="${data.previous}">Newer</a>
+            </li>`;
+    }
+
+    if (data.next) {
+        html += `
+            <li class="page-item">
+                <a class="page-link" href="javascript:void(0)" data-url="${data.next}">Older</a>
+            </li>`;
+    }
+
+    html += `</ul></nav>`;
+    paginationElement.innerHTML = html;
+
+    paginationElement.querySelectorAll('a.page-link').forEach(link => {
+        link.addEventListener('click', e => {
+            e.preventDefault();
+            loadFunction(e.target.dataset.url);
+        });
+    });
+}
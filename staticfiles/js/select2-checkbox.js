@@ -192,7 +192,7 @@
 // });
 
 $(document).ready(function() {
-    $('.select2-checkbox').select2({
+    $('.select2-checkbox').not('[data-autocomplete-url]').select2({
         width: '100%',
         closeOnSelect: false,
         allowClear: true,